@@ -0,0 +1,79 @@
+"""
+Measures how fast `Context` objects are created and how much memory they keep, compared with the
+old Context that computed `voice` and `cleaned_up_code` in `__init__` for every message.
+
+The messages are a realistic mix for the bot: mostly short commands, some `exec`/`eval` code blocks
+of 1 to 60 lines and some long chat messages (e.g. contexts created for messages by `sudo` or for
+unknown commands). Only the messages are stand-ins, the contexts are the real classes.
+
+Usage (from the repository's root folder):
+    python -m benchmarks.context [--messages 100000]
+"""
+
+import time
+import random
+import argparse
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any
+
+from src         import utils
+from src.classes import Context
+
+import discord
+from discord.ext.commands.view import StringView
+
+class EagerContext(Context):
+    """The old Context, computing the voice state and the cleaned up code for every message."""
+    
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.eager_voice = self.author.voice if isinstance(self.author, discord.Member) else None
+        self.__dict__["cleaned_up_code"] = utils.cleanup_code(self.message.content)
+
+def make_messages(count: int, rng: random.Random) -> list[SimpleNamespace]:
+    author = SimpleNamespace(id=1, voice=None)
+    channel = SimpleNamespace(id=2)
+    messages = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.7:
+            content = f"!{rng.choice(['ping', 'help', 'prefix', 'search hello world', 'cmdstats 24'])}"
+        elif kind < 0.9:
+            lines = "\n".join(f"    value_{i} = compute({i}) * {rng.randint(1, 99)}" for i in range(rng.randint(1, 60)))
+            content = f"!exec ```py\nasync def main():\n{lines}\n```"
+        else:
+            content = " ".join(rng.choices("lorem ipsum dolor sit amet consectetur adipiscing elit".split(), k=rng.randint(50, 300)))
+        messages.append(SimpleNamespace(content=content, author=author, channel=channel, guild=None, _state=None))
+    return messages
+
+def measure(context_class: type[Context], messages: list[SimpleNamespace]) -> tuple[float, float]:
+    """Contexts per second, and bytes kept per context."""
+    started = time.perf_counter()
+    for message in messages:
+        context_class(message=message, bot=None, view=StringView(message.content), prefix="!") # type: ignore[arg-type]
+    rate = len(messages) / (time.perf_counter() - started)
+    
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    contexts = [context_class(message=message, bot=None, view=StringView(message.content), prefix="!") for message in messages] # type: ignore[arg-type]
+    kept = (tracemalloc.get_traced_memory()[0] - before) / len(contexts)
+    tracemalloc.stop()
+    return rate, kept
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measures Context creation rate and memory per Context.")
+    parser.add_argument("--messages", type=int, default=100000, help="messages to create contexts for (default: 100000)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the message mix (default: 0)")
+    args = parser.parse_args()
+    
+    messages = make_messages(args.messages, random.Random(args.seed))
+    eager_rate, eager_kept = measure(EagerContext, messages)
+    lazy_rate, lazy_kept = measure(Context, messages)
+    
+    print(f"{len(messages):,} messages: 70% short commands, 20% code blocks, 10% long chat")
+    print(f"eager (old) {eager_rate:>12,.0f} contexts/s {eager_kept:>8,.0f} bytes per context")
+    print(f"lazy        {lazy_rate:>12,.0f} contexts/s {lazy_kept:>8,.0f} bytes per context")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures the pre-dispatch filter of `Bot.process_commands` (`Bot._could_be_command`) on a synthetic
+stream of messages, i.e. how many messages per second can be rejected before a Context is created.
+
+The stream mixes chat messages, messages with a prefix (known and unknown commands) and mentions of
+the bot, spread over guilds where some have a custom prefix. The filter runs on a real `PrefixCache`,
+only the bot and the messages are stand-ins, so no Discord connection or database is needed.
+
+Usage (from the repository's root folder):
+    python -m benchmarks.fast_reject [--messages 100000] [--guilds 1000] [--custom-prefixes 143]
+"""
+
+import time
+import random
+import argparse
+from types import SimpleNamespace
+
+from src         import config
+from src.classes import Bot, PrefixCache
+
+USER_ID = 123456789012345678
+COMMANDS = ["help", "ping", "prefix", "eval", "search", "backup", "dbstats", "cmdstats"]
+WORDS = "the quick brown fox jumps over the lazy dog lol what ok yeah no idea".split()
+
+def make_stream(count: int, guilds: int, prefixes: dict[int, str], rng: random.Random) -> list[SimpleNamespace]:
+    messages = []
+    for _ in range(count):
+        guild_id = rng.randrange(guilds)
+        prefix = prefixes.get(guild_id, config.DEFAULT_PREFIX)
+        kind = rng.random()
+        chat = " ".join(rng.choices(WORDS, k=rng.randint(1, 20)))
+        if kind < 0.97:
+            content = chat
+        elif kind < 0.98:
+            content = f"{prefix}{rng.choice(COMMANDS)} {chat}"
+        elif kind < 0.99:
+            content = f"{prefix}notacommand {chat}"
+        else:
+            content = f"<@{USER_ID}> {chat}"
+        messages.append(SimpleNamespace(content=content, guild=SimpleNamespace(id=guild_id), channel=SimpleNamespace(id=guild_id)))
+    return messages
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measures the pre-dispatch filter of Bot.process_commands.")
+    parser.add_argument("--messages", type=int, default=100000, help="messages in the stream (default: 100000)")
+    parser.add_argument("--guilds", type=int, default=1000, help="guilds the messages come from (default: 1000)")
+    parser.add_argument("--custom-prefixes", type=int, default=143, help="guilds with a custom prefix (default: 143)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the stream (default: 0)")
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    bot = SimpleNamespace(strip_after_prefix=True, all_commands={name: None for name in COMMANDS})
+    bot.prefixes = PrefixCache(bot) # type: ignore[arg-type]
+    custom = {guild_id: rng.choice(["?", "!!", "$", ">>", "bot "]) for guild_id in rng.sample(range(args.guilds), min(args.custom_prefixes, args.guilds))}
+    bot.prefixes.custom.update(custom)
+    bot.prefixes.set_mentions(USER_ID)
+    messages = make_stream(args.messages, args.guilds, custom, rng)
+    
+    could_be_command = Bot._could_be_command
+    could_be_command(bot, messages[0]) # type: ignore[arg-type]
+    started = time.perf_counter()
+    passed = sum(could_be_command(bot, message) for message in messages) # type: ignore[arg-type]
+    duration = time.perf_counter() - started
+    
+    print(f"{len(messages):,} messages from {args.guilds:,} guilds ({len(custom):,} with a custom prefix)")
+    print(f"passed to discord.py: {passed:,} ({passed / len(messages):.1%}), the rest rejected before a Context is created")
+    print(f"{len(messages) / duration:,.0f} messages/s, {duration / len(messages) * 1e9:,.0f} ns per message")
+    if config.LOG_NOT_FOUND_COMMANDS_TO_CONSOLE or config.COMMAND_NOT_FOUND_MESSAGE:
+        print("(unknown commands pass too, because LOG_NOT_FOUND_COMMANDS_TO_CONSOLE or COMMAND_NOT_FOUND_MESSAGE is enabled)")
+
+if __name__ == "__main__":
+    main()
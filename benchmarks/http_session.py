@@ -0,0 +1,69 @@
+"""
+Measures sequential fetch latency of `get_raw_content_data` with a new session for every fetch
+(what it did before the bot had a shared session) and with the shared pooled session.
+
+By default it fetches a 50 KB body from a local server, which only shows the TCP connection setup
+saved. Pass `--url` to fetch from a real host, where DNS lookups, TLS handshakes and network round
+trips are saved too.
+
+Usage (from the repository's root folder):
+    python -m benchmarks.http_session [--fetches 300] [--url URL]
+"""
+
+import time
+import asyncio
+import argparse
+import statistics
+
+from src.utils.bot  import get_raw_content_data
+from src.utils.http import create_session, set_default_session
+
+from aiohttp import web
+
+async def measure(name: str, url: str, fetches: int) -> None:
+    for _ in range(min(10, fetches)):
+        await get_raw_content_data(url)
+    
+    latencies = []
+    for _ in range(fetches):
+        started = time.perf_counter()
+        await get_raw_content_data(url)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    print(f"{name:<22} mean {statistics.mean(latencies):>7.2f}ms  p50 {latencies[len(latencies) // 2]:>7.2f}ms  p99 {latencies[int(len(latencies) * 0.99)]:>7.2f}ms")
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Measures fetch latency with a new session per fetch and with the shared session.")
+    parser.add_argument("--fetches", type=int, default=300, help="sequential fetches per run (default: 300)")
+    parser.add_argument("--url", help="fetch this URL instead of a local server")
+    args = parser.parse_args()
+    
+    runner = None
+    url = args.url
+    if url is None:
+        body = b"x" * 50_000
+        app = web.Application()
+        app.router.add_get("/image", lambda request: web.Response(body=body))
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        port = runner.addresses[0][1]
+        url = f"http://127.0.0.1:{port}/image"
+    
+    try:
+        print(f"{args.fetches:,} sequential fetches of {url}")
+        await measure("new session per fetch", url, args.fetches)
+        
+        session = create_session()
+        set_default_session(session)
+        try:
+            await measure("shared session", url, args.fetches)
+        finally:
+            set_default_session(None)
+            await session.close()
+    finally:
+        if runner is not None:
+            await runner.cleanup()
+
+if __name__ == "__main__":
+    asyncio.run(main())
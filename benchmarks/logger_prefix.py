@@ -0,0 +1,51 @@
+"""
+Measures `Logger.info` throughput with both the console and the log file enabled, with the
+per-second prefix cache and without it (the prefix rendered again for every line and sink).
+
+The console output goes to an in-memory stream, so the terminal's speed doesn't skew the numbers.
+The log file is written to a temporary folder.
+
+Usage (from the repository's root folder):
+    python -m benchmarks.logger_prefix [--lines 200000]
+"""
+
+import io
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+
+from src.logger import Logger
+
+class UncachedLogger(Logger):
+    """Renders the prefix for every line and sink, like before the prefix cache."""
+    
+    def _prefix_handler(self, *args, **kwargs) -> str:
+        self._prefix_cache.clear()
+        return super()._prefix_handler(*args, **kwargs)
+
+def measure(logger_class: type[Logger], lines: int) -> float:
+    """Lines per second."""
+    with tempfile.TemporaryDirectory() as folder, contextlib.redirect_stdout(io.StringIO()):
+        logger = logger_class("benchmark", folder, max_bytes=0, rotate_interval=0, rate_limit=0, buffer_size=0)
+        started = time.perf_counter()
+        for i in range(lines):
+            logger.info("message %d", i)
+        duration = time.perf_counter() - started
+        logger.close()
+    return lines / duration
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measures Logger.info throughput with and without the prefix cache.")
+    parser.add_argument("--lines", type=int, default=200000, help="lines to log per run (default: 200000)")
+    args = parser.parse_args()
+    
+    uncached = measure(UncachedLogger, args.lines)
+    cached = measure(Logger, args.lines)
+    print(f"Python {sys.version.split()[0]}, {args.lines:,} lines to the console and a log file")
+    print(f"without prefix cache {uncached:>10,.0f} lines/s")
+    print(f"with prefix cache    {cached:>10,.0f} lines/s ({cached / uncached:.2f}x)")
+
+if __name__ == "__main__":
+    main()
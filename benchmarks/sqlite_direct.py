@@ -0,0 +1,74 @@
+"""
+Compares Prisma with the direct SQLite access (`bot.sqlite`) on identical primary key lookups of
+the `Prefix` table: one at a time (latency) and many at once (throughput).
+
+It runs against the bot's database (`DATABASE_LOCATION`, run `prisma db push` first). The rows it
+looks up are inserted with negative IDs, which no guild or channel has, and deleted afterwards.
+
+Usage (from the repository's root folder):
+    python -m benchmarks.sqlite_direct [--rows 10000] [--lookups 5000] [--concurrency 50] [--sqlite-only]
+"""
+
+import time
+import random
+import asyncio
+import argparse
+import statistics
+from typing import Any, Awaitable, Callable
+
+from src         import config
+from src.classes import SQLite
+
+async def measure(name: str, lookup: Callable[[int], Awaitable[Any]], ids: list[int], concurrency: int) -> None:
+    for id in ids[:100]:
+        await lookup(id)
+    
+    latencies = []
+    for id in ids:
+        started = time.perf_counter()
+        await lookup(id)
+        latencies.append((time.perf_counter() - started) * 1e6)
+    latencies.sort()
+    
+    started = time.perf_counter()
+    for start in range(0, len(ids), concurrency):
+        await asyncio.gather(*(lookup(id) for id in ids[start:start + concurrency]))
+    throughput = len(ids) / (time.perf_counter() - started)
+    
+    print(f"{name:<8} mean {statistics.mean(latencies):>8,.0f}µs  p50 {latencies[len(latencies) // 2]:>8,.0f}µs  "
+          f"p99 {latencies[int(len(latencies) * 0.99)]:>8,.0f}µs  {throughput:>10,.0f} lookups/s with {concurrency} at once")
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Compares Prisma with direct SQLite access on identical lookups.")
+    parser.add_argument("--rows", type=int, default=10000, help="rows to look up from (default: 10000)")
+    parser.add_argument("--lookups", type=int, default=5000, help="lookups per path (default: 5000)")
+    parser.add_argument("--concurrency", type=int, default=50, help="lookups at once for the throughput run (default: 50)")
+    parser.add_argument("--sqlite-only", action="store_true", help="skip Prisma, e.g. when its query engine isn't installed")
+    args = parser.parse_args()
+    
+    rng = random.Random(0)
+    row_ids = [-(i + 1) for i in range(args.rows)]
+    ids = [rng.choice(row_ids) for _ in range(args.lookups)]
+    
+    sqlite = SQLite(config.DATABASE_LOCATION)
+    await sqlite.connect()
+    await sqlite.execute_many('INSERT OR REPLACE INTO "Prefix" (id, prefix) VALUES (?, ?)', ((id, "?") for id in row_ids))
+    try:
+        print(f"{args.lookups:,} primary key lookups of {args.rows:,} rows in {config.DATABASE_LOCATION}")
+        await measure("sqlite", lambda id: sqlite.fetch_one('SELECT id, prefix FROM "Prefix" WHERE id = ?', (id,)), ids, args.concurrency)
+        
+        if not args.sqlite_only:
+            from prisma import Prisma
+            
+            prisma = Prisma()
+            await prisma.connect()
+            try:
+                await measure("prisma", lambda id: prisma.prefix.find_unique(where={"id": id}), ids, args.concurrency)
+            finally:
+                await prisma.disconnect()
+    finally:
+        await sqlite.execute('DELETE FROM "Prefix" WHERE id < 0')
+        await sqlite.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
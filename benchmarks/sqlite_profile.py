@@ -0,0 +1,114 @@
+"""
+Compares SQLite's defaults with the `SQLITE_PRAGMAS` profile on a write/read workload, and measures
+the `connection_limit=1` trade-off of the datasource URL (one connection shared by every query
+instead of a pool of connections).
+
+The workload runs on a fresh database in a temporary folder (or `--folder`, use one on the disk the
+bot's database is on, temporary folders can be in memory):
+- writes: single-row inserts, every insert is its own transaction like most of the bot's writes
+- reads: indexed count queries, like most of the bot's lookups
+- shared vs pooled: reads from `--threads` threads while a writer inserts, once through a single
+  connection they take turns on and once with a connection per thread
+
+Usage (from the repository's root folder):
+    python -m benchmarks.sqlite_profile [--writes 3000] [--reads 20000] [--threads 4] [--folder PATH]
+"""
+
+import os
+import time
+import sqlite3
+import argparse
+import tempfile
+import threading
+from typing     import Any
+from contextlib import nullcontext
+
+from src import config
+
+SCHEMA = """
+CREATE TABLE items (id INTEGER PRIMARY KEY, guild_id INTEGER NOT NULL, value TEXT NOT NULL);
+CREATE INDEX items_guild ON items (guild_id);
+"""
+
+def connect(path: str, pragmas: dict[str, Any]) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    for name, value in pragmas.items():
+        connection.execute(f"PRAGMA {name} = {value};").fetchall()
+    return connection
+
+def write_read(folder: str, name: str, pragmas: dict[str, Any], writes: int, reads: int) -> None:
+    path = os.path.join(folder, f"{name}.db")
+    connection = connect(path, pragmas)
+    connection.executescript(SCHEMA)
+    
+    started = time.perf_counter()
+    for i in range(writes):
+        connection.execute("INSERT INTO items (guild_id, value) VALUES (?, ?)", (i % 100, "x" * 64))
+    write_time = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    for i in range(reads):
+        connection.execute("SELECT COUNT(*) FROM items WHERE guild_id = ?", (i % 100,)).fetchone()
+    read_time = time.perf_counter() - started
+    connection.close()
+    
+    print(f"{name:<10} {writes / write_time:>12,.0f} commits/s {reads / read_time:>12,.0f} reads/s")
+
+def shared_vs_pooled(folder: str, pragmas: dict[str, Any], reads: int, threads: int) -> None:
+    path = os.path.join(folder, "connections.db")
+    setup = connect(path, pragmas)
+    setup.executescript(SCHEMA)
+    setup.executemany("INSERT INTO items (guild_id, value) VALUES (?, ?)", ((i % 100, "x" * 64) for i in range(10000)))
+    setup.close()
+    
+    def run(shared: bool) -> float:
+        stop = threading.Event()
+        lock = threading.Lock() if shared else nullcontext()
+        shared_connection = connect(path, pragmas) if shared else None
+        
+        def writer() -> None:
+            connection = shared_connection or connect(path, pragmas)
+            while not stop.is_set():
+                with lock:
+                    connection.execute("INSERT INTO items (guild_id, value) VALUES (?, ?)", (1, "y" * 64))
+                time.sleep(0.001)
+        
+        def reader() -> None:
+            connection = shared_connection or connect(path, pragmas)
+            for i in range(reads // threads):
+                with lock:
+                    connection.execute("SELECT COUNT(*) FROM items WHERE guild_id = ?", (i % 100,)).fetchone()
+        
+        writer_thread = threading.Thread(target=writer)
+        writer_thread.start()
+        readers = [threading.Thread(target=reader) for _ in range(threads)]
+        started = time.perf_counter()
+        for thread in readers:
+            thread.start()
+        for thread in readers:
+            thread.join()
+        duration = time.perf_counter() - started
+        stop.set()
+        writer_thread.join()
+        return (reads // threads * threads) / duration
+    
+    print(f"{'shared':<10} {run(True):>12,.0f} reads/s  (connection_limit=1, {threads} readers and a writer take turns)")
+    print(f"{'pooled':<10} {run(False):>12,.0f} reads/s  (a connection per reader and one for the writer)")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compares SQLite's defaults with the SQLITE_PRAGMAS profile.")
+    parser.add_argument("--writes", type=int, default=3000, help="single-row insert transactions (default: 3000)")
+    parser.add_argument("--reads", type=int, default=20000, help="indexed count queries (default: 20000)")
+    parser.add_argument("--threads", type=int, default=4, help="reader threads for shared vs pooled (default: 4)")
+    parser.add_argument("--folder", help="where to create the databases (default: a temporary folder)")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory(dir=args.folder) as folder:
+        print(f"SQLite {sqlite3.sqlite_version}, databases in {folder}\n")
+        write_read(folder, "default", {}, args.writes, args.reads)
+        write_read(folder, "profile", config.SQLITE_PRAGMAS, args.writes, args.reads)
+        print()
+        shared_vs_pooled(folder, config.SQLITE_PRAGMAS, args.reads, max(1, args.threads))
+
+if __name__ == "__main__":
+    main()
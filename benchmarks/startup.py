@@ -0,0 +1,51 @@
+"""
+Checks that importing the bot (the "imports" phase of `python -m src`) stays under a time budget.
+
+Every run imports `src.bot` in a fresh interpreter, so nothing is cached between runs, and reads
+the phase's time from the startup profiler. Exits with status 1 if the median run is over the
+budget, so it can fail a CI job or a pre-commit hook.
+
+Usage (from the repository's root folder):
+    python -m benchmarks.startup [--runs 5] [--budget SECONDS]
+
+The budget defaults to `STARTUP_IMPORT_BUDGET` in the config.
+"""
+
+import sys
+import argparse
+import statistics
+import subprocess
+
+from src import config
+
+# Prints the "imports" phase's time as the last line, after whatever the bot prints while importing
+CHILD = "import src.bot; print(); print(src.bot.import_time)"
+
+def measure() -> float:
+    """Seconds the "imports" phase took in a fresh interpreter."""
+    result = subprocess.run([sys.executable, "-c", CHILD], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"importing src.bot failed:\n{result.stderr}")
+    return float(result.stdout.strip().splitlines()[-1])
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Checks that importing the bot stays under a time budget.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to import the bot in (default: 5)")
+    parser.add_argument("--budget", type=float, default=config.STARTUP_IMPORT_BUDGET, help="seconds (default: STARTUP_IMPORT_BUDGET)")
+    args = parser.parse_args()
+    
+    times = [measure() for _ in range(max(1, args.runs))]
+    median = statistics.median(times)
+    print(f"imports: median {median:.3f}s, min {min(times):.3f}s, max {max(times):.3f}s over {len(times)} run(s)")
+    
+    if args.budget is None:
+        print("no budget set, not checking it")
+        return 0
+    if median > args.budget:
+        print(f"over the {args.budget}s budget (set PROFILE_IMPORTS=1 and run the bot to see which packages are slow)")
+        return 1
+    print(f"within the {args.budget}s budget")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
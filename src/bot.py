@@ -23,8 +23,8 @@ if __name__ == "__main__":
           f"{blue}{bold}>{reset} {yellow}{executable} -m {dirname}{reset}", flush=True)
     os._exit(1)
 
-import logging as logg
-from datetime import datetime
+from .profiler      import profiler
+profiler.start("imports")
 
 from .              import config
 from .utils.bot     import get_prefix
@@ -36,31 +36,39 @@ from .logger        import logging
 from .classes       import Bot
 from .termcolors    import *
 
-import discord
 from dotenv import load_dotenv
 
+import_time = profiler.stop("imports") or 0
 logging.info("initialising")
 
-if config.SAVE_DISCORD_LOGS:
-    os.makedirs(logging.logs_folder or "logs", exist_ok=True)
-    filepath = logging.log_file or os.path.join(logging.logs_folder or "logs", f"{logging.name} {datetime.now().strftime(config.LOG_FILE_NAME_TIME_FORMAT)}.log")
-    discord.utils.setup_logging(
-        handler = logg.FileHandler(filepath),
-        formatter = logg.Formatter("{asctime} {levelname:<8} {name} > {message}", config.LOGGER_TIME_FORMAT, style="{"),
-        root = False
+if config.STARTUP_IMPORT_BUDGET is not None and import_time > config.STARTUP_IMPORT_BUDGET:
+    logging.warn("importing the bot took %.2fs, over the %ss STARTUP_IMPORT_BUDGET (set PROFILE_IMPORTS to see which packages are slow)",
+                 import_time, config.STARTUP_IMPORT_BUDGET)
+
+# discord.py (and the other library) logs go through the custom logger, sharing its writer,
+# log files and rotation, at their own level (LIBRARY_LOG_LEVEL)
+if config.SAVE_DISCORD_LOGS or config.PRINT_DISCORD_LOGS:
+    logging.bridge(
+        config.LIBRARY_LOGGERS,
+        level = config.LIBRARY_LOG_LEVEL,
+        do_print = config.PRINT_DISCORD_LOGS,
+        do_save = config.SAVE_DISCORD_LOGS
     )
-    logging.debug("discord.py file handler set up")
+    logging.debug("discord.py logs routed into the custom logger")
 
 if config.DEBUG:
     logging.log_level = 5
     logging.debug("Houston, we have a code GRAY (DEBUG)")
     logging.debug("debug mode enabled")
 
-print_versions()
+with profiler.phase("print_versions"):
+    print_versions()
 
-load_dotenv()
+with profiler.phase("load_dotenv"):
+    load_dotenv()
 logging.info("loaded environment variables")
 
+profiler.start("create_bot")
 bot = Bot(
     command_prefix = get_prefix,
     strip_after_prefix = True,
@@ -69,6 +77,7 @@ bot = Bot(
     # if both are not specified or False, it only lets others run commands
     # self_bot and user_bot can't be used together
 )
+profiler.stop("create_bot")
 
 print_terminal_size()
 
@@ -83,6 +92,9 @@ def start(*args, **kwargs):
     token = os.getenv("TOKEN")
     
     if token:
+        # discord.py's own log handler is not needed, its logs are routed into the custom logger
+        kwargs.setdefault("log_handler", None)
+        profiler.start("login") # Ends when setup_hook is called
         bot.run(token, *args, **kwargs)
     else:
         logging.critical("environment variable 'TOKEN' not found. are you sure you have setup your `.env` file correctly?")
\ No newline at end of file
@@ -5,4 +5,12 @@ Classes that will be used in the bot replacing the default `discord.py` ones.
 from .bot          import *
 from .cog          import *
 from .context      import *
+from .prefixes     import *
+from .model_cache  import *
+from .query_stats  import *
+from .sqlite       import *
+from .flusher      import *
+from .analytics    import *
+from .archive      import *
+from .write_buffer import *
 from .custom_types import *
\ No newline at end of file
@@ -0,0 +1,271 @@
+import time
+import asyncio
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from ..        import config
+from ..logger  import logging
+from .flusher  import PeriodicFlusher
+
+if TYPE_CHECKING:
+    from .bot     import Bot
+    from .context import Context
+
+__all__ = (
+    "CommandAnalytics",
+    "CommandUse",
+    "CommandStats"
+)
+
+class CommandUse(NamedTuple):
+    command: str         # Qualified name, e.g. "prefix set"
+    user_id: int
+    guild_id: int | None
+    channel_id: int
+    used_at: int         # Unix time in milliseconds
+    duration: float      # Seconds
+    failed: bool
+
+class CommandStats(NamedTuple):
+    command: str
+    uses: int
+    failures: int
+    average_duration: float
+    max_duration: float
+
+_INSERT_USES = (
+    'INSERT INTO "CommandUsage" (command, user_id, guild_id, channel_id, used_at, duration, failed) '
+    'VALUES (?, ?, ?, ?, ?, ?, ?)'
+)
+_UPSERT_ROLLUPS = (
+    'INSERT INTO "CommandRollup" (hour, command, uses, failures, total_duration, max_duration) '
+    'VALUES (?, ?, ?, ?, ?, ?) '
+    'ON CONFLICT (hour, command) DO UPDATE SET '
+    'uses = uses + excluded.uses, '
+    'failures = failures + excluded.failures, '
+    'total_duration = total_duration + excluded.total_duration, '
+    'max_duration = MAX(max_duration, excluded.max_duration)'
+)
+_SELECT_STATS = (
+    'SELECT command, SUM(uses), SUM(failures), SUM(total_duration), MAX(max_duration) '
+    'FROM "CommandRollup" WHERE hour >= ? {filter}'
+    'GROUP BY command ORDER BY SUM(uses) DESC LIMIT ?'
+)
+
+# Seconds after which an invocation whose after hook didn't run is forgotten
+_STALE_AFTER = 3600
+
+class CommandAnalytics:
+    """
+    Records every command invocation (command, user, guild, channel, duration, whether it failed)
+    through the bot's before and after invoke hooks.
+    
+    Invocations are kept in memory and written in bulk every `interval` seconds (or once `max_size`
+    are waiting), in one transaction together with hourly rollups (uses, failures, total and max
+    duration per command and hour). Stats are read from the rollups, so they stay fast no matter
+    how many invocations were recorded. Single invocations older than `retention_days` are deleted,
+    rollups are kept.
+    
+    Parameters:
+    - bot (Bot): The bot to record the commands of, its `sqlite` is used when connected, `prisma` otherwise.
+    - max_size (int): Write once this many invocations are waiting (default: COMMAND_ANALYTICS_BUFFER_SIZE).
+    - interval (float): Write at least this often in seconds (default: COMMAND_ANALYTICS_INTERVAL).
+    - retention_days (float): Days to keep single invocations for, 0 to keep them forever (default: COMMAND_ANALYTICS_RETENTION_DAYS).
+    """
+    
+    def __init__(
+        self,
+        bot: "Bot",
+        *,
+        max_size: int = config.COMMAND_ANALYTICS_BUFFER_SIZE,
+        interval: float = config.COMMAND_ANALYTICS_INTERVAL,
+        retention_days: float = config.COMMAND_ANALYTICS_RETENTION_DAYS
+    ) -> None:
+        self.bot = bot
+        self.max_size = max_size
+        self.interval = interval
+        self.retention_days = retention_days
+        self._uses: list[CommandUse] = []
+        self._started: dict[int, dict[str, float]] = {} # Message ID -> command -> perf_counter() before invoking
+        self._flush_lock = asyncio.Lock()
+        self._flusher = PeriodicFlusher(self.flush, interval, "command analytics")
+        self._pruned_hour = 0
+        
+        # Metrics
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0 # Invocations lost because writing them failed
+    
+    @property
+    def pending(self) -> int:
+        """Invocations waiting to be written."""
+        return len(self._uses)
+    
+    async def before_invoke(self, ctx: "Context") -> None:
+        if ctx.command is not None:
+            self._started.setdefault(ctx.message.id, {})[ctx.command.qualified_name] = time.perf_counter()
+    
+    async def after_invoke(self, ctx: "Context") -> None:
+        if ctx.command is None:
+            return
+        
+        # Drops every entry of the message, e.g. a parent group's entry whose after hook never ran
+        started = self._started.pop(ctx.message.id, {}).get(ctx.command.qualified_name)
+        if started is None:
+            return
+        
+        self._uses.append(CommandUse(
+            command = ctx.command.qualified_name,
+            user_id = ctx.author.id,
+            guild_id = ctx.guild.id if ctx.guild else None,
+            channel_id = ctx.channel.id,
+            used_at = int(time.time() * 1000),
+            duration = time.perf_counter() - started,
+            failed = ctx.command_failed
+        ))
+        self.recorded += 1
+        if len(self._uses) >= self.max_size:
+            self._flusher.wake()
+    
+    def start(self) -> None:
+        """Starts writing every `interval` seconds in the background."""
+        self._flusher.start()
+    
+    async def close(self) -> None:
+        """Stops the background writing and writes everything that is waiting."""
+        await self._flusher.stop()
+        await self.flush()
+    
+    async def flush(self) -> None:
+        """Writes the waiting invocations and adds them to the hourly rollups, in one transaction."""
+        async with self._flush_lock:
+            self._drop_stale_starts()
+            uses, self._uses = self._uses, []
+            if not uses:
+                return
+            
+            rollups: dict[tuple[int, str], list[Any]] = {} # (hour, command) -> [uses, failures, total duration, max duration]
+            for use in uses:
+                hour = use.used_at // 3_600_000 * 3600
+                rollup = rollups.get((hour, use.command))
+                if rollup is None:
+                    rollup = rollups[(hour, use.command)] = [0, 0, 0.0, 0.0]
+                rollup[0] += 1
+                rollup[1] += use.failed
+                rollup[2] += use.duration
+                rollup[3] = max(rollup[3], use.duration)
+            
+            started = time.perf_counter()
+            try:
+                if self.bot.sqlite.is_connected():
+                    await self._write_sqlite(uses, rollups)
+                else:
+                    await self._write_prisma(uses, rollups)
+            
+            except Exception as e:
+                self.dropped += len(uses)
+                logging.error("failed to write %d command invocation(s)", len(uses), exc_info=e)
+                return
+            
+            self.written += len(uses)
+            logging.debug("wrote %d command invocation(s) and %d rollup(s) in %.1fms", len(uses), len(rollups), (time.perf_counter() - started) * 1000)
+            
+            await self._prune()
+    
+    def _drop_stale_starts(self) -> None:
+        """Forgets invocations whose after hook never ran (e.g. cancelled ones), so `_started` can't grow forever."""
+        oldest = time.perf_counter() - _STALE_AFTER
+        for message_id in [message_id for message_id, starts in self._started.items() if max(starts.values(), default=0) < oldest]:
+            del self._started[message_id]
+    
+    async def stats(self, hours: float = 24, command: str | None = None, limit: int = 10) -> list[CommandStats]:
+        """
+        The most used commands of the last `hours` hours, read from the hourly rollups.
+        
+        Parameters:
+        - hours (float): How many hours to look back, the current hour is always included (default: 24).
+        - command (str | None): Only this command and its subcommands (default: None).
+        - limit (int): The most commands to return (default: 10).
+        
+        Returns:
+        - list[CommandStats]: The commands, most used first.
+        """
+        await self.flush()
+        since = int((time.time() - hours * 3600) // 3600 * 3600)
+        
+        if self.bot.sqlite.is_connected():
+            parameters: list[Any] = [since]
+            if command:
+                parameters += [command, command + " %"]
+            parameters.append(limit)
+            
+            rows = await self.bot.sqlite.fetch_all(
+                _SELECT_STATS.format(filter="AND (command = ? OR command LIKE ?) " if command else ""),
+                parameters
+            )
+            return [CommandStats(name, uses, failures, total / uses if uses else 0.0, longest) for name, uses, failures, total, longest in rows]
+        
+        where: dict[str, Any] = {"hour": {"gte": since}}
+        if command:
+            where["OR"] = [{"command": command}, {"command": {"startswith": command + " "}}]
+        
+        totals: dict[str, list[Any]] = {}
+        for row in await self.bot.prisma.commandrollup.find_many(where=where):
+            total = totals.setdefault(row.command, [0, 0, 0.0, 0.0])
+            total[0] += row.uses
+            total[1] += row.failures
+            total[2] += row.total_duration
+            total[3] = max(total[3], row.max_duration)
+        
+        ranked = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        return [CommandStats(name, uses, failures, duration / uses if uses else 0.0, longest) for name, (uses, failures, duration, longest) in ranked]
+    
+    async def _write_sqlite(self, uses: list[CommandUse], rollups: dict[tuple[int, str], list[Any]]) -> None:
+        async with self.bot.sqlite.transaction() as db:
+            await db.execute_many(_INSERT_USES, uses)
+            await db.execute_many(_UPSERT_ROLLUPS, [(hour, command, *rollup) for (hour, command), rollup in rollups.items()])
+    
+    async def _write_prisma(self, uses: list[CommandUse], rollups: dict[tuple[int, str], list[Any]]) -> None:
+        async with self.bot.prisma.batch_() as batch:
+            for use in uses:
+                batch.commandusage.create(data=use._asdict())
+            for (hour, command), (count, failures, duration, longest) in rollups.items():
+                # The query engine can't take the larger of two values in an update, the max duration
+                # is only exact when this flush creates the rollup (or with SQLITE_DIRECT_ACCESS)
+                batch.commandrollup.upsert(
+                    where = {"hour_command": {"hour": hour, "command": command}},
+                    data = {
+                        "create": {
+                            "hour": hour,
+                            "command": command,
+                            "uses": count,
+                            "failures": failures,
+                            "total_duration": duration,
+                            "max_duration": longest
+                        },
+                        "update": {
+                            "uses": {"increment": count},
+                            "failures": {"increment": failures},
+                            "total_duration": {"increment": duration}
+                        }
+                    }
+                )
+    
+    async def _prune(self) -> None:
+        """Deletes the invocations older than `retention_days`, at most once an hour."""
+        hour = int(time.time() // 3600)
+        if not self.retention_days or hour == self._pruned_hour:
+            return
+        self._pruned_hour = hour
+        
+        before = int((time.time() - self.retention_days * 86400) * 1000)
+        try:
+            if self.bot.sqlite.is_connected():
+                deleted = await self.bot.sqlite.execute('DELETE FROM "CommandUsage" WHERE used_at < ?', (before,))
+            else:
+                deleted = await self.bot.prisma.commandusage.delete_many(where={"used_at": {"lt": before}})
+        except Exception as e:
+            logging.error("failed to delete old command invocations", exc_info=e)
+            return
+        
+        if deleted:
+            logging.info("deleted %d command invocation(s) older than %s day(s)", deleted, self.retention_days)
@@ -0,0 +1,306 @@
+import os
+import time
+import asyncio
+import sqlite3
+from typing import Any, NamedTuple
+
+from ..        import config
+from ..logger  import logging
+
+from .sqlite import SQLiteConnection
+
+__all__ = (
+    "MessageArchive",
+    "ArchivedMessage",
+    "ArchivedChannel",
+    "SearchResult"
+)
+
+class ArchivedMessage(NamedTuple):
+    id: int
+    channel_id: int
+    guild_id: int | None
+    author_id: int
+    content: str
+    attachments: str      # Attachment URLs, one per line
+    edited_at: int | None # Unix time in milliseconds
+
+class ArchivedChannel(NamedTuple):
+    id: int
+    guild_id: int | None
+    messages: int
+    backfilled_before: int | None # Oldest message backfilled so far, None if never backfilled, 0 if backfilled completely
+
+class SearchResult(NamedTuple):
+    id: int
+    channel_id: int
+    guild_id: int | None
+    author_id: int
+    snippet: str
+
+# The archive is its own database file and not part of the Prisma schema, `prisma db push` would
+# drop the full-text index's virtual and shadow tables it doesn't know about
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id          INTEGER PRIMARY KEY, -- Snowflake, so ID ranges are time ranges
+    channel_id  INTEGER NOT NULL,
+    guild_id    INTEGER,
+    author_id   INTEGER NOT NULL,
+    content     TEXT    NOT NULL,
+    attachments TEXT    NOT NULL DEFAULT '',
+    edited_at   INTEGER
+);
+CREATE INDEX IF NOT EXISTS messages_channel ON messages (channel_id, id);
+CREATE INDEX IF NOT EXISTS messages_author ON messages (author_id, id);
+
+CREATE TABLE IF NOT EXISTS channels (
+    id                INTEGER PRIMARY KEY,
+    guild_id          INTEGER,
+    messages          INTEGER NOT NULL DEFAULT 0,
+    backfilled_before INTEGER
+);
+
+-- External content: the index only stores the tokens, the text stays in `messages`
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    content,
+    content = 'messages',
+    content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS messages_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+    UPDATE channels SET messages = messages + 1 WHERE id = new.channel_id;
+END;
+CREATE TRIGGER IF NOT EXISTS messages_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    UPDATE channels SET messages = messages - 1 WHERE id = old.channel_id;
+END;
+CREATE TRIGGER IF NOT EXISTS messages_update AFTER UPDATE OF content ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+END;
+"""
+
+# Edits replace the archived message, re-archiving an unchanged message does nothing
+_UPSERT_MESSAGE = """
+INSERT INTO messages (id, channel_id, guild_id, author_id, content, attachments, edited_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    content = excluded.content,
+    attachments = excluded.attachments,
+    edited_at = excluded.edited_at
+WHERE excluded.edited_at IS NOT messages.edited_at
+"""
+
+_SEARCH = """
+SELECT m.id, m.channel_id, m.guild_id, m.author_id, snippet(messages_fts, 0, '**', '**', '…', 16)
+FROM messages_fts
+JOIN messages m ON m.id = messages_fts.rowid
+WHERE messages_fts MATCH ? AND messages_fts.rowid BETWEEN ? AND ? {filters}
+ORDER BY messages_fts.rowid DESC
+LIMIT ?
+"""
+
+def _write_batch(connection: sqlite3.Connection, messages: list[ArchivedMessage]) -> None:
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        connection.executemany(_UPSERT_MESSAGE, messages)
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+class MessageArchive:
+    """
+    Archives the messages of selected channels into its own SQLite database with a full-text
+    (FTS5) index, so millions of messages can be searched in milliseconds.
+    
+    Messages are queued with `submit()` (never waits, for `on_message`) or `put()` (waits for room,
+    for backfilling) and written by a background task in batches of up to `batch_size`, one
+    transaction per batch, in the database connection's own thread. The queue holds at most
+    `queue_size` messages, so memory stays bounded no matter how fast messages come in.
+    
+    Parameters:
+    - path (str): The archive's database file (default: ARCHIVE_DATABASE_LOCATION).
+    - queue_size (int): The most messages waiting to be written (default: ARCHIVE_QUEUE_SIZE).
+    - batch_size (int): The most messages written in one transaction (default: ARCHIVE_BATCH_SIZE).
+    """
+    
+    def __init__(
+        self,
+        path: str = config.ARCHIVE_DATABASE_LOCATION,
+        *,
+        queue_size: int = config.ARCHIVE_QUEUE_SIZE,
+        batch_size: int = config.ARCHIVE_BATCH_SIZE
+    ) -> None:
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.channels: dict[int, ArchivedChannel] = {} # Channel ID -> archived channel, as of when it was added or last backfilled
+        self._queue: asyncio.Queue[ArchivedMessage] = asyncio.Queue(maxsize=max(1, queue_size))
+        self._writer = SQLiteConnection(path, cached_statements=16, name="archive-writer")
+        self._reader = SQLiteConnection(path, cached_statements=16, name="archive-reader")
+        self._task: asyncio.Task | None = None
+        
+        # Metrics
+        self.written = 0
+        self.dropped = 0 # Messages not archived because the queue was full
+        self.failed = 0  # Messages lost because writing their batch failed
+    
+    @property
+    def pending(self) -> int:
+        """Messages waiting to be written."""
+        return self._queue.qsize()
+    
+    async def open(self) -> None:
+        """Opens (and creates) the archive's database and starts writing queued messages."""
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        
+        pragmas = {name: value for name, value in config.SQLITE_PRAGMAS.items() if name.isidentifier() and (isinstance(value, int) or str(value).isidentifier())}
+        await self._writer.open(pragmas)
+        await self._writer.run(sqlite3.Connection.executescript, _SCHEMA)
+        await self._reader.open({**{name: value for name, value in pragmas.items() if name != "journal_mode"}, "query_only": "ON"})
+        
+        for row in await self._reader.fetch_all("SELECT id, guild_id, messages, backfilled_before FROM channels"):
+            self.channels[row[0]] = ArchivedChannel(*row)
+        
+        self._task = asyncio.create_task(self._write_loop(), name="message archive")
+    
+    async def close(self) -> None:
+        """Writes every queued message, then closes the database."""
+        if self._task is not None:
+            await self._queue.join()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        
+        await self._reader.close()
+        await self._writer.close()
+    
+    def submit(self, message: ArchivedMessage) -> bool:
+        """Queues a message without waiting, returns False if the queue is full and it was dropped."""
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        return True
+    
+    async def put(self, message: ArchivedMessage) -> None:
+        """Queues a message, waiting for room in the queue if it's full."""
+        await self._queue.put(message)
+    
+    async def join(self) -> None:
+        """Waits until every queued message is written."""
+        await self._queue.join()
+    
+    async def add_channel(self, channel_id: int, guild_id: int | None) -> None:
+        """Starts archiving a channel, counting the messages still archived from when it was archived before."""
+        await self._writer.execute(
+            "INSERT OR IGNORE INTO channels (id, guild_id, messages) VALUES (?, ?, (SELECT COUNT(*) FROM messages WHERE channel_id = ?))",
+            (channel_id, guild_id, channel_id)
+        )
+        row = await self._writer.fetch_one("SELECT id, guild_id, messages, backfilled_before FROM channels WHERE id = ?", (channel_id,))
+        self.channels[channel_id] = ArchivedChannel(*row) if row else ArchivedChannel(channel_id, guild_id, 0, None)
+    
+    async def remove_channel(self, channel_id: int, *, delete_messages: bool = False) -> int:
+        """Stops archiving a channel, returns the amount of deleted messages. Kept messages stay searchable."""
+        self.channels.pop(channel_id, None)
+        deleted = 0
+        if delete_messages:
+            await self.join()
+            deleted = await self._writer.execute("DELETE FROM messages WHERE channel_id = ?", (channel_id,))
+        await self._writer.execute("DELETE FROM channels WHERE id = ?", (channel_id,))
+        return deleted
+    
+    async def set_backfilled(self, channel_id: int, before: int) -> None:
+        """Saves how far back a channel was backfilled (0 if completely), call it after `join()`."""
+        await self._writer.execute("UPDATE channels SET backfilled_before = ? WHERE id = ?", (before, channel_id))
+        channel = self.channels.get(channel_id)
+        if channel is not None:
+            self.channels[channel_id] = channel._replace(backfilled_before=before)
+    
+    async def refresh_channels(self) -> dict[int, ArchivedChannel]:
+        """Reads the message counts of the archived channels again."""
+        rows = await self._reader.fetch_all("SELECT id, guild_id, messages, backfilled_before FROM channels")
+        self.channels = {row[0]: ArchivedChannel(*row) for row in rows}
+        return self.channels
+    
+    async def search(
+        self,
+        query: str,
+        *,
+        after: int = 0,
+        before: int = 2 ** 63 - 1,
+        channel_id: int | None = None,
+        author_id: int | None = None,
+        limit: int = 10
+    ) -> list[SearchResult]:
+        """
+        Searches the archived messages, newest first.
+        
+        Parameters:
+        - query (str): The words to search for, every word has to be in the message. A word ending in `*`
+          matches every word starting with it.
+        - after (int): Only messages with an ID (snowflake) greater than this (default: 0).
+        - before (int): Only messages with an ID (snowflake) less than this (default: no limit).
+        - channel_id (int | None): Only messages of this channel (default: None).
+        - author_id (int | None): Only messages of this user (default: None).
+        - limit (int): The most messages to return (default: 10).
+        
+        Returns:
+        - list[SearchResult]: The messages with the matching words in **bold** in their snippets.
+        """
+        match = _match_expression(query)
+        if not match:
+            return []
+        
+        filters = ""
+        parameters: list[Any] = [match, after + 1, before - 1]
+        if channel_id is not None:
+            filters += "AND m.channel_id = ? "
+            parameters.append(channel_id)
+        if author_id is not None:
+            filters += "AND m.author_id = ? "
+            parameters.append(author_id)
+        parameters.append(limit)
+        
+        rows = await self._reader.fetch_all(_SEARCH.format(filters=filters), parameters)
+        return [SearchResult(*row) for row in rows]
+    
+    async def _write_loop(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            started = time.perf_counter()
+            try:
+                await self._writer.run(_write_batch, batch)
+            except Exception as e:
+                self.failed += len(batch)
+                logging.error("failed to archive %d message(s)", len(batch), exc_info=e)
+            else:
+                self.written += len(batch)
+                logging.debug("archived %d message(s) in %.1fms", len(batch), (time.perf_counter() - started) * 1000)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+def _match_expression(query: str) -> str:
+    """Turns search words into an FTS5 expression matching all of them, so user input can't be FTS5 syntax."""
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if word:
+            terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
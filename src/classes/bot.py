@@ -1,18 +1,31 @@
 import sys
+import ast
+import time
+import asyncio
+import importlib
+import importlib.util
 import logging       as logg
-import pkg_resources
-from typing   import TYPE_CHECKING
+from typing   import TYPE_CHECKING, Any
 from datetime import datetime
 
-from ..            import cogs
-from ..            import utils
-from ..            import config
-from ..utils       import mprint
-from ..logger      import logging
-from ..termcolors  import *
-from ..termcolors  import rgb
+from ..                import cogs
+from ..                import utils
+from ..                import config
+from ..utils           import mprint
+from ..utils.cog_index import CogIndex, IndexedCog
+from ..utils.http      import create_session, set_default_session
+from ..logger          import logging
+from ..profiler        import profiler
+from ..termcolors      import *
+from ..termcolors      import rgb
 
-from .context import Context
+from .context      import Context
+from .prefixes     import PrefixCache
+from .model_cache  import ModelCache
+from .query_stats  import InstrumentedPrisma
+from .sqlite       import SQLite
+from .analytics    import CommandAnalytics
+from .write_buffer import WriteBuffer
 
 if TYPE_CHECKING:
     from .custom_types import (
@@ -20,8 +33,7 @@ if TYPE_CHECKING:
         PrefixType
     )
 
-from prisma import Prisma
-
+import aiohttp
 import discord
 from discord.ext import commands
 
@@ -29,14 +41,135 @@ __all__ = (
     "Bot",
 )
 
+# SQLite reports these pragmas as numbers when they are read back
+_PRAGMA_VALUES = {
+    "synchronous": {"off": 0, "normal": 1, "full": 2, "extra": 3},
+    "temp_store": {"default": 0, "file": 1, "memory": 2},
+    "auto_vacuum": {"none": 0, "full": 1, "incremental": 2}
+}
+
+def _normalize_pragma(name: str, value: Any) -> Any:
+    """Turns a pragma value into the form SQLite reports it in, so set and read values can be compared."""
+    if isinstance(value, str):
+        value = value.lower()
+        value = _PRAGMA_VALUES.get(name, {}).get(value, value)
+        if isinstance(value, str) and value.lstrip("-").isdigit():
+            value = int(value)
+    return value
+
+def _prepare_cog(module: str) -> tuple[list[str], float]:
+    """
+    Imports what a cog imports at its top level without running the cog itself, so that
+    `load_extension` only has to run the cog's own code. Runs in a worker thread, which lets the
+    heavy imports of different cogs happen at the same time.
+    
+    Returns:
+    - tuple[list[str], float]: The cog's `DEPENDS_ON` and how long preparing it took in seconds.
+    """
+    started = time.perf_counter()
+    depends_on: list[str] = []
+    
+    try:
+        spec = importlib.util.find_spec(module)
+        if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+            return depends_on, time.perf_counter() - started
+        
+        with open(spec.origin, "rb") as f:
+            tree = ast.parse(f.read(), spec.origin)
+        
+        package = module.rpartition(".")[0]
+        imports: list[tuple[str, list[str]]] = [] # (module, names imported from it)
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                imports.extend((alias.name, []) for alias in node.names)
+            
+            elif isinstance(node, ast.ImportFrom):
+                name = importlib.util.resolve_name("."*node.level + (node.module or ""), package) if node.level else node.module
+                if name:
+                    imports.append((name, [alias.name for alias in node.names]))
+            
+            elif isinstance(node, ast.Assign) and any(isinstance(target, ast.Name) and target.id == "DEPENDS_ON" for target in node.targets):
+                depends_on = [str(name) for name in ast.literal_eval(node.value)]
+    
+    except Exception:
+        return depends_on, time.perf_counter() - started # load_extension will report the error
+    
+    for name, names in imports:
+        # Other cogs would run twice, load_extension always runs a cog's module again
+        if name == cogs.__package__ or name.startswith(cogs.__package__+"."): # pyright: ignore[reportOptionalOperand]
+            continue
+        
+        try:
+            imported = importlib.import_module(name)
+            for attribute in names:
+                if attribute != "*" and not hasattr(imported, attribute):
+                    importlib.import_module(f"{name}.{attribute}") # `from package import submodule`
+        except Exception:
+            pass # load_extension will report the error
+    
+    return depends_on, time.perf_counter() - started
+
+def _order_cogs(modules: list[str], depends_on: dict[str, list[str]]) -> list[str]:
+    """Orders cogs so that every cog comes after the cogs in its `DEPENDS_ON`, keeping the original order otherwise."""
+    ordered: list[str] = []
+    placed: set[str] = set()
+    remaining = list(modules)
+    
+    while remaining:
+        progress = False
+        for module in list(remaining):
+            # Unknown dependencies are reported when the cog is loaded
+            if all(dependency in placed or dependency not in depends_on for dependency in depends_on[module]):
+                ordered.append(module)
+                placed.add(module)
+                remaining.remove(module)
+                progress = True
+        
+        if not progress:
+            ordered.extend(remaining) # A dependency cycle, these are reported when they're loaded
+            break
+    
+    return ordered
+
+async def _lazy_command(ctx: Context, *, arguments: str = "") -> None:
+    """Stands in for a command of a cog that isn't loaded yet, loads the cog and invokes the real command."""
+    bot = ctx.bot
+    await bot.load_lazy_cog(ctx.command.extras["lazy_cog"]) # pyright: ignore[reportOptionalMemberAccess]
+    
+    real_ctx = await bot.get_context(ctx.message)
+    if real_ctx.command is not None and "lazy_cog" not in real_ctx.command.extras:
+        await bot.invoke(real_ctx)
+
 class Bot(commands.Bot):
     uptime: datetime | None
-    prisma: Prisma
+    prisma: InstrumentedPrisma
+    sqlite: SQLite
+    prefixes: PrefixCache
+    write_buffer: WriteBuffer
+    cache: ModelCache
+    analytics: CommandAnalytics
+    session: aiohttp.ClientSession | None # Shared by all outbound HTTP, open from setup_hook until close
     
     def __init__(self, command_prefix: "PrefixType", *args, **kwargs) -> None:
         super().__init__(command_prefix=command_prefix, *args, **kwargs, help_command=commands.DefaultHelpCommand())
         self.uptime = None
-        self.prisma = Prisma(auto_register=True)
+        self.prisma = InstrumentedPrisma(auto_register=True)
+        self.sqlite = SQLite(config.DATABASE_LOCATION, stats=self.prisma.query_stats)
+        self.prefixes = PrefixCache(self)
+        self.cache = ModelCache(self.prisma)
+        self.write_buffer = WriteBuffer(self.prisma, cache=self.cache)
+        self.analytics = CommandAnalytics(self)
+        self.session = None
+        if config.COMMAND_ANALYTICS:
+            self.before_invoke(self.analytics.before_invoke)
+            self.after_invoke(self.analytics.after_invoke)
+        self._lazy_cogs: dict[str, list[commands.Command]] = {} # Stand-in commands of the cogs that aren't loaded yet
+        self._lazy_depends_on: dict[str, list[str]] = {}
+        self._lazy_lock = asyncio.Lock()
+        
+        # The fast reject in process_commands only knows the prefixes of the prefix cache
+        from ..utils.bot import get_prefix
+        self._prefixes_cached = command_prefix is get_prefix
     
     async def connect_db(self) -> None:
         if self.prisma.is_connected():
@@ -45,48 +178,118 @@ class Bot(commands.Bot):
         
         await self.prisma.connect()
         logging.info(f"connected to database {config.DATABASE_LOCATION}")
+        
+        if config.SQLITE_PRAGMAS:
+            await self.apply_sqlite_profile(config.SQLITE_PRAGMAS)
+        
+        if config.SQLITE_DIRECT_ACCESS:
+            await self.sqlite.connect()
     
     async def disconnect_db(self) -> None:
         if not self.prisma.is_connected():
             logging.warn("tried to disconnect from database while already disconnected")
             return
         
+        await self.sqlite.close()
         await self.prisma.disconnect()
         logging.info("disconnected from database")
     
+    async def apply_sqlite_profile(self, pragmas: dict[str, str | int]) -> dict[str, Any]:
+        """
+        Applies SQLite settings (pragmas) to the database connection, reads them back to check
+        that SQLite accepted them and logs the result.
+        
+        Parameters:
+        - pragmas (dict[str, str | int]): The pragmas to set, e.g. {"journal_mode": "WAL"}.
+        
+        Returns:
+        - dict[str, Any]: The value SQLite reports for every pragma after setting it.
+        """
+        applied: dict[str, Any] = {}
+        for name, value in pragmas.items():
+            if not name.isidentifier() or not (isinstance(value, int) or str(value).isidentifier()):
+                logging.error("skipping invalid SQLite pragma %s = %r", name, value)
+                continue
+            
+            try:
+                # query_raw and not execute_raw, some pragmas return the new value as a row
+                await self.prisma.query_raw(f"PRAGMA {name} = {value};")
+                rows = await self.prisma.query_raw(f"PRAGMA {name};")
+            except Exception as e:
+                logging.error("could not set SQLite pragma %s = %r", name, value, exc_info=e)
+                continue
+            
+            actual = next(iter(rows[0].values()), None) if rows else None
+            applied[name] = actual
+            if _normalize_pragma(name, actual) != _normalize_pragma(name, value):
+                logging.warn("SQLite pragma %s was set to %r but is %r", name, value, actual)
+        
+        logging.info("SQLite profile applied: %s", ", ".join(f"{name}={value}" for name, value in applied.items()))
+        return applied
+    
     async def enable_wal_mode(self) -> None:
-        try:
-            await self.prisma.execute_raw("PRAGMA journal_mode=WAL;")
-            print("SQLite3 journal mode set to WAL.")
-        except Exception as e:
-            print(f"Error setting WAL mode: {e}")
+        """Switches the database to WAL mode, connect_db already does this through SQLITE_PRAGMAS"""
+        await self.apply_sqlite_profile({"journal_mode": "WAL"})
     
     async def _load_all_cogs(self) -> None:
+        """
+        Loads every cog that isn't excluded in the config. The imports of all cogs are prepared
+        at the same time in worker threads, then the cogs are loaded one by one, each after the
+        cogs listed in its module-level `DEPENDS_ON` (e.g. `DEPENDS_ON = ["events"]`).
+        """
+        started = time.perf_counter()
         loaded = []
         excluded = []
+        deferred = []
+        modules = []
         
         exclude = config.COGS_EXCLUDE
         for module in utils.list_modules(cogs):
             if module in exclude or module.replace(cogs.__package__+".", "", 1) in exclude: # pyright: ignore[reportOptionalOperand]
                 excluded.append(module + f" {rgb(49, 49, 49)}(excluded in config){reset}")
                 continue
+            modules.append(module)
+        
+        if config.LAZY_COGS:
+            modules, lazy = await asyncio.to_thread(self._index_cogs, modules)
+            for module, entry in lazy.items():
+                if self._add_lazy_cog(module, entry):
+                    deferred.append(module + f" {rgb(49, 49, 49)}({len(entry['commands'])} commands){reset}")
+                else:
+                    modules.append(module)
+        
+        prepared = await asyncio.gather(*(asyncio.to_thread(_prepare_cog, module) for module in modules))
+        depends_on = {module: [self._resolve_cog_name(name) for name in dependencies] for module, (dependencies, _) in zip(modules, prepared)}
+        timings = {module: duration for module, (_, duration) in zip(modules, prepared)}
+        
+        for module in _order_cogs(modules, depends_on):
+            missing = [dependency for dependency in depends_on[module] if dependency not in self.extensions]
+            if missing:
+                logging.error("excluding `%s` because it depends on %s which did not load", module, ", ".join(f"`{dependency}`" for dependency in missing))
+                excluded.append(module + f" {rgb(49, 49, 49)}(needs {', '.join(missing)}){reset}")
+                continue
             
+            load_started = time.perf_counter()
             try:
                 await self.load_extension(module)
             
             except commands.NoEntryPointError:
-                logging.warn(f"excluding `{module}` because there is no entry point (no 'setup' function found)")
+                logging.warn("excluding `%s` because there is no entry point (no 'setup' function found)", module)
                 excluded.append(module + f" {rgb(49, 49, 49)}(no 'setup' function){reset}")
             
             except Exception as e:
-                logging.critical(f"excluding `{module}` because there was an error while loading it (this may cause unintended behaviour)", exc_info=e)
+                logging.critical("excluding `%s` because there was an error while loading it (this may cause unintended behaviour)", module, exc_info=e)
                 excluded.append(module + f" {rgb(49, 49, 49)}(error: {e.__class__.__name__}){reset}")
             
             else:
-                loaded.append(module)
+                timings[module] += time.perf_counter() - load_started
+                profiler.record(f"cog {module.removeprefix(cogs.__package__ + '.')}", timings[module]) # pyright: ignore[reportOptionalOperand]
+                logging.debug("loaded `%s` in %.1fms", module, timings[module] * 1000)
+                loaded.append(module + f" {rgb(49, 49, 49)}({timings[module] * 1000:.0f}ms){reset}")
         
         loaded_paginated = utils.paginate(loaded, 3)
         excluded_paginated = utils.paginate(excluded, 2)
+        deferred_paginated = utils.paginate(deferred, 3)
         prefix_length = len(utils.strip_color(logging._prefix_handler("info")))
         
         loaded_str = f"the following cogs have been {underline}loaded{reset}:\n"
@@ -99,39 +302,176 @@ class Bot(commands.Bot):
         
         logging.info(loaded_str.strip())
         logging.info(excluded_str.strip())
+        
+        if deferred:
+            deferred_str = f"the following cogs will be {underline}loaded when first used{reset}:\n"
+            for x in deferred_paginated:
+                deferred_str += (" "*prefix_length)+ f"{', '.join(x)}\n"
+            logging.info(deferred_str.strip())
+        
+        logging.info("loaded %d cog(s) in %.0fms", len(loaded), (time.perf_counter() - started) * 1000)
+    
+    def _index_cogs(self, modules: list[str]) -> tuple[list[str], dict[str, IndexedCog]]:
+        """
+        Updates the cog index and splits the cogs into the ones that have to be loaded on startup
+        and the ones that can wait until one of their commands is used. Runs in a worker thread.
+        """
+        index = CogIndex(config.COG_INDEX_LOCATION)
+        index.load()
+        index.update(modules)
+        try:
+            index.save()
+        except OSError as e:
+            logging.warn("could not save the cog index to %s: %s", config.COG_INDEX_LOCATION, e)
+        
+        eager = {module for module in modules if index.cogs[module]["eager"]}
+        
+        # Cogs loaded on startup need the cogs they depend on loaded on startup too
+        pending = list(eager)
+        while pending:
+            for dependency in index.cogs[pending.pop()]["depends_on"]:
+                dependency = self._resolve_cog_name(dependency)
+                if dependency in index.cogs and dependency not in eager:
+                    eager.add(dependency)
+                    pending.append(dependency)
+        
+        return [module for module in modules if module in eager], {module: index.cogs[module] for module in modules if module not in eager}
+    
+    def _add_lazy_cog(self, module: str, entry: IndexedCog) -> bool:
+        """Registers stand-in commands for a cog's commands, returns False if one of their names is taken."""
+        stubs: list[commands.Command] = []
+        try:
+            for indexed in entry["commands"]:
+                stub = commands.Command(
+                    _lazy_command,
+                    name = indexed["name"],
+                    aliases = indexed["aliases"],
+                    brief = indexed["brief"],
+                    help = indexed["help"],
+                    usage = indexed["usage"],
+                    hidden = indexed["hidden"],
+                    extras = {"lazy_cog": module}
+                )
+                self.add_command(stub)
+                stubs.append(stub)
+        
+        except commands.CommandRegistrationError as e:
+            logging.warn("loading `%s` on startup because its command `%s` is already registered", module, e.name)
+            for stub in stubs:
+                self.remove_command(stub.name)
+            return False
+        
+        self._lazy_cogs[module] = stubs
+        self._lazy_depends_on[module] = [self._resolve_cog_name(name) for name in entry["depends_on"]]
+        return True
+    
+    async def load_lazy_cog(self, module: str) -> None:
+        """Loads a cog whose commands are stand-ins (and the lazy cogs it depends on), does nothing if it's already loaded."""
+        async with self._lazy_lock:
+            await self._load_lazy_cog(module)
+    
+    async def _load_lazy_cog(self, module: str) -> None:
+        if module in self.extensions or module not in self._lazy_cogs:
+            return
+        
+        for dependency in self._lazy_depends_on.get(module, []):
+            await self._load_lazy_cog(dependency)
+        
+        started = time.perf_counter()
+        await self.load_extension(module)
+        logging.info("loaded `%s` on first use in %.0fms", module, (time.perf_counter() - started) * 1000)
+    
+    async def load_extension(self, name: str, *, package: str | None = None) -> None:
+        """Loads an extension, replacing the stand-in commands registered for it if it's a lazy cog."""
+        key = self._resolve_cog_name(importlib.util.resolve_name(name, package) if package else name)
+        stubs = self._lazy_cogs.pop(key, None)
+        for stub in stubs or []:
+            self.remove_command(stub.name)
+        
+        try:
+            await super().load_extension(name, package=package)
+        except Exception:
+            # Keep the stand-ins so that the next use of a command tries again
+            if stubs is not None:
+                for stub in stubs:
+                    self.add_command(stub)
+                self._lazy_cogs[key] = stubs
+            raise
+    
+    def _resolve_cog_name(self, name: str) -> str:
+        """Turns a `DEPENDS_ON` entry ("events", "cogs.events" or the full module name) into the full module name."""
+        package = cogs.__package__ or "cogs"
+        if name.startswith(package+"."):
+            return name
+        return f"{package}.{name.removeprefix('cogs.')}"
     
     async def setup_hook(self) -> None:
+        profiler.stop("login")
         self.uptime = discord.utils.utcnow()
         
         mprint()
         mprint(f"{white}~{reset} {bold}{green}{config.BOT_NAME.upper()}{reset} {white}~{reset}")
-        mprint(f"{bright_green}running on{reset} {yellow}python{reset} {blue}{sys.version.split()[0]}{reset}; {yellow}discord.py-self{reset} {blue}{pkg_resources.get_distribution('discord.py-self').version}{reset}")
+        mprint(f"{bright_green}running on{reset} {yellow}python{reset} {blue}{sys.version.split()[0]}{reset}; {yellow}discord.py-self{reset} {blue}{utils.get_package_version('discord.py-self')}{reset}")
         mprint()
         
-        await self.connect_db()
-        await self._load_all_cogs()
+        # Created here because a session has to be created inside the event loop
+        self.session = create_session()
+        set_default_session(self.session)
+        
+        with profiler.phase("connect_db"):
+            await self.connect_db()
+        with profiler.phase("load_prefixes"):
+            await self.prefixes.load()
+        self.write_buffer.start()
+        if config.COMMAND_ANALYTICS:
+            self.analytics.start()
+        with profiler.phase("load_cogs"):
+            await self._load_all_cogs()
         
         if TYPE_CHECKING and self.user is None:
             return  # to satisfy the type checker
         
+        # The bot's user is known after logging in, so the mention prefixes are built once here
+        self.prefixes.set_mentions(self.user.id)
+        
         logging.info(f"commands loaded: {len(self.commands)}")
         
         logging.info("logged in successfully")
         logging.info(f"user: {self.user} ({self.user.id})")
+        
+        # Connecting to the gateway starts after setup_hook returns
+        profiler.start("gateway")
+        self.loop.create_task(self._finish_startup_profile())
+    
+    async def _finish_startup_profile(self) -> None:
+        """Saves the startup timings once the bot is ready."""
+        await self.wait_until_ready()
+        profiler.stop("gateway")
+        boot = await asyncio.to_thread(profiler.finish)
+        logging.info("ready %.2fs after starting (see the `startup` command for details)", boot["total"])
     
     async def close(self, *, abandon: bool = False) -> None:
-        """Disconnect from the database, close the bot, flush stdout & stderr and shutdown loggers"""
-        # Disconnect from the database
+        """Write the buffered database writes and command invocations, disconnect from the database, close the bot and its HTTP session, flush stdout & stderr and shutdown loggers (draining any queued log records)"""
+        # Write everything still waiting in the write buffer and command analytics, then disconnect from the database
+        if self.prisma.is_connected():
+            await self.analytics.close()
+            await self.write_buffer.close()
         await self.disconnect_db()
         
         # Close the bot
         await super().close()
         
+        # Close the shared HTTP session and its connections
+        if self.session is not None:
+            set_default_session(None)
+            await self.session.close()
+            self.session = None
+        
         # Flush stdout & stderr
         sys.stdout.flush()
         sys.stderr.flush()
         
-        # Shutdown loggers
+        # Shutdown loggers, this drains the background log writer if it is running
         logging.critical("bot process exited" if not abandon else "bot process exited (abandoned)")
         logg.shutdown()
         logging.close()
@@ -139,6 +479,28 @@ class Bot(commands.Bot):
         if abandon:
             print()
     
+    async def process_commands(self, message: discord.Message, /) -> None:
+        """Processes the commands of a message, rejecting messages that can't be commands before a Context is created for them"""
+        if self._prefixes_cached and not self._could_be_command(message):
+            return
+        await super().process_commands(message)
+    
+    def _could_be_command(self, message: discord.Message) -> bool:
+        """Whether a message starts with one of its prefixes followed by a known command (or any word if unknown commands are reported)"""
+        prefix = self.prefixes.match(message)
+        if prefix is None:
+            return False
+        
+        # Unknown commands have to reach on_command_error to be logged or answered
+        if config.LOG_NOT_FOUND_COMMANDS_TO_CONSOLE or config.COMMAND_NOT_FOUND_MESSAGE:
+            return True
+        
+        rest = message.content[len(prefix):]
+        if self.strip_after_prefix:
+            rest = rest.lstrip()
+        words = rest.split(maxsplit=1)
+        return bool(words) and words[0] in self.all_commands
+    
     async def get_context(self, message: discord.Message, *, cls: type["ContextT_co"] = Context) -> "ContextT_co":
         """Get Context from a discord.Message"""
         return await super().get_context(message, cls=cls)
\ No newline at end of file
@@ -2,7 +2,8 @@ from typing import (
     TYPE_CHECKING, Any,
     Optional, Sequence
 )
-from datetime import datetime
+from datetime  import datetime
+from functools import cached_property
 
 from .. import utils
 
@@ -16,18 +17,29 @@ from discord.utils import MISSING
 class Context(commands.Context):
     """Utility class for commands that is used to easily interact with commands."""
     bot: "Bot"
-    voice: discord.VoiceState | None
-    cleaned_up_code: str
     out: bool = True
     
-    def __init__(
-        self,
-        *args: Any, 
-        **kwargs: Any
-    ) -> None:
-        super().__init__(*args, **kwargs)
-        self.voice = self.author.voice if isinstance(self.author, discord.Member) else None
-        self.cleaned_up_code = utils.cleanup_code(self.message.content)
+    # Most contexts are never used for code or voice, so these are only computed when they're used
+    
+    @property
+    def voice(self) -> discord.VoiceState | None:
+        """The voice state of the author, None outside of guilds"""
+        return self.author.voice if isinstance(self.author, discord.Member) else None
+    
+    @cached_property
+    def cleaned_up_code(self) -> str:
+        """The message content without code block markers, computed once when first used"""
+        return utils.cleanup_code(self.message.content)
+    
+    @property
+    def log_extra(self) -> dict[str, Any]:
+        """Context fields for structured (JSON) logs, pass it as `extra=` to the logger"""
+        return {
+            "command": self.command.qualified_name if self.command else self.invoked_with,
+            "author_id": self.author.id,
+            "guild_id": self.guild.id if self.guild else None,
+            "channel_id": self.channel.id
+        }
     
     async def edit(
         self,
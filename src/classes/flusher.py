@@ -0,0 +1,68 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from ..logger import logging
+
+__all__ = (
+    "PeriodicFlusher",
+)
+
+class PeriodicFlusher:
+    """
+    Calls `flush` in the background every `interval` seconds, or sooner after `wake()`. Used by the
+    classes that keep writes in memory and write them in batches (`WriteBuffer`, `CommandAnalytics`).
+    
+    A flush that is running when the flusher is stopped isn't cancelled halfway, it finishes in the
+    background. Flushing what is still waiting after `stop()` is left to the owner, whose `flush`
+    should hold a lock so it waits for that one.
+    
+    Parameters:
+    - flush (Callable[[], Awaitable[None]]): Writes what is waiting.
+    - interval (float): Flush at least this often in seconds.
+    - name (str): Name of the background task, also used in the logs.
+    """
+    
+    def __init__(self, flush: Callable[[], Awaitable[None]], interval: float, name: str) -> None:
+        self.flush = flush
+        self.interval = interval
+        self.name = name
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+    
+    @property
+    def running(self) -> bool:
+        """Whether flushes happen in the background."""
+        return self._task is not None and not self._task.done()
+    
+    def start(self) -> None:
+        """Starts flushing in the background."""
+        if not self.running:
+            self._task = asyncio.create_task(self._loop(), name=self.name)
+    
+    def wake(self) -> None:
+        """Flushes without waiting for the rest of the interval."""
+        self._wake.set()
+    
+    async def stop(self) -> None:
+        """Stops flushing in the background."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            
+            try:
+                # Shielded so that stop() cancelling the loop doesn't abort a flush halfway
+                await asyncio.shield(self.flush())
+            except Exception as e:
+                logging.error("%s flush failed", self.name, exc_info=e)
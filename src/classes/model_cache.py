@@ -0,0 +1,180 @@
+import time
+import asyncio
+from collections import OrderedDict
+from typing      import Any
+
+from .. import config
+
+from prisma import Prisma
+
+__all__ = (
+    "ModelCache",
+)
+
+CacheKey = tuple[str, str] # (model, unique key)
+
+def _key(model: str, where: dict[str, Any]) -> CacheKey:
+    return (model, repr(sorted(where.items())))
+
+class ModelCache:
+    """
+    A read-through cache for looking up database rows by a unique key, for data that is read
+    far more often than it's written (per-guild settings, per-user flags...).
+    
+    Rows are kept up to `ttl` seconds and the least recently used rows are dropped once more than
+    `max_size` are cached. Rows that don't exist are cached too. Writes made through the cache
+    (`upsert`, `update`, `delete`) and through `bot.write_buffer` invalidate the rows they change,
+    writes made directly through `bot.prisma` must call `invalidate()` themselves.
+    
+    Models are given by their client name, e.g. `"prefix"` for `bot.prisma.prefix`.
+    
+    Parameters:
+    - prisma (Prisma): The client to read and write with.
+    - max_size (int): The most rows to keep (default: MODEL_CACHE_SIZE).
+    - ttl (float): Seconds to keep a row, 0 to keep it until it's invalidated or dropped (default: MODEL_CACHE_TTL).
+    """
+    
+    def __init__(
+        self,
+        prisma: Prisma,
+        *,
+        max_size: int = config.MODEL_CACHE_SIZE,
+        ttl: float = config.MODEL_CACHE_TTL
+    ) -> None:
+        self.prisma = prisma
+        self.max_size = max_size
+        self.ttl = ttl
+        self._rows: OrderedDict[CacheKey, tuple[float, Any]] = OrderedDict() # Key -> (expires at, row or None)
+        self._loading: dict[CacheKey, asyncio.Future] = {} # Lookups in progress, so a row is only read once at a time
+        
+        # Metrics, totals and per model
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0    # Rows dropped to stay under max_size
+        self.expirations = 0  # Rows read again because they were older than ttl
+        self.invalidations = 0
+        self.model_hits: dict[str, int] = {}
+        self.model_misses: dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Counters of the cache, `models` has the hits and misses of every model."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._rows),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "models": {
+                model: {"hits": self.model_hits.get(model, 0), "misses": self.model_misses.get(model, 0)}
+                for model in sorted(set(self.model_hits) | set(self.model_misses))
+            }
+        }
+    
+    async def get(self, model: str, where: dict[str, Any]) -> Any:
+        """
+        Finds a row by a unique key, reading it from the database only if it isn't cached.
+        
+        Parameters:
+        - model (str): The model's client name, e.g. "prefix".
+        - where (dict[str, Any]): The unique key, e.g. {"id": guild.id}.
+        
+        Returns:
+        - Any: The row, None if it doesn't exist.
+        """
+        key = _key(model, where)
+        cached = self._rows.get(key)
+        if cached is not None:
+            expires_at, row = cached
+            if not expires_at or expires_at > time.monotonic():
+                self._rows.move_to_end(key)
+                self.hits += 1
+                self.model_hits[model] = self.model_hits.get(model, 0) + 1
+                return row
+            self.expirations += 1
+        
+        self.misses += 1
+        self.model_misses[model] = self.model_misses.get(model, 0) + 1
+        
+        loading = self._loading.get(key)
+        if loading is not None:
+            return await asyncio.shield(loading)
+        
+        future = self._loading[key] = asyncio.get_running_loop().create_future()
+        try:
+            row = await getattr(self.prisma, model).find_unique(where=where)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception() # Mark it as retrieved when nobody else is waiting for it
+            raise
+        else:
+            # Only cache it if it wasn't invalidated while it was being read
+            if self._loading.get(key) is future:
+                self._store(key, row)
+            future.set_result(row)
+            return row
+        finally:
+            if self._loading.get(key) is future:
+                del self._loading[key]
+    
+    def invalidate(self, model: str, where: dict[str, Any] | None = None) -> None:
+        """Forgets a cached row, or every cached row of a model if `where` is None."""
+        self.invalidations += 1
+        if where is not None:
+            key = _key(model, where)
+            self._rows.pop(key, None)
+            self._loading.pop(key, None)
+            return
+        
+        for key in [key for key in self._rows if key[0] == model]:
+            del self._rows[key]
+        for key in [key for key in self._loading if key[0] == model]:
+            del self._loading[key]
+    
+    def invalidate_missing(self, model: str) -> None:
+        """Forgets the cached rows of a model that didn't exist, call it after creating rows of the model."""
+        for key in [key for key, (_, row) in self._rows.items() if key[0] == model and row is None]:
+            del self._rows[key]
+    
+    def clear(self) -> None:
+        """Forgets every cached row."""
+        self._rows.clear()
+        self._loading.clear()
+    
+    async def upsert(self, model: str, where: dict[str, Any], create: dict[str, Any], update: dict[str, Any]) -> Any:
+        """Upserts a row and caches the result."""
+        self.invalidate(model, where)
+        row = await getattr(self.prisma, model).upsert(where=where, data={"create": create, "update": update})
+        self._store(_key(model, where), row)
+        return row
+    
+    async def update(self, model: str, where: dict[str, Any], data: dict[str, Any]) -> Any:
+        """Updates a row and caches the result (None if the row doesn't exist)."""
+        self.invalidate(model, where)
+        row = await getattr(self.prisma, model).update(where=where, data=data)
+        self._store(_key(model, where), row)
+        return row
+    
+    async def delete(self, model: str, where: dict[str, Any]) -> Any:
+        """Deletes a row, returns the deleted row or None if it didn't exist."""
+        self.invalidate(model, where)
+        row = await getattr(self.prisma, model).delete(where=where)
+        self._store(_key(model, where), None)
+        return row
+    
+    def _store(self, key: CacheKey, row: Any) -> None:
+        if self.max_size <= 0:
+            return
+        
+        self._rows[key] = (time.monotonic() + self.ttl if self.ttl else 0.0, row)
+        self._rows.move_to_end(key)
+        while len(self._rows) > self.max_size:
+            self._rows.popitem(last=False)
+            self.evictions += 1
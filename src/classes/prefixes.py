@@ -0,0 +1,103 @@
+from typing import TYPE_CHECKING
+
+from .. import config
+
+if TYPE_CHECKING:
+    from .bot import Bot
+
+import discord
+
+__all__ = (
+    "PrefixCache",
+)
+
+class PrefixCache:
+    """
+    Custom prefixes of guilds (and of DM channels) kept in memory, so resolving the prefix of a
+    message never touches the database. Every change is written to the database first and
+    then to the cache (write-through).
+    
+    Guilds and channels without a custom prefix use `config.DEFAULT_PREFIX`.
+    """
+    
+    def __init__(self, bot: "Bot") -> None:
+        self.bot = bot
+        self._prefixes: dict[int, str] = {} # Guild ID (or channel ID in DMs) -> prefix
+        self._mentions: list[str] = []
+        self._resolved: dict[str, list[str]] = {} # Prefix -> the list returned by resolve()
+        self._matchers: dict[str, tuple[str, ...]] = {} # Prefix -> the same prefixes as a tuple for str.startswith
+    
+    async def load(self) -> None:
+        """Loads every custom prefix from the database, call it once after connecting to it."""
+        rows = await self.bot.prisma.prefix.find_many()
+        self._prefixes = {row.id: row.prefix for row in rows}
+    
+    def set_mentions(self, user_id: int) -> None:
+        """Precomputes the mention prefixes (`<@id> ` and `<@!id> `), call it once the bot's user is known."""
+        self._mentions = [f"<@{user_id}> ", f"<@!{user_id}> "] if config.MENTION_IS_ALSO_PREFIX else []
+        self._resolved.clear()
+        self._matchers.clear()
+    
+    @staticmethod
+    def scope(message: discord.Message) -> int:
+        """The ID prefixes are stored under for a message: its guild's ID, or its channel's ID in DMs."""
+        return message.guild.id if message.guild else message.channel.id
+    
+    def get(self, scope_id: int) -> str:
+        """The prefix of a guild or DM channel."""
+        return self._prefixes.get(scope_id, config.DEFAULT_PREFIX)
+    
+    def resolve(self, message: discord.Message) -> list[str]:
+        """The prefixes a message can use, the mention prefixes come first like with `commands.when_mentioned_or`."""
+        prefix = self._prefixes.get(message.guild.id if message.guild else message.channel.id, config.DEFAULT_PREFIX)
+        resolved = self._resolved.get(prefix)
+        if resolved is None:
+            resolved = self._resolved[prefix] = [*self._mentions, prefix]
+        return resolved
+    
+    def match(self, message: discord.Message) -> str | None:
+        """
+        The prefix a message starts with, None if it doesn't start with any of its prefixes.
+        Most messages aren't commands, they are rejected with a single `str.startswith` call.
+        """
+        content = message.content
+        prefix = self._prefixes.get(message.guild.id if message.guild else message.channel.id, config.DEFAULT_PREFIX)
+        matcher = self._matchers.get(prefix)
+        if matcher is None:
+            # Longest first, so that a prefix that starts with another one is matched in full
+            matcher = self._matchers[prefix] = tuple(sorted(self.resolve(message), key=len, reverse=True))
+        
+        if not content.startswith(matcher):
+            return None
+        for candidate in matcher:
+            if content.startswith(candidate):
+                return candidate
+        return None
+    
+    @property
+    def custom(self) -> dict[int, str]:
+        """Every custom prefix by guild or DM channel ID, don't modify it, use `set()` and `reset()` instead."""
+        return self._prefixes
+    
+    async def set(self, scope_id: int, prefix: str) -> None:
+        """Sets the prefix of a guild or DM channel, setting it to the default prefix removes the custom one."""
+        if prefix == config.DEFAULT_PREFIX:
+            await self.reset(scope_id)
+            return
+        
+        await self.bot.prisma.prefix.upsert(
+            where = {"id": scope_id},
+            data = {
+                "create": {"id": scope_id, "prefix": prefix},
+                "update": {"prefix": prefix}
+            }
+        )
+        self._prefixes[scope_id] = prefix
+    
+    async def reset(self, scope_id: int) -> None:
+        """Removes the custom prefix of a guild or DM channel."""
+        if scope_id not in self._prefixes:
+            return
+        
+        await self.bot.prisma.prefix.delete_many(where={"id": scope_id})
+        del self._prefixes[scope_id]
@@ -0,0 +1,135 @@
+import math
+import time
+from typing import Any
+
+from ..        import config
+from ..logger  import logging
+
+from prisma import Prisma
+
+__all__ = (
+    "LatencyHistogram",
+    "QueryStats",
+    "InstrumentedPrisma"
+)
+
+class LatencyHistogram:
+    """
+    Counts durations in logarithmic buckets (8 per doubling, about 9% apart) starting at 1µs,
+    so percentiles can be estimated in constant memory no matter how many durations are added.
+    """
+    
+    BUCKETS_PER_DOUBLING = 8
+    MINIMUM = 1e-6
+    
+    def __init__(self) -> None:
+        self.buckets: dict[int, int] = {} # Bucket -> count
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def add(self, seconds: float) -> None:
+        """Adds a duration in seconds."""
+        bucket = int(math.log2(seconds / self.MINIMUM) * self.BUCKETS_PER_DOUBLING) if seconds > self.MINIMUM else 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def percentile(self, percent: float) -> float:
+        """The estimated duration in seconds that `percent`% of the durations don't exceed, 0 if there are none."""
+        if not self.count:
+            return 0.0
+        
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                # The middle of the bucket, never more than the slowest duration seen
+                middle = self.MINIMUM * 2 ** ((bucket + 0.5) / self.BUCKETS_PER_DOUBLING)
+                return min(middle, self.max)
+        return self.max
+    
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+class QueryStats:
+    """
+    Latency histograms of database queries per model and operation, e.g. `("Prefix", "find_many")`.
+    Queries slower than `slow_threshold` seconds are logged as warnings.
+    
+    Parameters:
+    - slow_threshold (float): Log queries that take at least this many seconds, 0 to not log them (default: SLOW_QUERY_THRESHOLD).
+    """
+    
+    def __init__(self, slow_threshold: float = config.SLOW_QUERY_THRESHOLD) -> None:
+        self.slow_threshold = slow_threshold
+        self.started = time.time()
+        self.histograms: dict[tuple[str, str], LatencyHistogram] = {}
+        self.errors = 0
+        self.slow = 0
+    
+    def record(self, model: str, operation: str, seconds: float, arguments: dict[str, Any] | None = None, failed: bool = False) -> None:
+        """Records how long a query took."""
+        histogram = self.histograms.get((model, operation))
+        if histogram is None:
+            histogram = self.histograms[(model, operation)] = LatencyHistogram()
+        histogram.add(seconds)
+        
+        if failed:
+            self.errors += 1
+        
+        if self.slow_threshold and seconds >= self.slow_threshold:
+            self.slow += 1
+            text = repr(arguments) if arguments else ""
+            if len(text) > 300:
+                text = text[:297] + "..."
+            logging.warn("slow query: %s.%s took %.1fms %s", model, operation, seconds * 1000, text)
+    
+    def total(self) -> LatencyHistogram:
+        """Every query in one histogram."""
+        total = LatencyHistogram()
+        for histogram in self.histograms.values():
+            for bucket, count in histogram.buckets.items():
+                total.buckets[bucket] = total.buckets.get(bucket, 0) + count
+            total.count += histogram.count
+            total.total += histogram.total
+            total.max = max(total.max, histogram.max)
+        return total
+    
+    def reset(self) -> None:
+        """Forgets every recorded query."""
+        self.started = time.time()
+        self.histograms.clear()
+        self.errors = 0
+        self.slow = 0
+
+class InstrumentedPrisma(Prisma):
+    """
+    The Prisma client, timing every query it executes into `self.query_stats`.
+    Batches (`batch_()`) aren't executed query by query, `bot.write_buffer.stats` times their flushes.
+    """
+    
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.query_stats = QueryStats()
+    
+    async def _execute(self, **kwargs) -> Any:
+        model = kwargs.get("model")
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await super()._execute(**kwargs)
+            failed = False
+            return result
+        finally:
+            self.query_stats.record(
+                model.__name__ if model is not None else "raw",
+                kwargs.get("method", "unknown"),
+                time.perf_counter() - started,
+                kwargs.get("arguments"),
+                failed
+            )
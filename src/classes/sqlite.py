@@ -0,0 +1,255 @@
+import time
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib         import asynccontextmanager
+from typing             import TYPE_CHECKING, Any, AsyncIterator, Callable, Iterable, Sequence, TypeVar
+
+from ..        import config
+from ..logger  import logging
+
+if TYPE_CHECKING:
+    from .query_stats import QueryStats
+
+__all__ = (
+    "SQLite",
+    "SQLiteConnection"
+)
+
+T = TypeVar("T")
+Parameters = Sequence[Any] | dict[str, Any]
+
+# Pragmas that are saved in the database file, they are only set through the writer
+_PERSISTENT_PRAGMAS = {"journal_mode", "auto_vacuum", "page_size"}
+
+class SQLiteConnection:
+    """
+    A `sqlite3` connection that lives in its own thread. Every method runs all of its work in
+    one call to that thread, so a query costs a single hop out of the event loop.
+    """
+    
+    def __init__(self, path: str, *, cached_statements: int, name: str) -> None:
+        self.path = path
+        self.cached_statements = cached_statements
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self._connection: sqlite3.Connection | None = None
+    
+    async def run(self, function: Callable[..., T], *args: Any) -> T:
+        """Runs `function(connection, *args)` in the connection's thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, self._connection, *args)
+    
+    async def open(self, pragmas: dict[str, str | int]) -> None:
+        def open(_, pragmas: dict[str, str | int]) -> sqlite3.Connection:
+            # isolation_level=None: transactions are only started explicitly, reads never hold one open
+            connection = sqlite3.connect(self.path, isolation_level=None, cached_statements=self.cached_statements)
+            connection.row_factory = sqlite3.Row
+            for name, value in pragmas.items():
+                connection.execute(f"PRAGMA {name} = {value};")
+            return connection
+        
+        self._connection = await self.run(open, pragmas)
+    
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self.run(sqlite3.Connection.close)
+            self._connection = None
+        self._executor.shutdown(wait=False)
+    
+    async def execute(self, sql: str, parameters: Parameters = ()) -> int:
+        """Runs a statement, returns the amount of changed rows."""
+        return await self.run(_execute, sql, parameters)
+    
+    async def execute_many(self, sql: str, parameters: Iterable[Parameters]) -> int:
+        """Runs a statement once per set of parameters, returns the amount of changed rows."""
+        return await self.run(_execute_many, sql, list(parameters))
+    
+    async def fetch_one(self, sql: str, parameters: Parameters = ()) -> sqlite3.Row | None:
+        """Runs a query and returns the first row, None if there are none."""
+        return await self.run(_fetch_one, sql, parameters)
+    
+    async def fetch_all(self, sql: str, parameters: Parameters = ()) -> list[sqlite3.Row]:
+        """Runs a query and returns every row."""
+        return await self.run(_fetch_all, sql, parameters)
+
+def _execute(connection: sqlite3.Connection, sql: str, parameters: Parameters) -> int:
+    return connection.execute(sql, parameters).rowcount
+
+def _execute_many(connection: sqlite3.Connection, sql: str, parameters: list[Parameters]) -> int:
+    return connection.executemany(sql, parameters).rowcount
+
+def _fetch_one(connection: sqlite3.Connection, sql: str, parameters: Parameters) -> sqlite3.Row | None:
+    cursor = connection.execute(sql, parameters)
+    try:
+        return cursor.fetchone()
+    finally:
+        cursor.close()
+
+def _fetch_all(connection: sqlite3.Connection, sql: str, parameters: Parameters) -> list[sqlite3.Row]:
+    return connection.execute(sql, parameters).fetchall()
+
+class SQLite:
+    """
+    Direct access to the bot's SQLite database without going through the Prisma query engine,
+    for hot paths where a query's round trip to the engine costs more than the query itself.
+    Prisma still owns the schema, tables and columns are named like in `prisma/schema.prisma`.
+    
+    Reads are spread over a pool of `readers` read-only connections, writes go through a single
+    writer connection (SQLite allows one writer at a time anyway). Every connection keeps up to
+    `cached_statements` prepared statements, so running the same SQL again skips compiling it:
+    use `?` parameters instead of formatting values into the SQL.
+    
+    Usage:
+        ```py
+        row = await bot.sqlite.fetch_one('SELECT prefix FROM "Prefix" WHERE id = ?', (guild.id,))
+        
+        async with bot.sqlite.transaction() as db:
+            await db.execute('DELETE FROM "Prefix" WHERE id = ?', (guild.id,))
+        ```
+    
+    Parameters:
+    - path (str): The database file.
+    - readers (int): The amount of read connections (default: SQLITE_READERS).
+    - cached_statements (int): Prepared statements kept per connection (default: SQLITE_CACHED_STATEMENTS).
+    - pragmas (dict[str, str | int]): Pragmas to set on every connection (default: SQLITE_PRAGMAS).
+    - stats (QueryStats | None): Where to record how long queries take, as the "sqlite" model (default: None).
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        *,
+        readers: int = config.SQLITE_READERS,
+        cached_statements: int = config.SQLITE_CACHED_STATEMENTS,
+        pragmas: dict[str, str | int] = config.SQLITE_PRAGMAS,
+        stats: "QueryStats | None" = None
+    ) -> None:
+        self.path = path
+        self.readers = max(1, readers)
+        self.cached_statements = cached_statements
+        self.pragmas = {
+            name: value for name, value in pragmas.items()
+            if name.isidentifier() and (isinstance(value, int) or str(value).isidentifier()) # Bot.apply_sqlite_profile logs the invalid ones
+        }
+        self.stats = stats
+        self._writer: SQLiteConnection | None = None
+        self._reader_connections: list[SQLiteConnection] = []
+        self._pool: asyncio.Queue[SQLiteConnection] = asyncio.Queue()
+        self._write_lock = asyncio.Lock()
+        self._closing = False # Set while close() waits for the connections in use, new queries are refused meanwhile
+    
+    def is_connected(self) -> bool:
+        return self._writer is not None and not self._closing
+    
+    async def connect(self) -> None:
+        """Opens the writer and the read connections."""
+        if self._writer is not None:
+            return
+        
+        self._closing = False
+        writer = SQLiteConnection(self.path, cached_statements=self.cached_statements, name="sqlite-writer")
+        await writer.open(self.pragmas)
+        
+        reader_pragmas = {name: value for name, value in self.pragmas.items() if name not in _PERSISTENT_PRAGMAS}
+        reader_pragmas["query_only"] = "ON"
+        for number in range(self.readers):
+            reader = SQLiteConnection(self.path, cached_statements=self.cached_statements, name=f"sqlite-reader-{number}")
+            await reader.open(reader_pragmas)
+            self._reader_connections.append(reader)
+            self._pool.put_nowait(reader)
+        
+        self._writer = writer
+        logging.info("opened %d direct SQLite connection(s) to %s", self.readers + 1, self.path)
+    
+    async def close(self) -> None:
+        """Closes every connection, waiting for the ones in use to be returned first."""
+        if not self.is_connected():
+            return
+        
+        # Refuse new queries first, so nothing else waits for a read connection once they're being taken out of the pool
+        self._closing = True
+        for _ in range(len(self._reader_connections)):
+            reader = await self._pool.get()
+            await reader.close()
+        self._reader_connections.clear()
+        
+        async with self._write_lock:
+            writer, self._writer = self._writer, None
+            if writer is not None:
+                await writer.close()
+    
+    async def fetch_all(self, sql: str, parameters: Parameters = ()) -> list[sqlite3.Row]:
+        """Runs a query on a read connection and returns every row."""
+        async with self._reader() as reader:
+            started = time.perf_counter()
+            try:
+                return await reader.fetch_all(sql, parameters)
+            finally:
+                self._record("fetch", started, sql)
+    
+    async def fetch_one(self, sql: str, parameters: Parameters = ()) -> sqlite3.Row | None:
+        """Runs a query on a read connection and returns the first row, None if there are none."""
+        async with self._reader() as reader:
+            started = time.perf_counter()
+            try:
+                return await reader.fetch_one(sql, parameters)
+            finally:
+                self._record("fetch", started, sql)
+    
+    async def fetch_value(self, sql: str, parameters: Parameters = (), default: Any = None) -> Any:
+        """Runs a query on a read connection and returns the first column of the first row, `default` if there are no rows."""
+        row = await self.fetch_one(sql, parameters)
+        return row[0] if row is not None else default
+    
+    async def execute(self, sql: str, parameters: Parameters = ()) -> int:
+        """Runs a statement on the writer, returns the amount of changed rows. A single statement is its own transaction."""
+        async with self._write_lock:
+            started = time.perf_counter()
+            try:
+                return await self._connected_writer().execute(sql, parameters)
+            finally:
+                self._record("execute", started, sql)
+    
+    async def execute_many(self, sql: str, parameters: Iterable[Parameters]) -> int:
+        """Runs a statement once per set of parameters on the writer in one transaction, returns the amount of changed rows."""
+        async with self.transaction() as writer:
+            return await writer.execute_many(sql, parameters)
+    
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[SQLiteConnection]:
+        """
+        Holds the writer for the `with` block and runs everything in it in one transaction, it's
+        committed when the block ends and rolled back if it raises.
+        """
+        async with self._write_lock:
+            writer = self._connected_writer()
+            started = time.perf_counter()
+            await writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield writer
+            except BaseException:
+                await writer.execute("ROLLBACK")
+                raise
+            else:
+                await writer.execute("COMMIT")
+            finally:
+                self._record("transaction", started)
+    
+    def _connected_writer(self) -> SQLiteConnection:
+        if self._writer is None or self._closing:
+            raise RuntimeError("not connected to the database, call connect() first")
+        return self._writer
+    
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[SQLiteConnection]:
+        if not self.is_connected():
+            raise RuntimeError("not connected to the database, call connect() first")
+        
+        reader = await self._pool.get()
+        try:
+            yield reader
+        finally:
+            self._pool.put_nowait(reader)
+    
+    def _record(self, operation: str, started: float, sql: str | None = None) -> None:
+        if self.stats is not None:
+            self.stats.record("sqlite", operation, time.perf_counter() - started, {"sql": sql} if sql else None)
@@ -0,0 +1,258 @@
+import time
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+from ..        import config
+from ..logger  import logging
+from .flusher  import PeriodicFlusher
+
+if TYPE_CHECKING:
+    from .model_cache import ModelCache
+
+from prisma import Prisma
+
+__all__ = (
+    "WriteBuffer",
+)
+
+class _Write:
+    """A buffered create (`where` is None) or upsert (`data` is its `create`)."""
+    
+    __slots__ = ("model", "where", "data", "update")
+    
+    def __init__(self, model: str, where: dict[str, Any] | None, data: dict[str, Any], update: dict[str, Any] | None) -> None:
+        self.model = model
+        self.where = where
+        self.data = data
+        self.update = update
+
+class WriteBuffer:
+    """
+    Buffers database writes (creates and upserts) and writes them in batches, one transaction
+    per flush, instead of doing one query per write.
+    
+    Writes are written in the order they were added. Upserts of the same row (same model and `where`)
+    are coalesced into one upsert with the same effect, at the position of the first one: a later
+    absolute value (`value` or `{"set": value}`) replaces an earlier one, and relative updates
+    (`{"increment": n}` / `{"decrement": n}`) are added to the earlier value or increment. Upserts
+    that can't be combined like that (e.g. `{"multiply": n}`, or an increment of a field their
+    `create` doesn't set) are written separately, one after the other.
+    
+    A flush happens once `max_size` writes are waiting or every `interval` seconds, whichever comes
+    first. When `max_pending` writes are waiting, adding another one waits for a flush (backpressure).
+    
+    Models are given by their client name, e.g. `"prefix"` for `bot.prisma.prefix`.
+    
+    Parameters:
+    - prisma (Prisma): The client to write with.
+    - cache (ModelCache | None): A cache to invalidate the written rows in after every flush (default: None).
+    - max_size (int): Flush once this many writes are waiting (default: WRITE_BUFFER_SIZE).
+    - interval (float): Flush at least this often in seconds (default: WRITE_BUFFER_INTERVAL).
+    - max_pending (int): The most writes that can wait for a flush (default: WRITE_BUFFER_MAX_PENDING).
+    """
+    
+    def __init__(
+        self,
+        prisma: Prisma,
+        *,
+        cache: "ModelCache | None" = None,
+        max_size: int = config.WRITE_BUFFER_SIZE,
+        interval: float = config.WRITE_BUFFER_INTERVAL,
+        max_pending: int = config.WRITE_BUFFER_MAX_PENDING
+    ) -> None:
+        self.prisma = prisma
+        self.cache = cache
+        self.max_size = max_size
+        self.interval = interval
+        self.max_pending = max(max_pending, max_size)
+        
+        self._writes: list[_Write] = []
+        self._latest_upserts: dict[tuple[str, str], _Write] = {} # (model, where) -> the row's last buffered upsert
+        self._flush_lock = asyncio.Lock()
+        self._flusher = PeriodicFlusher(self.flush, interval, "write buffer")
+        self._room = asyncio.Event()
+        self._room.set()
+        
+        # Metrics
+        self.writes = 0     # Writes added
+        self.coalesced = 0  # Upserts merged into an earlier upsert of the same row before being written
+        self.written = 0    # Writes sent to the database
+        self.failed = 0     # Writes lost because their flush failed
+        self.flushes = 0
+        self.waits = 0      # Times adding a write had to wait for room
+        self.flush_time = 0.0
+        self.last_flush_time = 0.0
+        self.max_flush_time = 0.0
+    
+    @property
+    def pending(self) -> int:
+        """Writes waiting to be flushed."""
+        return len(self._writes)
+    
+    @property
+    def stats(self) -> dict[str, int | float]:
+        """Counters and flush latencies (in seconds) of the buffer."""
+        return {
+            "pending": self.pending,
+            "writes": self.writes,
+            "coalesced": self.coalesced,
+            "written": self.written,
+            "failed": self.failed,
+            "flushes": self.flushes,
+            "waits": self.waits,
+            "average_flush_time": self.flush_time / self.flushes if self.flushes else 0.0,
+            "last_flush_time": self.last_flush_time,
+            "max_flush_time": self.max_flush_time
+        }
+    
+    def start(self) -> None:
+        """Starts flushing every `interval` seconds in the background."""
+        self._flusher.start()
+    
+    async def close(self) -> None:
+        """Stops the background flushing and flushes everything that is waiting."""
+        await self._flusher.stop()
+        while self.pending:
+            await self.flush()
+    
+    async def create(self, model: str, data: dict[str, Any]) -> None:
+        """Buffers a `create` of a row."""
+        await self._wait_for_room()
+        self._writes.append(_Write(model, None, data, None))
+        self._added()
+    
+    async def upsert(self, model: str, where: dict[str, Any], create: dict[str, Any], update: dict[str, Any]) -> None:
+        """Buffers an `upsert` of a row, merged into a buffered upsert of the same row when possible."""
+        key = (model, repr(sorted(where.items())))
+        latest = self._latest_upserts.get(key)
+        if latest is not None:
+            merged_update = _merge_updates(latest.update, update)
+            merged_create = _apply_update(latest.data, update) if merged_update is not None else None
+            if merged_update is not None and merged_create is not None:
+                latest.data = merged_create
+                latest.update = merged_update
+                self.coalesced += 1
+                self._added()
+                return
+        
+        await self._wait_for_room()
+        write = _Write(model, where, create, update)
+        self._writes.append(write)
+        self._latest_upserts[key] = write
+        self._added()
+    
+    async def flush(self) -> None:
+        """Writes everything that is waiting in one transaction."""
+        async with self._flush_lock:
+            writes, self._writes = self._writes, []
+            self._latest_upserts = {}
+            count = len(writes)
+            if not count:
+                return
+            
+            started = time.perf_counter()
+            try:
+                async with self.prisma.batch_() as batch:
+                    for write in writes:
+                        if write.where is None:
+                            getattr(batch, write.model).create(data=write.data)
+                        else:
+                            getattr(batch, write.model).upsert(where=write.where, data={"create": write.data, "update": write.update})
+            
+            except Exception as e:
+                self.failed += count
+                logging.error("failed to write %d buffered database write(s)", count, exc_info=e)
+            
+            else:
+                self.written += count
+                if self.cache is not None:
+                    for write in writes:
+                        if write.where is not None:
+                            self.cache.invalidate(write.model, write.where)
+                    for model in {write.model for write in writes if write.where is None}:
+                        self.cache.invalidate_missing(model)
+            
+            finally:
+                duration = time.perf_counter() - started
+                self.flushes += 1
+                self.flush_time += duration
+                self.last_flush_time = duration
+                self.max_flush_time = max(self.max_flush_time, duration)
+                self._room.set()
+            
+            logging.debug("flushed %d buffered database write(s) in %.1fms", count, duration * 1000)
+    
+    def _added(self) -> None:
+        self.writes += 1
+        if self.pending >= self.max_size:
+            self._flusher.wake()
+    
+    async def _wait_for_room(self) -> None:
+        while self.pending >= self.max_pending:
+            self.waits += 1
+            if not self._flusher.running:
+                # Nothing would flush before start() or after close(), e.g. writes of cogs while the bot closes
+                await self.flush()
+                continue
+            self._room.clear()
+            self._flusher.wake()
+            await self._room.wait()
+
+def _kind(value: Any) -> str:
+    """Whether an update value sets the field ("set"), adds to it ("add") or does anything else ("other")."""
+    if not isinstance(value, dict):
+        return "set"
+    if value.keys() == {"set"}:
+        return "set"
+    if value and value.keys() <= {"increment", "decrement"}:
+        return "add"
+    return "other"
+
+def _delta(value: dict[str, Any]) -> Any:
+    return value.get("increment", 0) - value.get("decrement", 0)
+
+def _add(base: Any, delta: Any) -> Any:
+    """`base + delta` if `base` is a number, otherwise None."""
+    if isinstance(base, dict) and base.keys() == {"set"}:
+        base = base["set"]
+    if isinstance(base, bool) or not isinstance(base, (int, float)):
+        return None
+    return base + delta
+
+def _merge_updates(first: dict[str, Any], second: dict[str, Any]) -> dict[str, Any] | None:
+    """The update doing `first` and then `second`, None if they can't be combined into one."""
+    merged = dict(first)
+    for field, value in second.items():
+        kind = _kind(value)
+        if field not in first or kind == "set":
+            merged[field] = value
+            continue
+        if kind == "other":
+            return None
+        
+        previous = first[field]
+        previous_kind = _kind(previous)
+        if previous_kind == "add":
+            merged[field] = {"increment": _delta(previous) + _delta(value)}
+            continue
+        
+        total = _add(previous, _delta(value)) if previous_kind == "set" else None
+        if total is None:
+            return None
+        merged[field] = total
+    return merged
+
+def _apply_update(data: dict[str, Any], update: dict[str, Any]) -> dict[str, Any] | None:
+    """`data` (an upsert's `create`) with `update` applied to it, None if it can't be worked out here."""
+    applied = dict(data)
+    for field, value in update.items():
+        kind = _kind(value)
+        if kind == "set":
+            applied[field] = value["set"] if isinstance(value, dict) else value
+            continue
+        
+        total = _add(data.get(field), _delta(value)) if kind == "add" else None
+        if total is None:
+            return None
+        applied[field] = total
+    return applied
@@ -0,0 +1,231 @@
+import asyncio
+from datetime import datetime, timezone
+from typing   import Optional
+
+from ..          import utils
+from ..          import checks
+from ..logger    import logging
+from ..logsearch import parse_time
+from ..classes   import Bot, Cog, Context, MessageArchive, ArchivedMessage
+
+import discord
+from discord.ext import commands
+
+# How many backfilled messages are written before the backfill's progress is saved
+BACKFILL_CHECKPOINT = 1000
+
+# Every guild channel with a text chat, DMs are archived by using the commands in them
+ArchivableChannel = discord.TextChannel | discord.VoiceChannel | discord.StageChannel | discord.Thread
+
+def to_archived(message: discord.Message) -> ArchivedMessage:
+    return ArchivedMessage(
+        id = message.id,
+        channel_id = message.channel.id,
+        guild_id = message.guild.id if message.guild else None,
+        author_id = message.author.id,
+        content = message.content,
+        attachments = "\n".join(attachment.url for attachment in message.attachments),
+        edited_at = int(message.edited_at.timestamp() * 1000) if message.edited_at else None
+    )
+
+def to_snowflake(text: str) -> int:
+    """A message ID, or a time (see `parse_time`) as the first snowflake of that millisecond."""
+    if text.isdigit():
+        return int(text)
+    return discord.utils.time_snowflake(datetime.fromtimestamp(parse_time(text), tz=timezone.utc))
+
+class Archive(Cog):
+    """Archive channels and search their messages."""
+    
+    def __init__(self, bot: Bot) -> None:
+        self.bot = bot
+        self.emoji = "🗄️"
+        self.short_description = "Archive and search messages"
+        self.store = MessageArchive()
+        self.backfills: dict[int, asyncio.Task] = {} # Channel ID -> running backfill
+    
+    async def cog_load(self) -> None:
+        await self.store.open()
+        logging.info("archiving %d channel(s) to %s", len(self.store.channels), self.store.path)
+    
+    async def cog_unload(self) -> None:
+        for task in self.backfills.values():
+            task.cancel()
+        await self.store.close()
+    
+    async def cog_check(self, ctx: Context) -> bool:
+        return checks.is_admin(ctx)
+    
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        if message.channel.id in self.store.channels:
+            self.store.submit(to_archived(message))
+    
+    @commands.Cog.listener()
+    async def on_message_edit(self, before: discord.Message, after: discord.Message) -> None:
+        if after.channel.id in self.store.channels and before.content != after.content:
+            self.store.submit(to_archived(after))
+    
+    @commands.command()
+    async def search(self, ctx: Context, *, query: str) -> None:
+        """Searches the archived messages, newest first.
+        
+        Parameters
+        ----------
+        query : str
+            The words to search for (all of them have to be in the message, end a word with * to match
+            words starting with it) and optionally filters:
+            `in:<channel ID>`, `from:<user ID>`, `after:<message ID or time>`, `before:<message ID or time>`.
+            Times are dates like 2025-01-31 or durations ago like 2h or 7d.
+        """
+        words = []
+        filters = {}
+        for word in query.split():
+            key, separator, value = word.partition(":")
+            if separator and key.lower() in ("in", "from", "after", "before") and value:
+                filters[key.lower()] = value.strip("<#@!>")
+            else:
+                words.append(word)
+        
+        try:
+            results = await self.store.search(
+                " ".join(words),
+                after = to_snowflake(filters["after"]) if "after" in filters else 0,
+                before = to_snowflake(filters["before"]) if "before" in filters else 2 ** 63 - 1,
+                channel_id = int(filters["in"]) if "in" in filters else None,
+                author_id = int(filters["from"]) if "from" in filters else None,
+                limit = 10
+            )
+        except ValueError as e:
+            await ctx.reply(f"❌ {e}", mention_author=False)
+            return
+        
+        if not results:
+            await ctx.reply("No archived messages found.", mention_author=False)
+            return
+        
+        lines = []
+        for result in results:
+            link = f"https://discord.com/channels/{result.guild_id or '@me'}/{result.channel_id}/{result.id}"
+            snippet = utils.trim_and_add_suffix(result.snippet.replace("\n", " "), 150)
+            lines.append(f"<t:{discord.utils.snowflake_time(result.id).timestamp():.0f}:R> <@{result.author_id}>: {snippet} ([jump]({link}))")
+        
+        await ctx.reply("\n".join(lines), mention_author=False, suppress_embeds=True)
+    
+    @commands.group(invoke_without_command=True)
+    async def archive(self, ctx: Context) -> None:
+        """Shows the archived channels"""
+        channels = await self.store.refresh_channels()
+        if not channels:
+            await ctx.reply(f"No channels are archived, add one with `{ctx.clean_prefix}archive add`.", mention_author=False)
+            return
+        
+        lines = []
+        for channel in channels.values():
+            if channel.backfilled_before is None:
+                backfill = "not backfilled"
+            elif channel.backfilled_before == 0:
+                backfill = "backfilled"
+            else:
+                backfill = f"backfilled until <t:{discord.utils.snowflake_time(channel.backfilled_before).timestamp():.0f}:d>"
+            if channel.id in self.backfills:
+                backfill += " (backfilling)"
+            lines.append(f"<#{channel.id}>: {channel.messages:,} message(s), {backfill}")
+        
+        lines.append(f"\n{self.store.written:,} written, {self.store.pending:,} waiting, {self.store.dropped:,} dropped since startup")
+        await ctx.reply("\n".join(lines), mention_author=False)
+    
+    @archive.command(name="add")
+    async def archive_add(self, ctx: Context, channel: Optional[ArchivableChannel] = None) -> None:
+        """Starts archiving the new messages of a channel
+        
+        Parameters
+        ----------
+        channel : Optional[ArchivableChannel]
+            The channel to archive. Defaults to this channel (which can be a DM).
+        """
+        target = channel or ctx.channel
+        channel_id = target.id
+        guild = getattr(target, "guild", None)
+        await self.store.add_channel(channel_id, guild.id if guild else None)
+        logging.info("%s (@%s, id: %s) started archiving %s", ctx.author.display_name, ctx.author, ctx.author.id, channel_id, extra=ctx.log_extra)
+        await ctx.reply(f"✅ Archiving new messages of <#{channel_id}>, use `{ctx.clean_prefix}archive backfill` to archive older ones.", mention_author=False)
+    
+    @archive.command(name="remove")
+    async def archive_remove(self, ctx: Context, channel: Optional[ArchivableChannel] = None, delete: bool = False) -> None:
+        """Stops archiving a channel
+        
+        Parameters
+        ----------
+        channel : Optional[ArchivableChannel]
+            The channel to stop archiving. Defaults to this channel.
+        delete : bool
+            Whether to also delete its archived messages. Defaults to False.
+        """
+        channel_id = (channel or ctx.channel).id
+        task = self.backfills.pop(channel_id, None)
+        if task is not None:
+            task.cancel()
+        
+        deleted = await self.store.remove_channel(channel_id, delete_messages=delete)
+        logging.info("%s (@%s, id: %s) stopped archiving %s", ctx.author.display_name, ctx.author, ctx.author.id, channel_id, extra=ctx.log_extra)
+        await ctx.reply(f"✅ Stopped archiving <#{channel_id}>" + (f" and deleted {deleted:,} message(s)." if delete else "."), mention_author=False)
+    
+    @archive.command(name="backfill")
+    async def archive_backfill(self, ctx: Context, channel: Optional[ArchivableChannel] = None, limit: Optional[int] = None) -> None:
+        """Archives the older messages of an archived channel, continuing where the last backfill stopped
+        
+        Parameters
+        ----------
+        channel : Optional[ArchivableChannel]
+            The channel to backfill. Defaults to this channel.
+        limit : Optional[int]
+            The most messages to backfill. Defaults to all of them.
+        """
+        target = channel or ctx.channel
+        archived = self.store.channels.get(target.id)
+        if archived is None:
+            await ctx.reply(f"❌ That channel isn't archived, add it with `{ctx.clean_prefix}archive add` first.", mention_author=False)
+            return
+        if archived.backfilled_before == 0:
+            await ctx.reply("✅ That channel is already backfilled completely.", mention_author=False)
+            return
+        if archived.id in self.backfills:
+            await ctx.reply("❌ That channel is already being backfilled.", mention_author=False)
+            return
+        
+        task = asyncio.create_task(self._backfill(ctx, target, archived.backfilled_before, limit), name=f"archive backfill {archived.id}")
+        self.backfills[archived.id] = task
+        task.add_done_callback(lambda _: self.backfills.pop(archived.id, None))
+        await ctx.reply(f"🗄️ Backfilling <#{archived.id}>, I'll reply when it's done.", mention_author=False)
+    
+    async def _backfill(self, ctx: Context, channel: ArchivableChannel | discord.DMChannel | discord.GroupChannel, before: int | None, limit: int | None) -> None:
+        # History is read newest first and archived through the bounded queue, so only a queue's worth
+        # of messages is in memory however long the channel's history is
+        count = 0
+        oldest = before
+        try:
+            async for message in channel.history(limit=limit, before=discord.Object(before) if before else None):
+                await self.store.put(to_archived(message))
+                oldest = message.id
+                count += 1
+                if count % BACKFILL_CHECKPOINT == 0:
+                    await self.store.join()
+                    await self.store.set_backfilled(channel.id, message.id)
+            
+            await self.store.join()
+            finished = limit is None or count < limit
+            await self.store.set_backfilled(channel.id, 0 if finished else oldest or 0)
+        
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error("backfilling %s failed after %d message(s)", channel.id, count, exc_info=e)
+            await ctx.reply(f"❌ Backfilling failed after {count:,} message(s): `{e.__class__.__name__}`", mention_author=False)
+            return
+        
+        logging.info("backfilled %d message(s) of %s", count, channel.id)
+        await ctx.reply(f"✅ Backfilled {count:,} message(s) of <#{channel.id}>.", mention_author=False)
+
+async def setup(bot: Bot) -> None:
+    await bot.add_cog(Archive(bot))
@@ -0,0 +1,100 @@
+import os
+import time
+import asyncio
+from datetime import timedelta
+
+from ..              import utils
+from ..              import checks
+from ..              import config
+from ..logger        import logging
+from ..utils.backup  import BackupResult, backup_sqlite, list_backups, prune_backups
+from ..classes       import Bot, Cog, Context
+
+from discord.ext import commands, tasks
+
+class Backups(Cog):
+    """Backups of the database, taken while the bot runs."""
+    
+    def __init__(self, bot: Bot) -> None:
+        self.bot = bot
+        self.emoji = "💾"
+        self.short_description = "Database backups"
+        self.lock = asyncio.Lock()
+        self.name = os.path.splitext(os.path.basename(config.DATABASE_LOCATION))[0]
+    
+    async def cog_load(self) -> None:
+        if config.BACKUP_INTERVAL_HOURS > 0:
+            self.scheduled_backup.start()
+    
+    async def cog_unload(self) -> None:
+        self.scheduled_backup.cancel()
+    
+    async def cog_check(self, ctx: Context) -> bool:
+        return checks.is_admin(ctx)
+    
+    async def backup(self) -> BackupResult:
+        """Backs up the database in a worker thread and deletes the backups over `BACKUP_KEEP`."""
+        async with self.lock:
+            result = await asyncio.to_thread(
+                backup_sqlite,
+                config.DATABASE_LOCATION,
+                config.BACKUP_LOCATION,
+                pages_per_step = config.BACKUP_PAGES_PER_STEP,
+                step_sleep = config.BACKUP_STEP_SLEEP,
+                compress = config.BACKUP_COMPRESS
+            )
+            deleted = await asyncio.to_thread(prune_backups, config.BACKUP_LOCATION, config.BACKUP_KEEP, self.name)
+        
+        logging.info("backed up the database to %s (%s) in %.2fs%s", result.path, _size(result.size), result.duration,
+                     f", deleted {len(deleted)} old backup(s)" if deleted else "")
+        return result
+    
+    # Checks often instead of running every BACKUP_INTERVAL_HOURS, so restarts don't delay or repeat backups
+    @tasks.loop(minutes=10)
+    async def scheduled_backup(self) -> None:
+        backups = await asyncio.to_thread(list_backups, config.BACKUP_LOCATION, self.name)
+        if backups and time.time() - os.path.getmtime(backups[-1]) < config.BACKUP_INTERVAL_HOURS * 3600:
+            return
+        
+        try:
+            await self.backup()
+        except Exception as e:
+            logging.error("scheduled database backup failed", exc_info=e)
+    
+    @commands.command(name="backup", aliases=["backup-db"])
+    async def backup_command(self, ctx: Context) -> None:
+        """Backs up the database now, without stopping the bot"""
+        logging.info("%s (@%s, id: %s) is backing up the database", ctx.author.display_name, ctx.author, ctx.author.id, extra=ctx.log_extra)
+        message = await ctx.reply("💾 Backing up the database...", mention_author=False)
+        
+        try:
+            result = await self.backup()
+        except Exception as e:
+            logging.error("database backup failed", exc_info=e)
+            await message.edit(content="❌ Backing up the database failed:\n" + utils.code(f"{e.__class__.__name__}: {e}"))
+            return
+        
+        compressed = f" ({_size(result.database_size)} uncompressed)" if result.size != result.database_size else ""
+        await message.edit(content=(
+            f"✅ Backed up the database in **{result.duration:.2f}s**\n"
+            f" - File: `{result.path}`\n"
+            f" - Size: `{_size(result.size)}`{compressed}, {result.pages:,} pages"
+        ))
+    
+    @commands.command(aliases=["list-backups"])
+    async def backups(self, ctx: Context) -> None:
+        """Lists the database backups"""
+        backups = await asyncio.to_thread(list_backups, config.BACKUP_LOCATION, self.name)
+        if not backups:
+            await ctx.reply(f"No backups yet, take one with `{ctx.clean_prefix}backup`.", mention_author=False)
+            return
+        
+        lines = [f"`{os.path.basename(path)}` {_size(os.path.getsize(path))}" for path in reversed(backups)]
+        schedule = f"every {timedelta(hours=config.BACKUP_INTERVAL_HOURS)}" if config.BACKUP_INTERVAL_HOURS > 0 else "only with the backup command"
+        await ctx.reply(f"{len(backups)} backup(s) in `{config.BACKUP_LOCATION}`, taken {schedule}:\n" + "\n".join(lines[:20]), mention_author=False)
+
+def _size(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f} MiB" if size >= 1024 * 1024 else f"{size / 1024:.1f} KiB"
+
+async def setup(bot: Bot) -> None:
+    await bot.add_cog(Backups(bot))
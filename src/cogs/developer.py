@@ -8,19 +8,22 @@ import random
 import asyncio
 import datetime
 import textwrap
-import pkg_resources
-from typing     import (
-    TYPE_CHECKING, Optional
+from collections import deque
+from typing      import (
+    TYPE_CHECKING,
+    Literal, Optional
 )
-from contextlib import (
+from contextlib  import (
     redirect_stdout, redirect_stderr
 )
 
-from ..        import utils
-from ..        import checks
-from ..        import config
-from ..logger  import logging
-from ..classes import Bot, Cog, Context
+from ..          import utils
+from ..          import checks
+from ..          import config
+from ..logger    import logging, LOG_LEVELS, LOG_TYPES_TEXT
+from ..logsearch import LogSearcher, parse_time
+from ..profiler  import profiler, format_report
+from ..classes   import Bot, Cog, Context
 
 import discord
 from discord.ext import commands
@@ -47,10 +50,10 @@ class Developer(Cog):
             The name of the cog to load (without the 'cogs.' prefix).
         """
         ext = "cogs."+cog
-        logging.warning(f"{ctx.author.display_name} (@{ctx.author}, {ctx.author.id}) wants to load `{ext}`")
+        logging.warning("%s (@%s, %s) wants to load `%s`", ctx.author.display_name, ctx.author, ctx.author.id, ext, extra=ctx.log_extra)
         await self.bot.load_extension(ext)
         await ctx.send(f"✅ Loaded the extension: `{ext}`")
-        logging.info(f"successfully loaded `{ext}`")
+        logging.info("successfully loaded `%s`", ext)
     
     @commands.command(aliases=["unload-extension"])
     async def unload(self, ctx: Context, cog: str) -> None:
@@ -62,10 +65,10 @@ class Developer(Cog):
             The name of the cog to unload (without the 'cogs.' prefix).
         """
         ext = "cogs."+cog
-        logging.warning(f"{ctx.author.display_name} (@{ctx.author}, {ctx.author.id}) wants to unload `{ext}`")
+        logging.warning("%s (@%s, %s) wants to unload `%s`", ctx.author.display_name, ctx.author, ctx.author.id, ext, extra=ctx.log_extra)
         await self.bot.unload_extension(ext)
         await ctx.send(f"✅ Unloaded the extension: `{ext}`")
-        logging.info(f"successfully unloaded `{ext}`")
+        logging.info("successfully unloaded `%s`", ext)
     
     @commands.command(aliases=["r", "re", "reload-all", "reload-extension", "reload-all-extensions"])
     async def reload(self, ctx: Context, *cogs: str) -> None:
@@ -81,13 +84,13 @@ class Developer(Cog):
             extensions = [k for k in self.bot.extensions.keys()]
             
             msg = await ctx.send("🔨 Reloading all extensions...")
-            logging.warning(f"{ctx.author.display_name} (@{ctx.author}, {ctx.author.id}) wants to reload all extensions")
+            logging.warning("%s (@%s, %s) wants to reload all extensions", ctx.author.display_name, ctx.author, ctx.author.id, extra=ctx.log_extra)
         
         else:
             extensions = ["cogs."+cog for cog in cogs]
             
             msg = await ctx.send(f"🔨 Reloading: `{'`, `'.join(extensions)}`")
-            logging.warning(f"{ctx.author.display_name} (@{ctx.author}, {ctx.author.id}) wants to reload `{'`, `'.join(extensions)}`")
+            logging.warning("%s (@%s, %s) wants to reload `%s`", ctx.author.display_name, ctx.author, ctx.author.id, "`, `".join(extensions), extra=ctx.log_extra)
         
         ext_status = ""
         for ext in extensions:
@@ -128,7 +131,7 @@ class Developer(Cog):
             
             if ctx.command and len(ctx.args) > 2:
                 ext = "cogs."+ctx.args[2]
-                logging.error(f"failed to {ctx.command.name} `{ext}`: `{error.__class__.__name__}`", exc_info=error)
+                logging.error("failed to %s `%s`: `%s`", ctx.command.name, ext, error.__class__.__name__, exc_info=error)
                 await ctx.send(f"❌ Error occurred while {ctx.command.name}ing the extension: `{ext}`\n"+
                                utils.code(f"{e.__class__.__name__}: {str(e)}"))
             
@@ -138,10 +141,250 @@ class Developer(Cog):
         else:
             raise error
     
+    @commands.command(aliases=["log", "tail"])
+    async def logs(
+        self,
+        ctx: Context,
+        level: Optional[Literal["info", "warning", "error", "critical", "debug"]] = None,
+        count: Optional[int] = 20,
+        *,
+        query: Optional[str] = None
+    ) -> None:
+        """Shows the most recent logs kept in memory, without reading the log files.
+        
+        Parameters
+        ----------
+        level : Optional[Literal["info", "warning", "error", "critical", "debug"]]
+            Only show logs of this level. If not specified, logs of all levels are shown.
+        count : Optional[int]
+            The maximum amount of logs to show. Defaults to 20.
+        query : Optional[str]
+            Only show logs containing this text (case insensitive).
+        """
+        if logging.recent_records is None:
+            await ctx.send("❌ Recent logs are not kept in memory, set `LOGGER_BUFFER_SIZE` in the config to enable them.")
+            return
+        
+        records = logging.recent(
+            levels = [LOG_LEVELS[level]] if level else None,
+            contains = query,
+            limit = max(1, count or 20)
+        )
+        
+        if not records:
+            await ctx.send("No matching logs found.")
+            return
+        
+        level_names = {log_level: log_type for log_type, log_level in LOG_LEVELS.items()}
+        
+        # Keep the most recent logs that fit into one message
+        lines: list[str] = []
+        length = 0
+        for created, log_level, message in reversed(records):
+            timestamp = datetime.datetime.fromtimestamp(created).strftime(config.LOGGER_TIME_FORMAT)
+            line = f"{timestamp} {LOG_TYPES_TEXT['text'].get(level_names.get(log_level, 'debug'), '')} > {message}"
+            line = utils.trim_and_add_suffix(line, 1800)
+            if length + len(line) + 1 > 1800:
+                break
+            lines.append(line)
+            length += len(line) + 1
+        
+        lines.reverse()
+        await ctx.send(f"Showing the last {len(lines)} matching log(s):\n" + utils.code("\n".join(lines).replace("```", "`\u200b``"), "prolog"))
+    
+    @commands.command(aliases=["search-logs", "logsearch"])
+    async def searchlogs(
+        self,
+        ctx: Context,
+        since: str,
+        until: str = "now",
+        level: Optional[Literal["info", "warning", "error", "critical", "debug"]] = None,
+        *,
+        query: Optional[str] = None
+    ) -> None:
+        """Searches the saved log files for the logs of a time range, including rotated ones.
+        
+        Parameters
+        ----------
+        since : str
+            The start of the time range, a duration ago like `2h` or `1h30m`, or a date like
+            `"2025-01-01 10:00"` (in quotes).
+        until : str
+            The end of the time range, in the same format as `since` or `now`. Defaults to `now`.
+        level : Optional[Literal["info", "warning", "error", "critical", "debug"]]
+            Only show logs of this level. If not specified, logs of all levels are shown.
+        query : Optional[str]
+            Only show logs containing this text (case insensitive).
+        """
+        try:
+            start = parse_time(since)
+            end = parse_time(until)
+        except ValueError as e:
+            await ctx.send(f"❌ {str(e).capitalize()}")
+            return
+        
+        searcher = LogSearcher(logging.logs_folder or "logs")
+        
+        def search() -> tuple[deque[str], int]:
+            # Only the latest logs fit into a message, but count all of them
+            latest: deque[str] = deque(maxlen=50)
+            total = 0
+            for entry in searcher.search(start, end, levels=[level] if level else None, contains=query):
+                latest.append(entry.text)
+                total += 1
+            return latest, total
+        
+        started = time.perf_counter()
+        latest, total = await self.run(search)
+        duration = time.perf_counter() - started
+        
+        if not total:
+            await ctx.send(f"No matching logs found (read {searcher.bytes_read:,} bytes in {duration:.2f}s).")
+            return
+        
+        # Keep the most recent logs that fit into one message
+        lines: list[str] = []
+        length = 0
+        for text in reversed(latest):
+            line = utils.trim_and_add_suffix(text, 1700)
+            if length + len(line) + 1 > 1700:
+                break
+            lines.append(line)
+            length += len(line) + 1
+        
+        lines.reverse()
+        await ctx.send(f"Showing the last {len(lines)} of {total:,} matching log(s) (read {searcher.bytes_read:,} bytes in {duration:.2f}s):\n" +
+                       utils.code("\n".join(lines).replace("```", "`\u200b``"), "prolog"))
+    
+    @commands.command(aliases=["boot", "startup-times"])
+    async def startup(self, ctx: Context, count: int = 5) -> None:
+        """Shows how long each phase of the last startup took, compared to the previous startups.
+        
+        Parameters
+        ----------
+        count : int
+            The amount of previous startups to compare with. Defaults to 5.
+        """
+        boots = await self.run(profiler.history, max(1, count) + 1)
+        latest = profiler.finished
+        if latest is None:
+            await ctx.send("❌ The bot hasn't finished starting up yet.")
+            return
+        
+        previous = [boot for boot in boots if boot.get("pid") != latest.get("pid") or boot.get("time") != latest.get("time")][-max(1, count):]
+        started = datetime.datetime.fromtimestamp(latest["time"]).strftime(config.LOGGER_TIME_FORMAT)
+        await ctx.send(f"Startup at {started} took **{latest['total']:.2f}s**" +
+                       ("" if previous else " (no previous startups saved to compare with)") + "\n" +
+                       utils.code(format_report(latest, previous), "prolog"))
+    
+    @commands.command(aliases=["db", "db-stats", "querystats"])
+    async def dbstats(self, ctx: Context, count: int = 15) -> None:
+        """Shows how many database queries were made and how long they took since the bot started.
+        
+        Parameters
+        ----------
+        count : int
+            The amount of model operations to show, the slowest in total first. Defaults to 15.
+        """
+        stats = self.bot.prisma.query_stats
+        if not stats.histograms:
+            await ctx.send("No database queries were made yet.")
+            return
+        
+        def milliseconds(seconds: float) -> str:
+            return f"{seconds * 1000:.1f}ms"
+        
+        rows = [("query", "calls", "p50", "p95", "p99", "max")]
+        histograms = sorted(stats.histograms.items(), key=lambda item: item[1].total, reverse=True)
+        for (model, operation), histogram in [*histograms[:max(1, count)], (("all", "queries"), stats.total())]:
+            rows.append((
+                f"{model}.{operation}",
+                f"{histogram.count:,}",
+                milliseconds(histogram.percentile(50)),
+                milliseconds(histogram.percentile(95)),
+                milliseconds(histogram.percentile(99)),
+                milliseconds(histogram.max)
+            ))
+        
+        widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+        lines = ["  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip() for row in rows]
+        
+        buffer = self.bot.write_buffer.stats
+        lines.append("")
+        lines.append(f"{stats.slow:,} slow (>= {milliseconds(stats.slow_threshold)}), {stats.errors:,} failed")
+        lines.append(f"write buffer: {buffer['written']:,} written in {buffer['flushes']:,} flush(es), "
+                     f"{milliseconds(buffer['average_flush_time'])} average, {buffer['pending']:,} pending")
+        
+        since = datetime.datetime.fromtimestamp(stats.started).strftime(config.LOGGER_TIME_FORMAT)
+        await ctx.send(f"Database queries since {since}:\n" + utils.code("\n".join(lines), "prolog"))
+    
+    @commands.command(aliases=["commandstats", "cmd-stats", "usage"])
+    async def cmdstats(self, ctx: Context, hours: int = 24, *, command: Optional[str] = None) -> None:
+        """Shows the most used commands, how often they failed and how long they took.
+        
+        Parameters
+        ----------
+        hours : int
+            How many hours to look back. Defaults to 24.
+        command : Optional[str]
+            Only show this command and its subcommands.
+        """
+        if not config.COMMAND_ANALYTICS:
+            await ctx.send("❌ Commands are not recorded, set `COMMAND_ANALYTICS` in the config to enable it.")
+            return
+        
+        stats = await self.bot.analytics.stats(max(1, hours), command, limit=15)
+        if not stats:
+            await ctx.send(f"No commands were used in the last {max(1, hours)} hour(s).")
+            return
+        
+        rows = [("command", "uses", "failed", "average", "max")]
+        for entry in stats:
+            rows.append((
+                entry.command,
+                f"{entry.uses:,}",
+                f"{entry.failures:,}",
+                f"{entry.average_duration * 1000:.0f}ms",
+                f"{entry.max_duration * 1000:.0f}ms"
+            ))
+        
+        widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+        lines = ["  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip() for row in rows]
+        await ctx.send(f"Most used commands in the last {max(1, hours)} hour(s):\n" + utils.code("\n".join(lines), "prolog"))
+    
+    @commands.command(aliases=["cache", "cache-stats"])
+    async def cachestats(self, ctx: Context, clear: bool = False) -> None:
+        """Shows the hit rate and size of the database row cache.
+        
+        Parameters
+        ----------
+        clear : bool
+            Whether to forget every cached row afterwards. Defaults to False.
+        """
+        stats = self.bot.cache.stats
+        lines = [
+            f"size        {stats['size']:,} / {stats['max_size']:,}",
+            f"hit rate    {stats['hit_rate']:.1%} ({stats['hits']:,} hits, {stats['misses']:,} misses)",
+            f"evictions   {stats['evictions']:,}",
+            f"expirations {stats['expirations']:,}",
+            f"invalidated {stats['invalidations']:,}"
+        ]
+        
+        if stats["models"]:
+            lines.append("")
+            for model, counts in stats["models"].items():
+                lookups = counts["hits"] + counts["misses"]
+                lines.append(f"{model}: {counts['hits'] / lookups:.1%} of {lookups:,} lookup(s)")
+        
+        if clear:
+            self.bot.cache.clear()
+        
+        await ctx.send(utils.code("\n".join(lines), "prolog") + ("\nCleared the cache." if clear else ""))
+    
     @commands.command()
     async def restart(self, ctx: Context) -> None:
         """Restarts the bot."""
-        logging.warning(f"{ctx.author.display_name} (@{ctx.author}, id: {ctx.author.id}) is restarting the bot")
+        logging.warning("%s (@%s, id: %s) is restarting the bot", ctx.author.display_name, ctx.author, ctx.author.id, extra=ctx.log_extra)
         
         try:
             await ctx.react("🫠")
@@ -156,7 +399,7 @@ class Developer(Cog):
     @commands.command()
     async def shutdown(self, ctx: Context) -> None:
         """Shuts down the bot."""
-        logging.warning(f"{ctx.author.display_name} (@{ctx.author}, id: {ctx.author.id}) is shutting down the bot")
+        logging.warning("%s (@%s, id: %s) is shutting down the bot", ctx.author.display_name, ctx.author, ctx.author.id, extra=ctx.log_extra)
         
         try:
             await ctx.react("🫀")
@@ -210,10 +453,10 @@ class Developer(Cog):
         """
         bot = self.bot
         
-        logging.warn(f"{ctx.clean_prefix}exec called by {ctx.author.display_name} (@{ctx.author.name}, id: {ctx.author.id})")
+        logging.warn("%sexec called by %s (@%s, id: %s)", ctx.clean_prefix, ctx.author.display_name, ctx.author.name, ctx.author.id, extra=ctx.log_extra)
         
         version = "{version.major}.{version.minor}.{version.micro}".format(version=sys.version_info)
-        dpy_version = pkg_resources.get_distribution("discord.py-self").version
+        dpy_version = utils.get_package_version("discord.py-self")
         
         env = {
             "bot": bot,
@@ -285,7 +528,7 @@ class Developer(Cog):
                 )
                 
                 self._last_result = e
-                logging.error(f"failed at `exec()` ({ctx.clean_prefix}exec by {ctx.author.display_name} (@{ctx.author.name}, id: {ctx.author.id}))", exc_info=e)
+                logging.error("failed at `exec()` (%sexec by %s (@%s, id: %s))", ctx.clean_prefix, ctx.author.display_name, ctx.author.name, ctx.author.id, exc_info=e, extra=ctx.log_extra)
             
             else:
                 func = env["func"]
@@ -332,12 +575,12 @@ class Developer(Cog):
                     
                     self._last_result = e
                     
-                    output = (f"{output}\n"
-                              f"Time taken: {time_text}")
-                    
-                    logging.error(f"EXECUTION FAILED! output of `exec` {ctx.clean_prefix}exec called by {ctx.author.display_name} (@{ctx.author.name}, id: {ctx.author.id})\n"
-                                f"{output}")
-                    logging.error(f"execution failed ({ctx.clean_prefix}exec by {ctx.author.display_name} (@{ctx.author.name}, id: {ctx.author.id}))", exc_info=e)
+                    logging.error("EXECUTION FAILED! output of `exec` %sexec called by %s (@%s, id: %s)\n"
+                                  "%s\n"
+                                  "Time taken: %s",
+                                  ctx.clean_prefix, ctx.author.display_name, ctx.author.name, ctx.author.id,
+                                  output, time_text, extra=ctx.log_extra)
+                    logging.error("execution failed (%sexec by %s (@%s, id: %s))", ctx.clean_prefix, ctx.author.display_name, ctx.author.name, ctx.author.id, exc_info=e, extra=ctx.log_extra)
                 
                 else:
                     t = time.monotonic() - t
@@ -377,13 +620,13 @@ class Developer(Cog):
                         
                     self._last_result = ret
                     
-                    output = (f"{output}\n"
-                            f"Returned: {repr(ret)}\n"
-                            f"Type: {type(ret)}\n"
-                            f"Time taken: {time_text}")
-                    
-                    logging.info(f"execution successful; output of `exec` {ctx.clean_prefix}exec called by {ctx.author.display_name} (@{ctx.author.name}, id: {ctx.author.id})\n"
-                                f"{output}")
+                    logging.info("execution successful; output of `exec` %sexec called by %s (@%s, id: %s)\n"
+                                 "%s\n"
+                                 "Returned: %r\n"
+                                 "Type: %s\n"
+                                 "Time taken: %s",
+                                 ctx.clean_prefix, ctx.author.display_name, ctx.author.name, ctx.author.id,
+                                 output, ret, type(ret), time_text, extra=ctx.log_extra)
         
         try:
             await ctx.reply(response_text)
@@ -12,7 +12,7 @@ class Events(Cog):
     
     @commands.Cog.listener()
     async def on_ready(self) -> None:
-        logging.info(f"serving {len(self.bot.guilds)} guilds and {len(self.bot.users)} users")
+        logging.info("serving %s guilds and %s users", len(self.bot.guilds), len(self.bot.users))
         logging.info("ready to handle commands")
     
     @commands.Cog.listener()
@@ -71,7 +71,9 @@ class Events(Cog):
         
         elif isinstance(exception, commands.CommandNotFound):
             if config.LOG_NOT_FOUND_COMMANDS_TO_CONSOLE:
-                logging.error(f"{ctx.author.display_name} (@{ctx.author.name}, id: {ctx.author.id}) used {ctx.message.content} but command `{ctx.message.content[len(ctx.prefix or ""):].split()[0]}` doesn't exist!")
+                logging.error("%s (@%s, id: %s) used %s but command `%s` doesn't exist!",
+                              ctx.author.display_name, ctx.author.name, ctx.author.id, ctx.message.content, ctx.invoked_with,
+                              extra=ctx.log_extra)
             
             if config.COMMAND_NOT_FOUND_MESSAGE:
                 msg = config.COMMAND_NOT_FOUND_MESSAGE.format(
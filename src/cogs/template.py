@@ -2,6 +2,9 @@ from ..classes import Bot, Cog, Context
 
 from discord.ext import commands
 
+# Cogs that have to be loaded before this one, without the 'cogs.' prefix (optional)
+# DEPENDS_ON = ["events"]
+
 class Example(Cog):
     """Example cog."""
     
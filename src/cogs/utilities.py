@@ -5,6 +5,9 @@ from typing import (
 )
 
 from ..        import utils
+from ..        import checks
+from ..        import config
+from ..logger  import logging
 from ..classes import Bot, Cog, Context
 
 import psutil
@@ -105,5 +108,40 @@ class Utilities(Cog):
         
         await ctx.reply(response, mention_author=False)
 
+    @commands.group(invoke_without_command=True, aliases=["prefixes"])
+    async def prefix(self, ctx: Context) -> None:
+        """Shows the prefix of this server (or of this DM)"""
+        current = self.bot.prefixes.get(self.bot.prefixes.scope(ctx.message))
+        default = " (default)" if current == config.DEFAULT_PREFIX else ""
+        await ctx.reply(f"The prefix here is `{current}`{default}.", mention_author=False)
+    
+    @prefix.command(name="set")
+    @commands.check(checks.is_admin)
+    async def prefix_set(self, ctx: Context, new_prefix: str) -> None:
+        """Sets the prefix of this server (or of this DM)
+        
+        Parameters
+        ----------
+        new_prefix : str
+            The new prefix, use quotes for prefixes ending with a space.
+        """
+        if not new_prefix or len(new_prefix) > 32:
+            await ctx.reply("❌ The prefix must be between 1 and 32 characters long.", mention_author=False)
+            return
+        
+        scope = self.bot.prefixes.scope(ctx.message)
+        await self.bot.prefixes.set(scope, new_prefix)
+        logging.info("%s (@%s, id: %s) set the prefix of %s to %r", ctx.author.display_name, ctx.author, ctx.author.id, scope, new_prefix, extra=ctx.log_extra)
+        await ctx.reply(f"✅ The prefix here is now `{new_prefix}`.", mention_author=False)
+    
+    @prefix.command(name="reset")
+    @commands.check(checks.is_admin)
+    async def prefix_reset(self, ctx: Context) -> None:
+        """Resets the prefix of this server (or of this DM) to the default prefix"""
+        scope = self.bot.prefixes.scope(ctx.message)
+        await self.bot.prefixes.reset(scope)
+        logging.info("%s (@%s, id: %s) reset the prefix of %s", ctx.author.display_name, ctx.author, ctx.author.id, scope, extra=ctx.log_extra)
+        await ctx.reply(f"✅ The prefix here is now the default prefix `{config.DEFAULT_PREFIX}`.", mention_author=False)
+
 async def setup(bot: Bot) -> None:
     await bot.add_cog(Utilities(bot))
\ No newline at end of file
@@ -15,10 +15,59 @@
 ##################################
 
 # BOT_NAME               - The bot name, only used to show in logs.
-# DATABASE_LOCATION      - The location of the database file, only used to show in logs.
+# DATABASE_LOCATION      - The location of the database file, used for logs and direct access (`bot.sqlite`).
+#                          Must be the same file as the `url` in prisma/schema.prisma.
 BOT_NAME = "template bot"
 DATABASE_LOCATION = "./database/database.db"
 
+# SQLITE_PRAGMAS - SQLite settings applied to the database every time the bot connects to it, they
+#                  are checked and logged after being applied. Remove a setting to keep SQLite's
+#                  default for it.
+#                  journal_mode - WAL lets reads happen while writing and makes writes much faster.
+#                  synchronous  - NORMAL is safe with WAL (only the last commits can be lost on a
+#                                 power loss, the database can't get corrupted).
+#                  mmap_size    - Bytes of the database read through memory mapping (268435456 is 256 MiB).
+#                  cache_size   - Page cache size, negative values are in KiB (-65536 is 64 MiB).
+#                  temp_store   - Keep temporary tables and indexes in MEMORY.
+#                  busy_timeout - Milliseconds to wait for a lock instead of failing right away.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 268435456,
+    "cache_size": -65536,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000
+}
+
+# SQLITE_DIRECT_ACCESS     - Also open the database directly through `bot.sqlite` on top of Prisma,
+#                            for queries on hot paths. Prisma still creates and migrates the tables.
+# SQLITE_READERS           - How many read connections `bot.sqlite` keeps, reads run in parallel on them.
+# SQLITE_CACHED_STATEMENTS - How many prepared statements every connection of `bot.sqlite` keeps for reuse.
+SQLITE_DIRECT_ACCESS = True
+SQLITE_READERS = 4
+SQLITE_CACHED_STATEMENTS = 256
+
+# WRITE_BUFFER_SIZE        - Database writes made through `bot.write_buffer` are written in batches,
+#                            one transaction per batch. A batch is written once this many writes
+#                            are waiting...
+# WRITE_BUFFER_INTERVAL    - ...or at least every this many seconds.
+# WRITE_BUFFER_MAX_PENDING - The most writes that can wait to be written, adding more waits until
+#                            a batch has been written.
+WRITE_BUFFER_SIZE = 500
+WRITE_BUFFER_INTERVAL = 2.0
+WRITE_BUFFER_MAX_PENDING = 10000
+
+# MODEL_CACHE_SIZE - How many database rows looked up through `bot.cache` to keep in memory, the least
+#                    recently used ones are dropped first. 0 disables caching.
+# MODEL_CACHE_TTL  - How many seconds a cached row is used before it's read from the database again.
+#                    0 keeps it until it's changed through the bot or dropped.
+MODEL_CACHE_SIZE = 10000
+MODEL_CACHE_TTL = 300
+
+# SLOW_QUERY_THRESHOLD - Database queries that take at least this many seconds are logged as warnings.
+#                        0 disables logging them, they are still counted in `dbstats`.
+SLOW_QUERY_THRESHOLD = 0.25
+
 # DEFAULT_PREFIX         - This can be the default prefix the bot will assign to a server when it
 #                          detects its in a new server.
 # MENTION_IS_ALSO_PREFIX - You can also @mention the bot as a prefix, for example `@mention help`
@@ -35,13 +84,63 @@ ADMINS = [1077982815070728223]
 DEBUG = True
 
 # SAVE_CUSTOM_LOGS      - Whether to save the logs produced by the custom logger.
-# SAVE_DISCORD_LOGS     - Whether to save the logs produced by the discord.py logger.
+# SAVE_DISCORD_LOGS     - Whether to save the logs produced by the discord.py logger (and the other
+#                         libraries in LIBRARY_LOGGERS). All of them go through the custom logger,
+#                         so they are saved to its log files and need SAVE_CUSTOM_LOGS.
+# PRINT_DISCORD_LOGS    - Whether to also print the logs of discord.py (and the other libraries in
+#                         LIBRARY_LOGGERS) to the console.
+# LIBRARY_LOGGERS       - Names of the library loggers routed into the custom logger.
+# LIBRARY_LOG_LEVEL     - The lowest level of the library logs that are saved or printed ("DEBUG", "INFO",
+#                         "WARNING", ...), even in debug mode. "DEBUG" logs every gateway event.
+# SAVE_JSON_LOGS        - Whether to also save the logs produced by the custom logger as JSON lines
+#                         (one JSON object per log) for log shipping, needs SAVE_CUSTOM_LOGS.
 # LOGGER_FLUSH_ON_PRINT - Save file contents as logger prints. 
 # Save path: ./logs/<bot name> <time>.log
+# JSON save path: ./logs/<bot name> <time>.jsonl
 SAVE_CUSTOM_LOGS = True
 SAVE_DISCORD_LOGS = True
+PRINT_DISCORD_LOGS = False
+LIBRARY_LOGGERS = ["discord", "aiohttp", "prisma"]
+LIBRARY_LOG_LEVEL = "INFO"
+SAVE_JSON_LOGS = False
 LOGGER_FLUSH_ON_PRINT = False
 
+# LOGGER_ASYNC             - Hand log records to a background writer thread instead of writing them
+#                            to the console and log file on the calling thread. Keeps the event
+#                            loop free during bursts of logs.
+# LOGGER_QUEUE_SIZE        - The maximum amount of log records waiting for the background writer.
+# LOGGER_QUEUE_FULL_POLICY - What to do when the queue is full, "drop" the log record or "block"
+#                            until the writer has made room for it.
+LOGGER_ASYNC = False
+LOGGER_QUEUE_SIZE = 10000
+LOGGER_QUEUE_FULL_POLICY = "drop"
+
+# LOGGER_BUFFER_SIZE - How many of the most recent logs to keep in memory, they can be viewed with
+#                      the `logs` developer command without reading the log files. 0 disables it.
+LOGGER_BUFFER_SIZE = 1000
+
+# LOGGER_RATE_LIMIT          - How many logs with the same message may be written per
+#                              LOGGER_RATE_LIMIT_INTERVAL. Further repeats are dropped and a summary
+#                              with their count is logged once the interval ends. Messages logged
+#                              with arguments (`logging.error("%s not found", name)`) count as the
+#                              same message regardless of the arguments. 0 disables it.
+# LOGGER_RATE_LIMIT_INTERVAL - The rate limit interval in seconds.
+LOGGER_RATE_LIMIT = 50
+LOGGER_RATE_LIMIT_INTERVAL = 10
+
+# LOG_ROTATE_MAX_BYTES - Start a new log file once the current one reaches this size in bytes
+#                        (10485760 is 10 MiB). 0 disables size based rotation.
+# LOG_ROTATE_INTERVAL  - Start a new log file once the current one is this many seconds old
+#                        (86400 is a day). 0 disables time based rotation.
+# LOG_BACKUP_COUNT     - How many rotated log files to keep, older ones are deleted. 0 keeps all.
+#                        The log files of earlier runs count as rotated files too.
+# LOG_COMPRESS_ROTATED - Compress rotated log files with gzip (in the background).
+# Rotated files are saved as: ./logs/<bot name> <time>.log.<rotation time>[.gz]
+LOG_ROTATE_MAX_BYTES = 10485760
+LOG_ROTATE_INTERVAL = 86400
+LOG_BACKUP_COUNT = 10
+LOG_COMPRESS_ROTATED = True
+
 # LOG_COMMANDS_TO_CONSOLE           - Log every text and slash command being used by a user to
 #                                     console.
 # LOG_NOT_FOUND_COMMANDS_TO_CONSOLE - Log every text command that users try to use but do not
@@ -49,6 +148,52 @@ LOGGER_FLUSH_ON_PRINT = False
 LOG_COMMANDS_TO_CONSOLE = True
 LOG_NOT_FOUND_COMMANDS_TO_CONSOLE = True
 
+# COMMAND_ANALYTICS                - Record every command invocation (command, user, guild, channel, duration
+#                                    and whether it failed) to the database, see the `cmdstats` command.
+# COMMAND_ANALYTICS_BUFFER_SIZE    - Invocations are written in bulk, once this many are waiting...
+# COMMAND_ANALYTICS_INTERVAL       - ...or at least every this many seconds.
+# COMMAND_ANALYTICS_RETENTION_DAYS - Days to keep single invocations for, 0 keeps them forever. The hourly
+#                                    totals `cmdstats` reads are always kept.
+COMMAND_ANALYTICS = True
+COMMAND_ANALYTICS_BUFFER_SIZE = 1000
+COMMAND_ANALYTICS_INTERVAL = 10.0
+COMMAND_ANALYTICS_RETENTION_DAYS = 30
+
+# ARCHIVE_DATABASE_LOCATION - The database the `archive` cog archives messages to, separate from the Prisma
+#                             database because Prisma doesn't know its full-text search tables.
+# ARCHIVE_QUEUE_SIZE        - The most new messages waiting to be archived, more are dropped (the
+#                             archive never slows down the bot).
+# ARCHIVE_BATCH_SIZE        - The most messages archived in one transaction.
+ARCHIVE_DATABASE_LOCATION = "./database/archive.db"
+ARCHIVE_QUEUE_SIZE = 10000
+ARCHIVE_BATCH_SIZE = 500
+
+# BACKUP_LOCATION       - The folder backups of the database are saved to, see the `backup` command.
+# BACKUP_INTERVAL_HOURS - Back up the database every this many hours while the bot is running, 0 to only
+#                         back it up with the `backup` command.
+# BACKUP_KEEP           - How many backups to keep, the oldest ones are deleted. 0 keeps all of them.
+# BACKUP_COMPRESS       - Compress backups with gzip.
+# BACKUP_PAGES_PER_STEP - Backups are copied this many database pages (4 KiB each) at a time...
+# BACKUP_STEP_SLEEP     - ...pausing this many seconds in between, so a backup never hogs the disk.
+BACKUP_LOCATION = "./backups"
+BACKUP_INTERVAL_HOURS = 24
+BACKUP_KEEP = 7
+BACKUP_COMPRESS = True
+BACKUP_PAGES_PER_STEP = 1024
+BACKUP_STEP_SLEEP = 0.01
+
+# HTTP_CONNECTION_LIMIT          - The most connections open at once in the bot's HTTP session (used for
+#                                  fetching files and images), 0 for no limit.
+# HTTP_CONNECTION_LIMIT_PER_HOST - The most connections open at once to the same host, 0 for no limit.
+# HTTP_DNS_CACHE_TTL             - Seconds DNS lookups are cached for.
+# HTTP_KEEPALIVE_TIMEOUT         - Seconds an idle connection is kept open to be reused.
+# HTTP_TIMEOUT                   - Seconds a request may take in total.
+HTTP_CONNECTION_LIMIT = 100
+HTTP_CONNECTION_LIMIT_PER_HOST = 10
+HTTP_DNS_CACHE_TTL = 300
+HTTP_KEEPALIVE_TIMEOUT = 30
+HTTP_TIMEOUT = 30
+
 # MISSING_ARGUMENT_MESSAGE   - The message sent when a user tries to use a command without
 #                              providing the required arguments.
 # NO_PERMISSIONS_MESSAGE     - The message sent when a user tries to use a command they don't
@@ -79,4 +224,24 @@ LOG_FILE_NAME_TIME_FORMAT = "%Y-%m-%d %H-%M-%S"
 # COGS_EXCLUDE - Comma seperated list of cogs to exclude on runtime.
 # Example: ["developer", "test"]
 # The example excludes developer.py and test.py cog from loading on bot startup.
-COGS_EXCLUDE = ["template"]
\ No newline at end of file
+COGS_EXCLUDE = ["template"]
+
+# LAZY_COGS          - Only load a cog when one of its commands is used for the first time instead of
+#                      on startup, which makes startup (and `restart`) faster. Cogs with event
+#                      listeners, tasks or slash commands are always loaded on startup.
+# COG_INDEX_LOCATION - Where to save the index of the commands in every cog, used to know which cog to
+#                      load for a command. It is updated automatically when a cog file changes.
+LAZY_COGS = False
+COG_INDEX_LOCATION = "./.cache/cog_index.json"
+
+# STARTUP_PROFILE_LOCATION - Where the timings of every startup phase (imports, connecting to the
+#                            database, loading cogs, logging in...) are saved, they can be compared
+#                            with the `startup` developer command. None to not save them.
+# PROFILE_IMPORTS          - Also time how long importing every package takes on startup. Makes
+#                            imports a little slower, can also be enabled for a single run with the
+#                            `PROFILE_IMPORTS=1` environment variable.
+# STARTUP_IMPORT_BUDGET    - Log a warning when importing the bot's modules on startup takes longer
+#                            than this many seconds, to notice slow imports creeping in. None disables it.
+STARTUP_PROFILE_LOCATION = "./logs/startup.jsonl"
+PROFILE_IMPORTS = False
+STARTUP_IMPORT_BUDGET = 2.0
\ No newline at end of file
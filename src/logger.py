@@ -19,6 +19,11 @@ Usage:
     logging = Logger("My Program", log_level=5)
     logging.info("Hello World")
     ```
+    
+    Lazy formatting example (only formatted if the message will be logged):
+    ```py
+    logging.debug("loaded %s in %.2fs", name, duration)
+    ```
 
     Log Levels:
     - 0: No logs
@@ -34,15 +39,38 @@ For more information, please check the provided LICENSE file.
 """
 
 import os
+import sys
+import time
+import queue
+import json
+import glob
+import gzip
+import shutil
+import atexit
+import threading
 import traceback
+import logging as logg
 from datetime import datetime
-from typing import Callable, Any, Literal
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Sequence, Mapping, Any, Literal
 
 from .config     import (
     BOT_NAME,
     SAVE_CUSTOM_LOGS,
+    LOGGER_ASYNC,
+    LOGGER_QUEUE_SIZE,
+    LOGGER_BUFFER_SIZE,
+    LOGGER_RATE_LIMIT,
+    LOGGER_RATE_LIMIT_INTERVAL,
     LOGGER_TIME_FORMAT,
     LOGGER_FLUSH_ON_PRINT,
+    LOGGER_QUEUE_FULL_POLICY,
+    SAVE_JSON_LOGS,
+    LOG_BACKUP_COUNT,
+    LOG_COMPRESS_ROTATED,
+    LOG_ROTATE_INTERVAL,
+    LOG_ROTATE_MAX_BYTES,
     LOG_FILE_NAME_TIME_FORMAT
 )
 from .termcolors import *
@@ -50,6 +78,8 @@ from .termcolors import bg_rgb
 
 __all__ = (
     "Logger",
+    "LogRotator",
+    "LoggerHandler",
 )
 
 LOG_TYPES_TEXT = {
@@ -69,6 +99,379 @@ LOG_TYPES_TEXT = {
     }
 }
 
+# A formatted log record: (console text, log file text, JSON log file text), None for sinks that don't take it
+LogRecord = tuple[str | None, str | None, str | None]
+
+# A log record kept in memory: (created, log level, message)
+BufferedRecord = tuple[float, int, str]
+
+# Log levels by log type
+LOG_LEVELS = {
+    "info": 1,
+    "warning": 2,
+    "error": 3,
+    "critical": 4,
+    "debug": 5
+}
+
+# Log level names used in JSON logs
+LOG_LEVEL_NAMES = {
+    1: "info",
+    2: "warning",
+    3: "error",
+    4: "critical",
+    5: "debug"
+}
+
+# Constant parts of a JSON log line, encoded once
+_JSON_TIMESTAMP = '{"timestamp":"'
+_JSON_LEVEL     = '","level":"'
+_JSON_LOGGER    = '","logger":'
+_JSON_MESSAGE   = ',"message":'
+_JSON_EXCEPTION = ',"exception":'
+_JSON_END       = '}\n'
+_json_string = json.encoder.encode_basestring_ascii # C accelerated when available
+_json_keys: dict[str, str] = {} # Context field keys, encoded the first time they're used
+
+# Attributes `_prefix_handler` renders prefixes from
+_PREFIX_ATTRIBUTES = frozenset({
+    "name",
+    "name_color",
+    "timestamp_color",
+    "message_color",
+    "time_format",
+    "log_types_text"
+})
+
+# Attributes that decide which log levels the sinks take
+_SINK_ATTRIBUTES = frozenset({
+    "log_level",
+    "log_file",
+    "log_file_log_level",
+    "json_log_file",
+    "json_log_level",
+    "recent_records",
+    "buffer_log_level"
+})
+
+# Level methods (and their aliases) by log level
+_LEVEL_METHODS = {
+    1: ("info",),
+    2: ("warning", "warn"),
+    3: ("error", "err"),
+    4: ("critical", "crit"),
+    5: ("debug",)
+}
+
+def _json_value(value: Any) -> str:
+    """Encodes a context field value for a JSON log line."""
+    # Exact type checks first, ids and names are by far the most common values
+    value_type = type(value)
+    if value_type is int:
+        return str(value)
+    if value_type is str:
+        return _json_string(value)
+    if isinstance(value, str):
+        return _json_string(value)
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    return json.dumps(value, default=str)
+
+def _noop(*args: Any, **kwargs: Any) -> None:
+    """Stands in for the level methods of disabled log levels."""
+
+_RATE_LIMIT_MAX_KEYS = 4096 # Distinct messages tracked per rate limit interval
+
+def _shorten(text: str, max_length: int = 200) -> str:
+    """Shortens a message template for a rate limit summary."""
+    text = text.replace("\n", " ")
+    return text if len(text) <= max_length else text[:max_length - 3] + "..."
+
+_STOP = object() # Tells the background writer to drain the queue and exit
+_WRITER_BATCH_SIZE = 512
+
+# Compresses and prunes rotated log files, one at a time, off the calling thread
+_rotation_executor: ThreadPoolExecutor | None = None
+# Rotated files still waiting to be compressed, pruning skips them until they are
+_pending_rotations: set[str] = set()
+_pending_rotations_lock = threading.Lock()
+
+def _get_rotation_executor() -> ThreadPoolExecutor:
+    global _rotation_executor
+    if _rotation_executor is None:
+        _rotation_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log rotation")
+    return _rotation_executor
+
+class LogRotator:
+    """
+    Decides when a log file should be rotated and rotates it. Rotated files are renamed to
+    `<log file>.<time>`, then gzipped (optionally) and pruned to `backup_count` files in a
+    background thread so writers never wait on compression. With `history`, the log files of earlier
+    runs (and their rotated files) count as rotated files too, so restarts don't keep adding files.
+    
+    Writers must hold `lock` while writing and reopen their file object when `generation` changes.
+    
+    Parameters:
+    - path (str): Path of the log file.
+    - max_bytes (int): Rotate once roughly this many bytes have been written to the file, 0 to disable (default: LOG_ROTATE_MAX_BYTES).
+    - interval (float): Rotate once the file is this many seconds old, 0 to disable (default: LOG_ROTATE_INTERVAL).
+    - backup_count (int): Amount of rotated files to keep, 0 to keep all of them (default: LOG_BACKUP_COUNT).
+    - compress (bool): Whether to gzip rotated files (default: LOG_COMPRESS_ROTATED).
+    - time_format (str): Format of the time appended to rotated file names (default: LOG_FILE_NAME_TIME_FORMAT).
+    - history (str | None): A glob pattern matching the log files of earlier runs, e.g. `logs/<name> [0-9]*.log*` (default: None).
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_bytes: int = LOG_ROTATE_MAX_BYTES,
+        interval: float = LOG_ROTATE_INTERVAL,
+        backup_count: int = LOG_BACKUP_COUNT,
+        compress: bool = LOG_COMPRESS_ROTATED,
+        time_format: str = LOG_FILE_NAME_TIME_FORMAT,
+        history: str | None = None
+    ) -> None:
+        self.path = path
+        self.history = history
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.backup_count = backup_count
+        self.compress = compress
+        self.time_format = time_format
+        self.lock = threading.RLock()
+        self.generation = 0 # Incremented every time the file is rotated
+        self.size = os.path.getsize(path) if os.path.exists(path) else 0
+        self.opened_at = time.time()
+    
+    def written(self, size: int) -> bool:
+        """
+        Records that `size` characters were written to the file.
+        
+        Returns:
+        - bool: Whether the file should be rotated now.
+        """
+        self.size += size
+        return self.should_rotate()
+    
+    def should_rotate(self) -> bool:
+        """Whether the file has reached its maximum size or age."""
+        if self.max_bytes and self.size >= self.max_bytes:
+            return True
+        if self.interval and time.time() - self.opened_at >= self.interval:
+            return True
+        return False
+    
+    def rotate(self) -> str | None:
+        """
+        Moves the current log file aside. Sinks sharing this rotator must not have it open for
+        writing anymore (they reopen it when they see the new `generation`).
+        
+        Returns:
+        - str | None: The path the log file was moved to, None if there was nothing to rotate.
+        """
+        with self.lock:
+            self.generation += 1
+            self.size = 0
+            self.opened_at = time.time()
+            
+            if not os.path.exists(self.path):
+                return None
+            
+            base_name = f"{self.path}.{datetime.now().strftime(self.time_format)}"
+            rotated = base_name
+            counter = 1
+            while os.path.exists(rotated) or os.path.exists(rotated + ".gz"):
+                rotated = f"{base_name} {counter}"
+                counter += 1
+            
+            try:
+                os.replace(self.path, rotated)
+            except OSError:
+                # Another process (or Windows) is holding the file, try again on the next rotation
+                traceback.print_exc(file=sys.__stderr__)
+                return None
+        
+        if self.compress:
+            with _pending_rotations_lock:
+                _pending_rotations.add(rotated)
+        _get_rotation_executor().submit(self._finish_rotation, rotated)
+        return rotated
+    
+    def rotated_files(self) -> list[str]:
+        """
+        The rotated files of this log file (and the files of earlier runs matching `history`), oldest
+        first. Rotated files still waiting to be compressed aren't included.
+        """
+        files = set(glob.glob(glob.escape(self.path) + ".*"))
+        if self.history:
+            files.update(glob.glob(self.history))
+            files.discard(self.path)
+        with _pending_rotations_lock:
+            files.difference_update(_pending_rotations)
+        
+        def mtime(path: str) -> float:
+            try:
+                return os.path.getmtime(path)
+            except OSError:
+                return 0
+        
+        return sorted(files, key=mtime)
+    
+    def prune(self) -> None:
+        """Deletes the oldest rotated files over `backup_count`."""
+        if self.backup_count <= 0:
+            return
+        
+        for path in self.rotated_files()[:-self.backup_count]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass # Already gone, e.g. pruned by another rotator matching the same files
+    
+    def _finish_rotation(self, rotated: str) -> None:
+        """Compresses a rotated file and prunes old ones. Runs in the rotation thread."""
+        try:
+            if self.compress:
+                try:
+                    with open(rotated, "rb") as source, gzip.open(rotated + ".gz", "wb") as target:
+                        shutil.copyfileobj(source, target)
+                except FileNotFoundError:
+                    pass # Already gone, e.g. pruned by another process sharing the folder
+                else:
+                    # Keep the time of the rotation, pruning goes by it
+                    shutil.copystat(rotated, rotated + ".gz")
+                    os.remove(rotated)
+                finally:
+                    with _pending_rotations_lock:
+                        _pending_rotations.discard(rotated)
+            
+            self.prune()
+        
+        except Exception:
+            traceback.print_exc(file=sys.__stderr__)
+
+class LoggerHandler(logg.Handler):
+    """
+    A standard library `logging.Handler` that routes records of libraries like discord.py,
+    aiohttp and prisma into a Logger, so they share its writer, log files, rotation and levels.
+    Use `Logger.bridge()` to attach it.
+    
+    Parameters:
+    - logger (Logger): The Logger to route records into.
+    - do_print (bool): Whether to print the records to the console (default: True).
+    - do_save (bool): Whether to save the records to the log files (default: True).
+    """
+    
+    def __init__(self, logger: "Logger", *, do_print: bool = True, do_save: bool = True) -> None:
+        super().__init__()
+        self.logger = logger
+        self.do_print = do_print
+        self.do_save = do_save
+    
+    def emit(self, record: logg.LogRecord) -> None:
+        try:
+            if isinstance(record.args, tuple):
+                args = record.args
+            else:
+                args = (record.args,) if record.args else ()
+            
+            self.logger.log(
+                _stdlib_log_type(record.levelno),
+                # %-formatting is left to the Logger, so it only happens if a sink takes the record
+                f"{record.name}: {record.msg}",
+                *args,
+                exc_info = record.exc_info[1] if record.exc_info else None,
+                extra = {"source": record.name},
+                do_print = self.do_print,
+                do_save = self.do_save
+            )
+        
+        except Exception:
+            self.handleError(record)
+
+def _positional_exc_info(
+    message: Any,
+    args: tuple[Any, ...],
+    exc_info: BaseException | None
+) -> tuple[tuple[Any, ...], BaseException | None]:
+    """
+    Keeps the old `error(message, exc_info)` calls working now that `exc_info` is keyword-only:
+    an exception given as the only argument becomes `exc_info` (and is still used for %-formatting
+    if the message has a placeholder). Other arguments are left as they are, arguments that don't fit
+    the message are appended to it like with the other levels.
+    
+    Returns:
+    - tuple[tuple[Any, ...], BaseException | None]: The %-formatting arguments and `exc_info`.
+    """
+    if len(args) == 1 and isinstance(args[0], BaseException) and exc_info is None:
+        has_placeholders = isinstance(message, str) and "%" in message.replace("%%", "")
+        return (args if has_placeholders else ()), args[0]
+    return args, exc_info
+    
+    has_placeholders = isinstance(message, str) and "%" in message.replace("%%", "")
+    if len(args) == 1 and isinstance(args[0], BaseException) and exc_info is None:
+        return (args if has_placeholders else ()), args[0]
+    if not has_placeholders:
+        raise TypeError(f"{method}() got arguments for a message without %-placeholders, pass the exception as exc_info=")
+    return args, exc_info
+
+def _stdlib_log_type(levelno: int) -> Literal["info", "warning", "error", "critical", "debug"]:
+    """Maps a standard library logging level to a log type."""
+    if levelno >= logg.CRITICAL:
+        return "critical"
+    if levelno >= logg.ERROR:
+        return "error"
+    if levelno >= logg.WARNING:
+        return "warning"
+    if levelno >= logg.INFO:
+        return "info"
+    return "debug"
+
+class _LogFile:
+    """A log file written by a Logger sink and rotated by a (possibly shared) LogRotator."""
+    
+    def __init__(self, rotator: LogRotator) -> None:
+        self.rotator = rotator
+        self.file = None # To hold the file object
+        self.generation = 0 # The rotator generation the file object was opened in
+    
+    def write(self, text: str, flush: bool) -> None:
+        rotator = self.rotator
+        with rotator.lock:
+            # Reopen the file if it has been rotated since it was opened (possibly by another sink)
+            if self.file is not None and self.generation != rotator.generation:
+                self.file.close()
+                self.file = None
+            
+            # Open the file only once when logging starts and store the file object
+            if self.file is None:
+                folder = os.path.dirname(rotator.path)
+                if folder: os.makedirs(folder, exist_ok=True)
+                self.file = open(rotator.path, "a", encoding="utf-8")
+                self.generation = rotator.generation
+            
+            self.file.write(text) # Use the stored file object
+            if flush:
+                self.file.flush()
+            
+            if rotator.written(len(text)):
+                self.file.close()
+                self.file = None
+                rotator.rotate()
+    
+    def close(self) -> None:
+        """Flushes any buffered data and closes the file if it's open."""
+        with self.rotator.lock:
+            if self.file is not None:
+                self.file.flush() # Flush the buffer
+                self.file.close() # Close the file
+                self.file = None # Reset the file object
+
 class Logger:
     """
     A customizable logger class that supports logging messages with different log levels,
@@ -86,6 +489,19 @@ class Logger:
     - time_format (str): Format for the log timestamps (default: LOGGER_TIME_FORMAT).
     - log_file_name_time_format (str): Format for log file names (default: LOG_FILE_NAME_TIME_FORMAT).
     - log_types_text (dict): Dictionary containing text and color formats for different log types (default: LOG_TYPES_TEXT).
+    - async_mode (bool): Write log records from a background thread instead of the calling thread (default: LOGGER_ASYNC).
+    - queue_size (int): Maximum amount of log records waiting for the background writer (default: LOGGER_QUEUE_SIZE).
+    - queue_full_policy (str): "drop" or "block" when the background writer's queue is full (default: LOGGER_QUEUE_FULL_POLICY).
+    - max_bytes (int): Rotate the log file once it reaches this size, 0 to disable (default: LOG_ROTATE_MAX_BYTES).
+    - rotate_interval (float): Rotate the log file after this many seconds, 0 to disable (default: LOG_ROTATE_INTERVAL).
+    - backup_count (int): Amount of rotated log files to keep, 0 to keep all of them (default: LOG_BACKUP_COUNT).
+    - compress_rotated (bool): Whether to gzip rotated log files in the background (default: LOG_COMPRESS_ROTATED).
+    - json_logs (bool): Whether to also save logs as JSON lines next to the log file (default: SAVE_JSON_LOGS).
+    - json_log_level (int): Minimum log level for saving to the JSON log file (default: 5).
+    - buffer_size (int): Amount of recent log records to keep in memory, 0 to disable (default: LOGGER_BUFFER_SIZE).
+    - buffer_log_level (int): Minimum log level for keeping a record in memory (default: 5).
+    - rate_limit (int): How many logs of the same message (template) to write per interval, 0 to disable (default: LOGGER_RATE_LIMIT).
+    - rate_limit_interval (float): The rate limit interval in seconds (default: LOGGER_RATE_LIMIT_INTERVAL).
     
     Example:
     ```py
@@ -110,9 +526,24 @@ class Logger:
         time_format: str = LOGGER_TIME_FORMAT,
         flush_on_print: bool = LOGGER_FLUSH_ON_PRINT,
         log_file_name_time_format: str = LOG_FILE_NAME_TIME_FORMAT,
-        log_types_text: dict[str, dict[str, str]] = LOG_TYPES_TEXT
+        log_types_text: dict[str, dict[str, str]] = LOG_TYPES_TEXT,
+        async_mode: bool = LOGGER_ASYNC,
+        queue_size: int = LOGGER_QUEUE_SIZE,
+        queue_full_policy: Literal["drop", "block"] = LOGGER_QUEUE_FULL_POLICY,
+        max_bytes: int = LOG_ROTATE_MAX_BYTES,
+        rotate_interval: float = LOG_ROTATE_INTERVAL,
+        backup_count: int = LOG_BACKUP_COUNT,
+        compress_rotated: bool = LOG_COMPRESS_ROTATED,
+        json_logs: bool = SAVE_JSON_LOGS,
+        json_log_level: int = 5,
+        buffer_size: int = LOGGER_BUFFER_SIZE,
+        buffer_log_level: int = 5,
+        rate_limit: int = LOGGER_RATE_LIMIT,
+        rate_limit_interval: float = LOGGER_RATE_LIMIT_INTERVAL
     ) -> None:
         """Initialize the Logger instance with the specified configuration options."""
+        self._prefix_cache: dict[tuple[str, bool], tuple[int, str]] = {}
+        self._bridged_loggers: list[tuple[logg.Logger, int]] = [] # (standard library logger, its own lowest level)
         self.name = str(name)
         self.logs_folder = logs_folder
         self.log_file = self._get_log_file_path(logs_folder, log_file_name_time_format) if logs_folder else None
@@ -126,7 +557,122 @@ class Logger:
         self.flush_on_print = flush_on_print
         self.log_file_name_time_format = log_file_name_time_format
         self.log_types_text = log_types_text
-        self._log_file_object = None # To hold the file object
+        self.json_log_file = (os.path.splitext(self.log_file)[0] + ".jsonl") if self.log_file and json_logs else None
+        self.json_log_level = json_log_level
+        # Recent records as compact (created, log level, message) tuples, the oldest are discarded first
+        self.recent_records: deque[BufferedRecord] | None = deque(maxlen=buffer_size) if buffer_size > 0 else None
+        self.buffer_log_level = buffer_log_level
+        self.rate_limit = rate_limit
+        self.rate_limit_interval = rate_limit_interval
+        self._rate_limits: dict[tuple[int, str], list] = {} # Rate limit intervals by (log level, template)
+        self._rate_limit_summaries: deque[tuple[int, str, int]] = deque() # (log level, template, suppressed)
+        self._rate_limit_swept_at = time.monotonic()
+        self._rate_limit_lock = threading.Lock()
+        self._text_sink: _LogFile | None = None # To hold the log file objects
+        self._json_sink: _LogFile | None = None
+        self._json_timestamp_cache: tuple[int, str] = (-1, "")
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.compress_rotated = compress_rotated
+        self.queue_size = queue_size
+        self.queue_full_policy = queue_full_policy
+        self.dropped_records = 0
+        self._lock = threading.Lock() # Guards the console stream and the log file object
+        self._queue: queue.Queue | None = None
+        self._writer: threading.Thread | None = None
+        self._stream = None # The console stream used by the background writer
+        
+        if async_mode:
+            self.start_writer()
+        
+        # Make sure queued records and buffered file contents are written even if close() is never called
+        atexit.register(self.close)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        # Changing anything the prefix is rendered from invalidates the cached prefixes
+        if name in _PREFIX_ATTRIBUTES and "_prefix_cache" in self.__dict__:
+            self._prefix_cache.clear()
+        # Changing what the sinks take changes which level methods are no-ops
+        elif name in _SINK_ATTRIBUTES:
+            self._update_level_methods()
+    
+    @property
+    def async_mode(self) -> bool:
+        """Whether log records are currently written by the background writer thread."""
+        return self._writer is not None
+    
+    def start_writer(self) -> None:
+        """
+        Starts the background writer thread. From now on `log()` only enqueues records,
+        and the writer drains them into the console and the log file in batches.
+        """
+        if self._writer is not None:
+            return
+        
+        self._stream = sys.stdout
+        self._queue = queue.Queue(self.queue_size)
+        self._writer = threading.Thread(target=self._writer_loop, name=f"{self.name} log writer", daemon=True)
+        self._writer.start()
+    
+    def stop_writer(self) -> None:
+        """Drains every queued record, stops the background writer thread and goes back to writing synchronously."""
+        if self._writer is None or self._queue is None:
+            return
+        
+        writer, log_queue = self._writer, self._queue
+        log_queue.put(_STOP) # Always block here, the stop signal must never be dropped
+        writer.join()
+        
+        self._writer = None
+        self._queue = None
+        stream, self._stream = self._stream, None
+        
+        # Records enqueued by other threads after the stop signal
+        leftovers: list[LogRecord] = []
+        try:
+            while True:
+                record = log_queue.get_nowait()
+                if record is not _STOP:
+                    leftovers.append(record)
+        except queue.Empty:
+            pass
+        if leftovers:
+            self._write(leftovers, stream or sys.stdout)
+    
+    def _writer_loop(self) -> None:
+        """Target of the background writer thread."""
+        log_queue = self._queue
+        if log_queue is None:
+            return
+        
+        reported_drops = 0
+        while True:
+            batch = [log_queue.get()]
+            try:
+                while len(batch) < _WRITER_BATCH_SIZE:
+                    batch.append(log_queue.get_nowait())
+            except queue.Empty:
+                pass
+            
+            stop = _STOP in batch
+            records: list[LogRecord] = [record for record in batch if record is not _STOP]
+            
+            if self.dropped_records != reported_drops:
+                dropped = self.dropped_records - reported_drops
+                reported_drops = self.dropped_records
+                record = self._format("warning", f"dropped {dropped} log record(s) because the log queue was full")
+                if record is not None:
+                    records.append(record)
+            
+            try:
+                self._write(records, self._stream or sys.stdout)
+            except Exception:
+                traceback.print_exc(file=sys.__stderr__)
+            
+            if stop:
+                return
     
     def _get_log_file_path(self, logs_folder: str, log_file_name_time_format: str) -> str:
         """
@@ -153,36 +699,333 @@ class Logger:
         self,
         log_type: Literal["info", "warning", "error", "critical", "debug"] | int,
         message: Any,
-        *,
+        *args: Any,
+        exc_info: BaseException | None = None,
+        extra: Mapping[str, Any] | None = None,
         do_print: bool = True,
         do_save: bool = True
     ) -> None:
         """
         Logs a message with a given log type and message content.
         
+        The message is only rendered if a sink will take it, so pass values as `args`
+        (`logging.debug("loaded %s", name)`) instead of formatting them beforehand.
+        
         Parameters:
         - log_type (str or int): Log type (e.g., "info", "warning", "error", "critical", "debug" or corresponding integer).
-        - message (Any): Message content to log.
+        - message (Any): Message content to log, %-formatted with `args` if any are given.
+        - *args (Any): Arguments for %-formatting the message.
+        - exc_info (BaseException | None): Exception whose traceback is appended to the message (default: None).
+        - extra (Mapping[str, Any] | None): Context fields (e.g. command, author_id, guild_id) added to JSON logs (default: None).
         - do_print (bool): Whether to print the log message to the console (default: True).
-        - do_save (bool): Whether to save the log message to the log file (default: True).
+        - do_save (bool): Whether to save the log message to the log files (default: True).
+        """
+        record = self._format(log_type, message, args, exc_info, extra, do_print=do_print, do_save=do_save)
+        
+        # Summaries of suppressed repeats go out first, the repeats happened before this record
+        if self._rate_limit_summaries:
+            self._log_rate_limit_summaries()
+        
+        if record is None:
+            return
+        
+        self._emit(record)
+    
+    def _emit(self, record: LogRecord) -> None:
+        """Writes a rendered record, or hands it to the background writer."""
+        if self._queue is not None:
+            self._enqueue(record)
+        else:
+            self._write((record,), sys.stdout)
+    
+    def _format(
+        self,
+        log_type: Literal["info", "warning", "error", "critical", "debug"] | int,
+        message: Any,
+        args: tuple[Any, ...] = (),
+        exc_info: BaseException | None = None,
+        extra: Mapping[str, Any] | None = None,
+        *,
+        do_print: bool = True,
+        do_save: bool = True,
+        rate_limit: bool = True
+    ) -> LogRecord | None:
+        """
+        Renders a log message for every sink that will take it.
+        
+        Returns:
+        - LogRecord | None: The console, log file and JSON log file text, or None if no sink takes the
+          message or it is suppressed by the rate limit.
         """
         log_level = self._get_log_level(log_type)
+        to_console = do_print and log_level <= self.log_level
+        to_file = do_save and bool(self.log_file) and log_level <= self.log_file_log_level
+        to_json = do_save and bool(self.json_log_file) and log_level <= self.json_log_level
+        to_buffer = self.recent_records is not None and log_level <= self.buffer_log_level
+        if not (to_console or to_file or to_json or to_buffer):
+            return None
+        
+        # Rate limit repeats of the same message template, before anything is rendered
+        if rate_limit and self.rate_limit > 0 and type(message) is str and not self._check_rate_limit(log_level, message):
+            return None
+        
+        if isinstance(log_type, int):
+            log_type = LOG_LEVEL_NAMES.get(log_type, "debug") # pyright: ignore[reportAssignmentType]
+        
+        text, exception = self._render_message(message, args, exc_info)
+        full_text = f"{text}\n{exception}" if exception else text
+        
+        # deque.append is thread-safe, so the record is kept in memory right away
+        if to_buffer and self.recent_records is not None:
+            self.recent_records.append((time.time(), log_level, full_text))
+            if not (to_console or to_file or to_json):
+                return None
+        
+        console_text = file_text = json_text = None
         
         # Print log message if the level is less than or equal to current log level
-        if do_print and log_level <= self.log_level:
+        if to_console:
             prefix = str(self.prefix(log_type))  # pyright: ignore[reportCallIssue, reportArgumentType]
-            print(prefix + str(message), end=reset + "\n", flush=True)
+            console_text = prefix + full_text + reset + "\n"
         
         # Save log message to file if applicable
-        if do_save and self.log_file and log_level <= self.log_file_log_level:
+        if to_file:
             prefix = str(self.prefix(log_type, color=False))  # pyright: ignore[reportCallIssue, reportArgumentType]
-            if self.logs_folder: os.makedirs(self.logs_folder, exist_ok=True)
-            # Open the file only once when logging starts and store the file object
-            if self._log_file_object is None:
-                self._log_file_object = open(self.log_file, "a", encoding="utf-8")
-            self._log_file_object.write(prefix + str(message) + "\n") # Use the stored file object
-            if self.flush_on_print:
-                self._log_file_object.flush()
+            file_text = prefix + full_text + "\n"
+        
+        if to_json:
+            json_text = self._render_json(log_level, text, exception, extra)
+        
+        return (console_text, file_text, json_text)
+    
+    def _check_rate_limit(self, log_level: int, template: str) -> bool:
+        """
+        Counts a log of `template` (the message before %-formatting) at `log_level` and decides whether
+        it is within the rate limit. Once an interval with suppressed repeats has ended, a summary of them
+        is queued for `_log_rate_limit_summaries()`.
+        
+        Returns:
+        - bool: Whether the log should be written.
+        """
+        now = time.monotonic()
+        interval = self.rate_limit_interval
+        key = (log_level, template)
+        
+        with self._rate_limit_lock:
+            if now - self._rate_limit_swept_at >= interval:
+                self._sweep_rate_limits(now)
+            
+            window = self._rate_limits.get(key)
+            if window is None or now - window[0] >= interval:
+                if window is not None and window[2]:
+                    self._rate_limit_summaries.append((log_level, template, window[2]))
+                elif window is None and len(self._rate_limits) >= _RATE_LIMIT_MAX_KEYS:
+                    return True # Too many distinct messages to keep track of, let it through untracked
+                
+                self._rate_limits[key] = [now, 1, 0] # [window start, logged, suppressed]
+                return True
+            
+            if window[1] < self.rate_limit:
+                window[1] += 1
+                return True
+            
+            window[2] += 1
+            return False
+    
+    def _sweep_rate_limits(self, now: float, *, everything: bool = False) -> None:
+        """
+        Forgets ended rate limit intervals (or all of them with `everything`), queueing summaries
+        of their suppressed repeats. Call with `_rate_limit_lock` held.
+        """
+        self._rate_limit_swept_at = now
+        
+        for key, window in list(self._rate_limits.items()):
+            if not everything and now - window[0] < self.rate_limit_interval:
+                continue
+            if window[2]:
+                self._rate_limit_summaries.append((key[0], key[1], window[2]))
+            del self._rate_limits[key]
+    
+    def _log_rate_limit_summaries(self) -> None:
+        """Logs the queued summaries of suppressed repeats."""
+        while self._rate_limit_summaries:
+            try:
+                log_level, template, suppressed = self._rate_limit_summaries.popleft()
+            except IndexError:
+                return
+            
+            record = self._format(
+                log_level,
+                "suppressed %d repeat(s) of a log within %ss: %s",
+                (suppressed, self.rate_limit_interval, _shorten(template)),
+                rate_limit = False
+            )
+            if record is not None:
+                self._emit(record)
+    
+    def _render_message(self, message: Any, args: tuple[Any, ...], exc_info: BaseException | None) -> tuple[str, str | None]:
+        """
+        Applies %-formatting to the message.
+        
+        Returns:
+        - tuple[str, str | None]: The message and the traceback of `exc_info`, if any.
+        """
+        text = str(message)
+        
+        if args:
+            # Like the standard library, a single mapping argument is used for %(name)s placeholders
+            format_args: Any = args[0] if len(args) == 1 and isinstance(args[0], Mapping) else args
+            try:
+                text = text % format_args
+            except (TypeError, ValueError, KeyError) as e:
+                text = f"{text} (could not format the message with {args!r}: {e})"
+        
+        exception = "".join(traceback.format_exception(exc_info)) if exc_info else None
+        return text, exception
+    
+    def _render_json(self, log_level: int, text: str, exception: str | None, extra: Mapping[str, Any] | None) -> str:
+        """Renders a JSON log line. Constant keys are pre-encoded and only values are escaped."""
+        now = time.time()
+        second = int(now)
+        
+        # The timestamp up to the second is cached, only the milliseconds are rendered every time
+        cached_second, timestamp = self._json_timestamp_cache
+        if cached_second != second:
+            timestamp = datetime.fromtimestamp(second).isoformat()
+            self._json_timestamp_cache = (second, timestamp)
+        
+        parts = [
+            _JSON_TIMESTAMP, timestamp, f".{int((now - second) * 1000):03d}",
+            _JSON_LEVEL, LOG_LEVEL_NAMES.get(log_level, "debug"),
+            _JSON_LOGGER, _json_string(self.name),
+            _JSON_MESSAGE, _json_string(text)
+        ]
+        
+        if exception is not None:
+            parts.append(_JSON_EXCEPTION)
+            parts.append(_json_string(exception))
+        
+        if extra:
+            for key, value in extra.items():
+                encoded_key = _json_keys.get(key)
+                if encoded_key is None:
+                    encoded_key = _json_keys[key] = "," + _json_string(str(key)) + ":"
+                parts.append(encoded_key)
+                parts.append(_json_value(value))
+        
+        parts.append(_JSON_END)
+        return "".join(parts)
+    
+    def recent(
+        self,
+        *,
+        levels: Iterable[int] | None = None,
+        contains: str | None = None,
+        limit: int | None = None
+    ) -> list[BufferedRecord]:
+        """
+        Returns the most recent log records kept in memory, oldest first.
+        
+        Parameters:
+        - levels (Iterable[int] | None): Only return records of these log levels (default: None, all levels).
+        - contains (str | None): Only return records containing this text, case insensitive (default: None).
+        - limit (int | None): Return at most this many of the most recent matching records (default: None, all of them).
+        
+        Returns:
+        - list[tuple[float, int, str]]: (created, log level, message) tuples.
+        """
+        if self.recent_records is None:
+            return []
+        
+        records = list(self.recent_records) # Copy first, other threads may append while filtering
+        wanted_levels = set(levels) if levels is not None else None
+        needle = contains.lower() if contains else None
+        
+        matches: list[BufferedRecord] = []
+        for record in reversed(records):
+            if wanted_levels is not None and record[1] not in wanted_levels:
+                continue
+            if needle is not None and needle not in record[2].lower():
+                continue
+            matches.append(record)
+            if limit is not None and len(matches) >= limit:
+                break
+        
+        matches.reverse()
+        return matches
+    
+    def _enqueue(self, record: LogRecord) -> None:
+        """Hands a record to the background writer, following the queue full policy."""
+        log_queue = self._queue
+        if log_queue is None:
+            self._write((record,), sys.stdout)
+            return
+        
+        if self.queue_full_policy == "block":
+            log_queue.put(record)
+            return
+        
+        try:
+            log_queue.put_nowait(record)
+        except queue.Full:
+            self.dropped_records += 1
+    
+    def _write(self, records: Sequence[LogRecord], stream: Any) -> None:
+        """Writes rendered records to the console stream, the log file and the JSON log file."""
+        if len(records) == 1:
+            console_text, file_text, json_text = records[0]
+        else:
+            console_text = "".join(record[0] for record in records if record[0] is not None)
+            file_text = "".join(record[1] for record in records if record[1] is not None)
+            json_text = "".join(record[2] for record in records if record[2] is not None)
+        
+        with self._lock:
+            if console_text:
+                stream.write(console_text)
+                stream.flush()
+            
+            if file_text:
+                sink = self._text_sink
+                if sink is None or sink.rotator.path != self.log_file:
+                    sink = self._text_sink = self._get_sink(self.log_file, sink)
+                if sink is not None:
+                    sink.write(file_text, self.flush_on_print)
+            
+            if json_text:
+                sink = self._json_sink
+                if sink is None or sink.rotator.path != self.json_log_file:
+                    sink = self._json_sink = self._get_sink(self.json_log_file, sink)
+                if sink is not None:
+                    sink.write(json_text, self.flush_on_print)
+    
+    def _get_sink(self, path: str | None, sink: "_LogFile | None") -> "_LogFile | None":
+        """Returns the sink writing to `path`, replacing `sink` if it writes somewhere else."""
+        if not path:
+            return None
+        
+        if sink is None or sink.rotator.path != path:
+            if sink is not None:
+                sink.close()
+            # The files of earlier runs are named like this one (`<name> <time>.log`), so they're pruned with the rotated ones
+            folder, extension = os.path.dirname(path), os.path.splitext(path)[1]
+            sink = _LogFile(LogRotator(
+                path,
+                max_bytes = self.max_bytes,
+                interval = self.rotate_interval,
+                backup_count = self.backup_count,
+                compress = self.compress_rotated,
+                time_format = self.log_file_name_time_format,
+                history = os.path.join(glob.escape(folder), f"{glob.escape(self.name)} [0-9]*{extension}*")
+            ))
+            _get_rotation_executor().submit(sink.rotator.prune)
+        return sink
+    
+    @property
+    def rotator(self) -> "LogRotator | None":
+        """The rotator of the current log file, None if logs aren't saved to a file."""
+        with self._lock:
+            self._text_sink = self._get_sink(self.log_file, self._text_sink)
+            return self._text_sink.rotator if self._text_sink else None
     
     def _get_log_level(
         self,
@@ -195,21 +1038,15 @@ class Logger:
         ] | int
     ) -> int:
         """Helper method to map log types to log levels."""
-        log_level_mapping = {
-            "info": 1,
-            "warning": 2,
-            "error": 3,
-            "critical": 4,
-            "debug": 5
-        }
         if isinstance(log_type, int):
             return log_type
-        return log_level_mapping.get(log_type, 5)
+        return LOG_LEVELS.get(log_type, 5)
     
     def info(
         self,
         message: Any,
-        *,
+        *args: Any,
+        extra: Mapping[str, Any] | None = None,
         do_print: bool = True,
         do_save: bool = True
     ) -> None:
@@ -217,16 +1054,19 @@ class Logger:
         Logs an info-level message.
 
         Parameters:
-        - message (Any): Message content to log.
+        - message (Any): Message content to log, %-formatted with `args` if any are given.
+        - *args (Any): Arguments for %-formatting the message.
+        - extra (Mapping[str, Any] | None): Context fields added to JSON logs (default: None).
         - do_print (bool): Whether to print the log message to the console (default: True).
         - do_save (bool): Whether to save the log message to the log file (default: True).
         """
-        self.log("info", message, do_print=do_print, do_save=do_save)
+        self.log("info", message, *args, extra=extra, do_print=do_print, do_save=do_save)
     
     def warn(
         self,
         message: Any,
-        *,
+        *args: Any,
+        extra: Mapping[str, Any] | None = None,
         do_print: bool = True,
         do_save: bool = True
     ) -> None:
@@ -234,16 +1074,19 @@ class Logger:
         Alias for warning(). Logs a warning-level message.
 
         Parameters:
-        - message (Any): Message content to log.
+        - message (Any): Message content to log, %-formatted with `args` if any are given.
+        - *args (Any): Arguments for %-formatting the message.
+        - extra (Mapping[str, Any] | None): Context fields added to JSON logs (default: None).
         - do_print (bool): Whether to print the log message to the console (default: True).
         - do_save (bool): Whether to save the log message to the log file (default: True).
         """
-        self.warning(message, do_print=do_print, do_save=do_save)
+        self.warning(message, *args, extra=extra, do_print=do_print, do_save=do_save)
     
     def warning(
         self,
         message: Any,
-        *,
+        *args: Any,
+        extra: Mapping[str, Any] | None = None,
         do_print: bool = True,
         do_save: bool = True
     ) -> None:
@@ -251,17 +1094,20 @@ class Logger:
         Logs a warning-level message.
 
         Parameters:
-        - message (Any): Message content to log.
+        - message (Any): Message content to log, %-formatted with `args` if any are given.
+        - *args (Any): Arguments for %-formatting the message.
+        - extra (Mapping[str, Any] | None): Context fields added to JSON logs (default: None).
         - do_print (bool): Whether to print the log message to the console (default: True).
         - do_save (bool): Whether to save the log message to the log file (default: True).
         """
-        self.log("warning", message, do_print=do_print, do_save=do_save)
+        self.log("warning", message, *args, extra=extra, do_print=do_print, do_save=do_save)
     
     def err(
         self,
         message: Any,
-        exc_info: Exception | None = None,
-        *,
+        *args: Any,
+        exc_info: BaseException | None = None,
+        extra: Mapping[str, Any] | None = None,
         do_print: bool = True,
         do_save: bool = True
     ) -> None:
@@ -269,18 +1115,21 @@ class Logger:
         Alias for error(). Logs an error-level message with optional exception information.
 
         Parameters:
-        - message (Any): Message content to log.
-        - exc_info (Exception | None): Exception information to include in the log (default: None).
+        - message (Any): Message content to log, %-formatted with `args` if any are given.
+        - *args (Any): Arguments for %-formatting the message.
+        - exc_info (BaseException | None): Exception information to include in the log (default: None).
+        - extra (Mapping[str, Any] | None): Context fields added to JSON logs (default: None).
         - do_print (bool): Whether to print the log message to the console (default: True).
         - do_save (bool): Whether to save the log message to the log file (default: True).
         """
-        self.error(message, exc_info, do_print=do_print, do_save=do_save)
+        self.error(message, *args, exc_info=exc_info, extra=extra, do_print=do_print, do_save=do_save)
     
     def error(
         self,
         message: Any,
-        exc_info: Exception | None = None,
-        *,
+        *args: Any,
+        exc_info: BaseException | None = None,
+        extra: Mapping[str, Any] | None = None,
         do_print: bool = True,
         do_save: bool = True
     ) -> None:
@@ -288,20 +1137,23 @@ class Logger:
         Logs an error-level message with optional exception information.
         
         Parameters:
-        - message (Any): Message content to log.
-        - exc_info (Exception | None): Exception information to include in the log (default: None).
+        - message (Any): Message content to log, %-formatted with `args` if any are given.
+        - *args (Any): Arguments for %-formatting the message.
+        - exc_info (BaseException | None): Exception information to include in the log (default: None).
+          An exception given as the only argument is used as `exc_info` too, like the old `error(message, exc_info)`.
+        - extra (Mapping[str, Any] | None): Context fields added to JSON logs (default: None).
         - do_print (bool): Whether to print the log message to the console (default: True).
         - do_save (bool): Whether to save the log message to the log file (default: True).
         """
-        if exc_info:
-            message = f"{message}\n{traceback.format_exc()}"
-        self.log("error", message, do_print=do_print, do_save=do_save)
+        args, exc_info = _positional_exc_info(message, args, exc_info)
+        self.log("error", message, *args, exc_info=exc_info, extra=extra, do_print=do_print, do_save=do_save)
     
     def crit(
         self,
         message: Any,
-        exc_info: Exception | None = None,
-        *,
+        *args: Any,
+        exc_info: BaseException | None = None,
+        extra: Mapping[str, Any] | None = None,
         do_print: bool = True,
         do_save: bool = True
     ) -> None:
@@ -309,17 +1161,21 @@ class Logger:
         Alias for critical(). Logs a critical-level message.
         
         Parameters:
-        - message (Any): Message content to log.
+        - message (Any): Message content to log, %-formatted with `args` if any are given.
+        - *args (Any): Arguments for %-formatting the message.
+        - exc_info (BaseException | None): Exception information to include in the log (default: None).
+        - extra (Mapping[str, Any] | None): Context fields added to JSON logs (default: None).
         - do_print (bool): Whether to print the log message to the console (default: True).
         - do_save (bool): Whether to save the log message to the log file (default: True).
         """
-        self.critical(message, exc_info=exc_info, do_print=do_print, do_save=do_save)
+        self.critical(message, *args, exc_info=exc_info, extra=extra, do_print=do_print, do_save=do_save)
     
     def critical(
         self,
         message: Any,
-        exc_info: Exception | None = None,
-        *,
+        *args: Any,
+        exc_info: BaseException | None = None,
+        extra: Mapping[str, Any] | None = None,
         do_print: bool = True,
         do_save: bool = True
     ) -> None:
@@ -327,18 +1183,22 @@ class Logger:
         Logs a critical-level message.
         
         Parameters:
-        - message (Any): Message content to log.
+        - message (Any): Message content to log, %-formatted with `args` if any are given.
+        - *args (Any): Arguments for %-formatting the message.
+        - exc_info (BaseException | None): Exception information to include in the log (default: None).
+          An exception given as the only argument is used as `exc_info` too, like the old `critical(message, exc_info)`.
+        - extra (Mapping[str, Any] | None): Context fields added to JSON logs (default: None).
         - do_print (bool): Whether to print the log message to the console (default: True).
         - do_save (bool): Whether to save the log message to the log file (default: True).
         """
-        if exc_info:
-            message = f"{message}\n{traceback.format_exc()}"
-        self.log("critical", message, do_print=do_print, do_save=do_save)
+        args, exc_info = _positional_exc_info(message, args, exc_info)
+        self.log("critical", message, *args, exc_info=exc_info, extra=extra, do_print=do_print, do_save=do_save)
     
     def debug(
         self,
         message: Any,
-        *,
+        *args: Any,
+        extra: Mapping[str, Any] | None = None,
         do_print: bool = True,
         do_save: bool = True
     ) -> None:
@@ -346,11 +1206,89 @@ class Logger:
         Logs a debug-level message.
 
         Parameters:
-        - message (Any): Message content to log.
+        - message (Any): Message content to log, %-formatted with `args` if any are given.
+        - *args (Any): Arguments for %-formatting the message.
+        - extra (Mapping[str, Any] | None): Context fields added to JSON logs (default: None).
         - do_print (bool): Whether to print the log message to the console (default: True).
         - do_save (bool): Whether to save the log message to the log file (default: True).
         """
-        self.log("debug", message, do_print=do_print, do_save=do_save)
+        self.log("debug", message, *args, extra=extra, do_print=do_print, do_save=do_save)
+    
+    def bridge(
+        self,
+        names: Iterable[str],
+        *,
+        level: int | str = logg.INFO,
+        do_print: bool = True,
+        do_save: bool = True
+    ) -> LoggerHandler:
+        """
+        Routes the records of standard library loggers (e.g. "discord", "aiohttp", "prisma") into this Logger.
+        They never log below `level`, and drop the records no sink of this Logger takes, so their
+        levels follow this Logger's levels from now on without getting more verbose than `level`.
+        
+        Parameters:
+        - names (Iterable[str]): Names of the standard library loggers.
+        - level (int | str): Their lowest level, a standard library level like logging.INFO or "INFO" (default: logging.INFO).
+        - do_print (bool): Whether to print their records to the console (default: True).
+        - do_save (bool): Whether to save their records to the log files (default: True).
+        
+        Returns:
+        - LoggerHandler: The handler attached to the loggers.
+        """
+        if isinstance(level, str):
+            levelno = logg.getLevelName(level.upper())
+            if not isinstance(levelno, int):
+                raise ValueError(f"unknown log level: {level}")
+            level = levelno
+        
+        handler = LoggerHandler(self, do_print=do_print, do_save=do_save)
+        
+        for name in names:
+            stdlib_logger = logg.getLogger(name)
+            stdlib_logger.addHandler(handler)
+            stdlib_logger.propagate = False
+            self._bridged_loggers.append((stdlib_logger, level))
+        
+        self._update_level_methods()
+        return handler
+    
+    def _update_level_methods(self) -> None:
+        """
+        Replaces the level methods of levels that no sink takes with a no-op on this instance,
+        so calls to disabled levels return right away. Restores them when a sink takes them again.
+        Bridged standard library loggers get the matching level (but never below their own level
+        given to `bridge()`), so they drop those records too.
+        """
+        max_level = self.max_level
+        
+        if max_level >= 5:
+            stdlib_level = logg.DEBUG
+        elif max_level >= 1:
+            stdlib_level = logg.INFO
+        else:
+            stdlib_level = logg.CRITICAL + 1
+        for stdlib_logger, lowest_level in self.__dict__.get("_bridged_loggers", ()):
+            stdlib_logger.setLevel(max(stdlib_level, lowest_level))
+        
+        for level, names in _LEVEL_METHODS.items():
+            for name in names:
+                if level > max_level:
+                    self.__dict__[name] = _noop
+                else:
+                    self.__dict__.pop(name, None)
+    
+    @property
+    def max_level(self) -> int:
+        """The highest log level that at least one sink takes."""
+        levels = [self.__dict__.get("log_level", 0)]
+        if self.__dict__.get("log_file"):
+            levels.append(self.__dict__.get("log_file_log_level", 0))
+        if self.__dict__.get("json_log_file"):
+            levels.append(self.__dict__.get("json_log_level", 0))
+        if self.__dict__.get("recent_records") is not None:
+            levels.append(self.__dict__.get("buffer_log_level", 0))
+        return max(levels)
     
     def _prefix_handler(
         self,
@@ -369,19 +1307,42 @@ class Logger:
         Parameters:
         - log_type (str): Log type (e.g., "info", "warning", "error", "critical", "debug").
         - color (bool): Whether to include color formatting in the prefix (default: True).
+        
+        Prefixes are cached for the rest of the second they were rendered in, so timestamps
+        have a resolution of one second.
 
         Returns:
         - str: The formatted log message prefix.
         """
+        # The timestamp only changes once a second, so the rendered prefix is cached per
+        # (log_type, color) together with the second it was rendered for
+        second = int(time.time())
+        key = (log_type, color)
+        cached = self._prefix_cache.get(key)
+        if cached is not None and cached[0] == second:
+            return cached[1]
+        
+        timestamp = datetime.fromtimestamp(second).strftime(self.time_format)
         if color:
-            return f"{reset}{self.timestamp_color}{datetime.now().strftime(self.time_format)}{reset} {self.log_types_text['color'].get(log_type, '')}{reset} {self.name_color}{self.name}{reset} {self.message_color}"
-        return f"{datetime.now().strftime(self.time_format)} {self.log_types_text['text'].get(log_type, '')} {self.name} > "
+            prefix = f"{reset}{self.timestamp_color}{timestamp}{reset} {self.log_types_text['color'].get(log_type, '')}{reset} {self.name_color}{self.name}{reset} {self.message_color}"
+        else:
+            prefix = f"{timestamp} {self.log_types_text['text'].get(log_type, '')} {self.name} > "
+        
+        self._prefix_cache[key] = (second, prefix)
+        return prefix
     
     def close(self) -> None:
-        """Flushes any buffered data and closes the log file if it's open."""
-        if self._log_file_object:
-            self._log_file_object.flush() # Flush the buffer
-            self._log_file_object.close() # Close the file
-            self._log_file_object = None # Reset the file object
+        """Drains the background writer if it is running, flushes any buffered data and closes the log files if they're open."""
+        # Summarize every suppressed repeat, even if its interval has not ended yet
+        with self._rate_limit_lock:
+            self._sweep_rate_limits(time.monotonic(), everything=True)
+        self._log_rate_limit_summaries()
+        
+        self.stop_writer()
+        
+        with self._lock:
+            for sink in (self._text_sink, self._json_sink):
+                if sink is not None:
+                    sink.close()
 
 logging = Logger()
\ No newline at end of file
@@ -0,0 +1,603 @@
+"""
+This module searches the log files saved by the logger for the logs of a time range
+without reading the whole files.
+
+Every line of a log file starts with a timestamp in `LOGGER_TIME_FORMAT` and lines are
+written in time order, so a log file is sorted by time. The first time a file is searched,
+a sparse index with the timestamp of one line every `INDEX_STEP` bytes is built and cached in
+`<logs folder>/.index/`. A search bisects the index to find where the requested time range
+starts and ends and only reads that part of the file through mmap. Gzipped (rotated) log files
+can't be seeked into, they are skipped if their time range doesn't overlap the search and
+streamed otherwise.
+
+Usage:
+    Command line:
+    ```sh
+    python -m src.logsearch --since "2025-01-01 10:00:00" --until "2025-01-01 11:00:00"
+    python -m src.logsearch --since 2h --level error --contains "timed out"
+    ```
+    
+    Code:
+    ```py
+    from .logsearch import LogSearcher, parse_time
+    
+    searcher = LogSearcher("logs")
+    for entry in searcher.search(since=parse_time("2h"), levels=["error"]):
+        print(entry.text)
+    ```
+
+Only time formats with a fixed width (like the default one) are supported.
+
+Copyright (c) 2025-present SqdNoises
+Licensed under the MIT License
+For more information, please check the provided LICENSE file.
+"""
+
+import os
+import re
+import sys
+import glob
+import gzip
+import json
+import mmap
+import time
+import heapq
+import bisect
+import hashlib
+import argparse
+from datetime import datetime
+from typing   import Iterable, Iterator, NamedTuple
+
+from .config import LOGGER_TIME_FORMAT
+from .logger import LOG_TYPES_TEXT
+
+__all__ = (
+    "LogEntry",
+    "LogIndex",
+    "LogSearcher",
+    "parse_time"
+)
+
+INDEX_STEP = 65536 # Bytes between two index entries
+INDEX_VERSION = 1
+INDEX_FOLDER = ".index"
+_FINGERPRINT_SIZE = 4096 # Bytes hashed to tell a cached index apart from a new file with the same name
+
+# The level label written after the timestamp, e.g. "ERROR   " -> "error"
+_LEVELS_BY_LABEL = {label.strip(): log_type for log_type, label in LOG_TYPES_TEXT["text"].items()}
+
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*([smhdw])", re.IGNORECASE)
+_DURATIONS_PATTERN = re.compile(r"(?:\s*\d+(?:\.\d+)?\s*[smhdw])+", re.IGNORECASE)
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+class LogEntry(NamedTuple):
+    """A log found by a search, `text` includes the lines that follow it without a timestamp (like tracebacks)."""
+    created: float
+    level: str | None
+    text: str
+    path: str
+
+class _TimestampParser:
+    """Parses the timestamp at the start of a log line, remembering the last one since most lines share their second."""
+    
+    def __init__(self, time_format: str) -> None:
+        self.time_format = time_format
+        self.width = len(datetime(2000, 1, 1).strftime(time_format).encode())
+        self._last: tuple[bytes, float] | None = None
+    
+    def __call__(self, line: bytes) -> float | None:
+        prefix = line[:self.width]
+        last = self._last
+        if last is not None and last[0] == prefix:
+            return last[1]
+        
+        try:
+            created = datetime.strptime(prefix.decode(), self.time_format).timestamp()
+        except (ValueError, UnicodeDecodeError):
+            return None
+        
+        self._last = (prefix, created)
+        return created
+
+class LogIndex:
+    """
+    A sparse `timestamp -> offset` index of a plain text log file.
+    
+    Parameters:
+    - path (str): Path of the log file.
+    - cache_path (str | None): Where to cache the index, None to not cache it.
+    - time_format (str): Format of the timestamps at the start of each line (default: LOGGER_TIME_FORMAT).
+    - step (int): Roughly how many bytes there are between two index entries (default: INDEX_STEP).
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        cache_path: str | None = None,
+        *,
+        time_format: str = LOGGER_TIME_FORMAT,
+        step: int = INDEX_STEP
+    ) -> None:
+        self.path = path
+        self.cache_path = cache_path
+        self.time_format = time_format
+        self.step = step
+        self.size = 0
+        self.fingerprint = ""
+        self.times: list[float] = []
+        self.offsets: list[int] = []
+        self.first: float | None = None # Timestamp of the first log in the file
+        self.last: float | None = None  # Timestamp of the last log in the file
+    
+    def update(self, mm: "mmap.mmap | bytes") -> None:
+        """Loads the cached index and indexes whatever was appended to the file since, or everything if nothing is cached."""
+        size = len(mm)
+        if not self.times:
+            self._load_cache(mm)
+        
+        if self.times and size == self.size:
+            return
+        
+        if self.times and size > self.size:
+            # The file only grew, re-index from the last entry onwards
+            start = self.offsets.pop()
+            self.times.pop()
+        else:
+            start = 0
+            self.times.clear()
+            self.offsets.clear()
+        
+        parse = _TimestampParser(self.time_format)
+        offset = start
+        while offset < size:
+            if offset > 0:
+                newline = mm.find(b"\n", offset - 1)
+                if newline == -1:
+                    break
+                offset = newline + 1
+            
+            # Index the first line with a timestamp at or after the offset
+            found = self._next_timestamped_line(mm, offset, parse)
+            if found is None:
+                offset += self.step # A long traceback, try after it
+                continue
+            
+            created, line_start = found
+            if self.times and created < self.times[-1]:
+                created = self.times[-1] # Logs of threads racing for the file can be a second out of order
+            self.times.append(created)
+            self.offsets.append(line_start)
+            offset = line_start + self.step
+        
+        self.size = size
+        self.fingerprint = self._fingerprint(mm, size)
+        self.first = self.times[0] if self.times else None
+        self.last = self._last_timestamp(mm, parse)
+        self._save_cache()
+    
+    def window(self, since: float | None, until: float | None) -> tuple[int, int]:
+        """The byte range of the file that contains every log between `since` and `until`."""
+        start = 0
+        end = self.size
+        if since is not None and self.times:
+            # Start from the last entry before `since`, lines with the same second can come before its entry
+            position = bisect.bisect_left(self.times, since) - 1
+            if position > 0:
+                start = self.offsets[position]
+        if until is not None and self.times:
+            position = bisect.bisect_right(self.times, until)
+            if position < len(self.offsets):
+                end = self.offsets[position]
+        return start, end
+    
+    def _next_timestamped_line(self, mm: "mmap.mmap | bytes", offset: int, parse: _TimestampParser) -> tuple[float, int] | None:
+        size = len(mm)
+        limit = min(size, offset + self.step)
+        while offset < limit:
+            newline = mm.find(b"\n", offset)
+            if newline == -1:
+                newline = size
+            created = parse(mm[offset:offset + parse.width])
+            if created is not None:
+                return created, offset
+            offset = newline + 1
+        return None
+    
+    def _last_timestamp(self, mm: "mmap.mmap | bytes", parse: _TimestampParser) -> float | None:
+        end = len(mm)
+        while end > 0:
+            line_start = mm.rfind(b"\n", 0, end - 1) + 1
+            created = parse(mm[line_start:line_start + parse.width])
+            if created is not None:
+                return created
+            end = line_start
+        return None
+    
+    def _fingerprint(self, mm: "mmap.mmap | bytes", size: int) -> str:
+        return hashlib.sha1(mm[:min(size, _FINGERPRINT_SIZE)]).hexdigest()
+    
+    def _load_cache(self, mm: "mmap.mmap | bytes") -> None:
+        if not self.cache_path:
+            return
+        
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        if (
+            data.get("version") != INDEX_VERSION
+            or data.get("time_format") != self.time_format
+            or data.get("step") != self.step
+            or data.get("size", 0) > len(mm)
+            or data.get("fingerprint") != self._fingerprint(mm, data.get("size", 0))
+        ):
+            return # Made for another file or with other settings
+        
+        self.size = data["size"]
+        self.fingerprint = data["fingerprint"]
+        self.times = data["times"]
+        self.offsets = data["offsets"]
+        self.first = data["first"]
+        self.last = data["last"]
+    
+    def _save_cache(self) -> None:
+        if not self.cache_path:
+            return
+        
+        data = {
+            "version": INDEX_VERSION,
+            "time_format": self.time_format,
+            "step": self.step,
+            "size": self.size,
+            "fingerprint": self.fingerprint,
+            "first": self.first,
+            "last": self.last,
+            "times": self.times,
+            "offsets": self.offsets
+        }
+        
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            temporary = self.cache_path + ".tmp"
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(temporary, self.cache_path)
+        except OSError:
+            pass # The index is only a cache
+
+class LogSearcher:
+    """
+    Searches the log files in a logs folder by time, level and text.
+    
+    Parameters:
+    - logs_folder (str): The folder with the log files (default: "logs").
+    - time_format (str): Format of the timestamps at the start of each line (default: LOGGER_TIME_FORMAT).
+    - step (int): Roughly how many bytes there are between two index entries (default: INDEX_STEP).
+    - cache (bool): Whether to cache the indexes in `<logs folder>/.index/` (default: True).
+    
+    `bytes_read` counts the bytes of log files read by searches, for seeing how much the index saved.
+    """
+    
+    def __init__(
+        self,
+        logs_folder: str = "logs",
+        *,
+        time_format: str = LOGGER_TIME_FORMAT,
+        step: int = INDEX_STEP,
+        cache: bool = True
+    ) -> None:
+        self.logs_folder = logs_folder
+        self.time_format = time_format
+        self.step = step
+        self.cache = cache
+        self.bytes_read = 0
+        self._indexes: dict[str, LogIndex] = {}
+    
+    def log_files(self) -> list[str]:
+        """
+        The plain text log files (active, rotated and gzipped) in the logs folder, oldest first. JSON
+        log files aren't included.
+        
+        Files are ordered by when they were last written (rotated files keep it when gzipped), not by
+        name: rotation times only have 1 second resolution and names are reused once pruned, and the
+        merge in `search()` keeps logs of the same second in this order.
+        """
+        folder = glob.escape(self.logs_folder)
+        files = set(glob.glob(os.path.join(folder, "*.log")))
+        files.update(glob.glob(os.path.join(folder, "*.log.*")))
+        
+        def last_written(path: str) -> tuple[float, str]:
+            try:
+                return os.path.getmtime(path), path
+            except OSError:
+                return 0, path
+        
+        return sorted((path for path in files if not path.endswith(".tmp")), key=last_written)
+    
+    def search(
+        self,
+        since: float | None = None,
+        until: float | None = None,
+        *,
+        levels: Iterable[str] | None = None,
+        contains: str | None = None,
+        limit: int | None = None,
+        files: Iterable[str] | None = None
+    ) -> Iterator[LogEntry]:
+        """
+        Finds the logs between two times, oldest first.
+        
+        Parameters:
+        - since (float | None): Unix timestamp of the earliest log to return, None for no lower bound.
+        - until (float | None): Unix timestamp of the latest log to return, None for no upper bound.
+        - levels (Iterable[str] | None): Only return logs of these levels (e.g. ["error", "critical"]).
+        - contains (str | None): Only return logs containing this text (case insensitive).
+        - limit (int | None): The maximum amount of logs to return.
+        - files (Iterable[str] | None): The log files to search (default: every log file in the logs folder).
+        
+        Returns:
+        - Iterator[LogEntry]: The matching logs. Logs of different files are merged by time.
+        """
+        wanted_levels = set(levels) if levels is not None else None
+        needle = contains.casefold() if contains else None
+        
+        streams = [
+            self._search_file(path, since, until)
+            for path in (self.log_files() if files is None else files)
+        ]
+        
+        found = 0
+        for entry in heapq.merge(*streams, key=lambda entry: entry.created):
+            if wanted_levels is not None and entry.level not in wanted_levels:
+                continue
+            if needle is not None and needle not in entry.text.casefold():
+                continue
+            
+            yield entry
+            found += 1
+            if limit is not None and found >= limit:
+                return
+    
+    def index(self, path: str) -> LogIndex | None:
+        """Builds or updates the index of a plain text log file, None if the file can't be read."""
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return self._update_index(path, mm)
+        except (OSError, ValueError):
+            return None
+    
+    def _update_index(self, path: str, mm: mmap.mmap) -> LogIndex:
+        index = self._indexes.get(path)
+        if index is None:
+            index = self._indexes[path] = LogIndex(
+                path,
+                self._cache_path(path) if self.cache else None,
+                time_format = self.time_format,
+                step = self.step
+            )
+        index.update(mm)
+        return index
+    
+    def _cache_path(self, path: str) -> str:
+        return os.path.join(os.path.dirname(path), INDEX_FOLDER, os.path.basename(path) + ".idx")
+    
+    def _search_file(self, path: str, since: float | None, until: float | None) -> Iterator[LogEntry]:
+        if path.endswith(".gz"):
+            yield from self._search_gzip(path, since, until)
+            return
+        
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return
+        
+        with f:
+            try:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                return
+            
+            with mm:
+                index = self._update_index(path, mm)
+                if not _overlaps(index.first, index.last, since, until):
+                    return
+                
+                start, end = index.window(since, until)
+                self.bytes_read += end - start
+                yield from self._parse(path, _lines(mm, start, end), since, until)
+    
+    def _search_gzip(self, path: str, since: float | None, until: float | None) -> Iterator[LogEntry]:
+        # Gzipped files can't be seeked into, but they never change, so their time range is cached
+        # and they are only streamed when it overlaps the search
+        cache_path = self._cache_path(path) if self.cache else None
+        span = _read_span(cache_path, path) if cache_path else None
+        if span is not None and not _overlaps(span[0], span[1], since, until):
+            return
+        
+        parse = _TimestampParser(self.time_format)
+        first: float | None = None
+        last: float | None = None
+        
+        def lines() -> Iterator[bytes]:
+            nonlocal first, last
+            try:
+                with gzip.open(path, "rb") as f:
+                    for line in f:
+                        self.bytes_read += len(line)
+                        created = parse(line)
+                        if created is not None:
+                            if first is None:
+                                first = created
+                            last = created
+                        yield line
+            except (OSError, EOFError):
+                return
+        
+        stream = lines()
+        yield from self._parse(path, stream, since, until)
+        
+        if span is None and cache_path:
+            # Read the rest of the file once to learn where it ends
+            for _ in stream:
+                pass
+            if first is not None and last is not None:
+                _write_span(cache_path, path, first, last)
+    
+    def _parse(
+        self,
+        path: str,
+        lines: Iterable[bytes],
+        since: float | None,
+        until: float | None
+    ) -> Iterator[LogEntry]:
+        """Groups lines into logs (a timestamped line and the lines after it without one) and yields those in range."""
+        parse = _TimestampParser(self.time_format)
+        width = parse.width
+        created: float | None = None
+        level: str | None = None
+        record: list[bytes] = []
+        
+        for line in lines:
+            timestamp = parse(line)
+            if timestamp is None:
+                if created is not None:
+                    record.append(line) # Continues the current log
+                continue
+            
+            if created is not None and _in_range(created, since, until):
+                yield LogEntry(created, level, b"".join(record).decode("utf-8", "replace").rstrip("\r\n"), path)
+            
+            if until is not None and timestamp > until:
+                return
+            
+            created = timestamp
+            level = _LEVELS_BY_LABEL.get(line[width + 1:width + 9].decode("utf-8", "replace").strip())
+            record = [line]
+        
+        if created is not None and _in_range(created, since, until):
+            yield LogEntry(created, level, b"".join(record).decode("utf-8", "replace").rstrip("\r\n"), path)
+
+def _lines(mm: mmap.mmap, start: int, end: int) -> Iterator[bytes]:
+    """Yields the lines (with their newline) of `mm` between two offsets, `start` must be at the start of a line."""
+    offset = start
+    while offset < end:
+        newline = mm.find(b"\n", offset, end)
+        if newline == -1:
+            yield mm[offset:end]
+            return
+        yield mm[offset:newline + 1]
+        offset = newline + 1
+
+def _in_range(created: float, since: float | None, until: float | None) -> bool:
+    return (since is None or created >= since) and (until is None or created <= until)
+
+def _overlaps(first: float | None, last: float | None, since: float | None, until: float | None) -> bool:
+    if first is None or last is None:
+        return False # No timestamped lines at all
+    return (since is None or last >= since) and (until is None or first <= until)
+
+def _read_span(cache_path: str, path: str) -> tuple[float, float] | None:
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == INDEX_VERSION and data.get("size") == os.path.getsize(path):
+            return data["first"], data["last"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+def _write_span(cache_path: str, path: str, first: float, last: float) -> None:
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "size": os.path.getsize(path), "first": first, "last": last}, f)
+    except OSError:
+        pass
+
+def parse_time(text: str, time_format: str = LOGGER_TIME_FORMAT, *, now: float | None = None) -> float:
+    """
+    Parses a time given to a search into a unix timestamp.
+    
+    Parameters:
+    - text (str): "now", a duration ago like "90s", "15m", "2h", "1d", "1w" or "1h30m", or a
+      date in `time_format`, "%Y-%m-%d %H:%M" or "%Y-%m-%d".
+    - time_format (str): The format of full dates (default: LOGGER_TIME_FORMAT).
+    - now (float | None): The current time, for durations (default: time.time()).
+    
+    Returns:
+    - float: The unix timestamp.
+    
+    Raises:
+    - ValueError: If the text isn't a supported time.
+    """
+    text = text.strip()
+    if now is None:
+        now = time.time()
+    
+    if text.lower() == "now":
+        return now
+    
+    if _DURATIONS_PATTERN.fullmatch(text):
+        seconds = sum(float(amount) * _DURATION_UNITS[unit.lower()] for amount, unit in _DURATION_PATTERN.findall(text))
+        return now - seconds
+    
+    for fmt in (time_format, "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, fmt).timestamp()
+        except ValueError:
+            pass
+    
+    raise ValueError(f"invalid time {text!r}, use \"now\", a duration like \"2h\" or a date like {datetime.now().strftime(time_format)!r}")
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog = "python -m src.logsearch",
+        description = "Search the saved log files by time range, level and text."
+    )
+    parser.add_argument("files", nargs="*", help="log files to search (default: every log file in the logs folder)")
+    parser.add_argument("-f", "--logs-folder", default="logs", help="folder with the log files (default: logs)")
+    parser.add_argument("-s", "--since", help="earliest time, a date or a duration ago like 2h (default: no limit)")
+    parser.add_argument("-u", "--until", help="latest time, a date or a duration ago like 30m (default: no limit)")
+    parser.add_argument("-l", "--level", action="append", choices=list(LOG_TYPES_TEXT["text"]), help="only show logs of this level, can be repeated")
+    parser.add_argument("-c", "--contains", help="only show logs containing this text (case insensitive)")
+    parser.add_argument("-n", "--limit", type=int, help="maximum amount of logs to show")
+    parser.add_argument("--no-cache", action="store_true", help="don't read or write cached indexes")
+    parser.add_argument("--stats", action="store_true", help="print how many bytes were read to stderr")
+    args = parser.parse_args(argv)
+    
+    try:
+        since = parse_time(args.since) if args.since else None
+        until = parse_time(args.until) if args.until else None
+    except ValueError as e:
+        parser.error(str(e))
+    
+    searcher = LogSearcher(args.logs_folder, cache=not args.no_cache)
+    started = time.perf_counter()
+    found = 0
+    try:
+        for entry in searcher.search(
+            since,
+            until,
+            levels = args.level,
+            contains = args.contains,
+            limit = args.limit,
+            files = args.files or None
+        ):
+            print(entry.text)
+            found += 1
+    except (BrokenPipeError, KeyboardInterrupt):
+        return 1
+    
+    if args.stats:
+        print(f"{found} log(s), {searcher.bytes_read} bytes read in {time.perf_counter() - started:.3f}s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
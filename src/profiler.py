@@ -0,0 +1,245 @@
+"""
+This module times the phases of the bot's startup (imports, connecting to the database, loading
+cogs, logging in, ...) and saves every boot's timings, so boots can be compared with each other.
+
+Usage:
+    ```py
+    from .profiler import profiler
+    
+    with profiler.phase("connect_db"):
+        await self.connect_db()
+    
+    profiler.start("gateway")
+    ...
+    profiler.stop("gateway")
+    profiler.finish() # Saves the boot to STARTUP_PROFILE_LOCATION
+    ```
+
+With `PROFILE_IMPORTS` enabled in the config, the time spent importing every package is traced too.
+
+Copyright (c) 2025-present SqdNoises
+Licensed under the MIT License
+For more information, please check the provided LICENSE file.
+"""
+
+import os
+import sys
+import json
+import time
+import builtins
+import threading
+from contextlib import contextmanager
+from typing     import Any, Iterator
+
+from .config import (
+    PROFILE_IMPORTS,
+    STARTUP_PROFILE_LOCATION
+)
+
+__all__ = (
+    "StartupProfiler",
+    "format_report",
+    "profiler"
+)
+
+# A saved boot: {"time", "total", "phases": {name: seconds}, "imports": {package: seconds}}
+BootRecord = dict[str, Any]
+
+class StartupProfiler:
+    """
+    Records how long each phase of the startup took.
+    
+    Parameters:
+    - path (str | None): JSON lines file every boot's timings are appended to, None to not save them (default: STARTUP_PROFILE_LOCATION).
+    - trace_imports (bool): Time the imports of every package by wrapping `__import__` until `finish()` (default: PROFILE_IMPORTS).
+    """
+    
+    def __init__(
+        self,
+        path: str | None = STARTUP_PROFILE_LOCATION,
+        *,
+        trace_imports: bool = PROFILE_IMPORTS
+    ) -> None:
+        self.path = path
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.phases: dict[str, float] = {} # Phase name -> seconds, in the order they ended
+        self.imports: dict[str, float] = {} # Top level package -> seconds spent running its modules
+        self.finished: BootRecord | None = None
+        self._running: dict[str, float] = {}
+        self._original_import = None
+        self._import_stacks = threading.local()
+        
+        if trace_imports:
+            self.trace_imports()
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Times the code in the `with` block as a phase, works in async functions too."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+    
+    def start(self, name: str) -> None:
+        """Starts timing a phase that ends somewhere else, end it with `stop()`."""
+        self._running[name] = time.perf_counter()
+    
+    def stop(self, name: str) -> float | None:
+        """Ends a phase started with `start()`, returns its duration in seconds or None if it wasn't started."""
+        started = self._running.pop(name, None)
+        if started is None:
+            return None
+        duration = time.perf_counter() - started
+        self.record(name, duration)
+        return duration
+    
+    def record(self, name: str, seconds: float) -> None:
+        """Records the duration of a phase, a phase recorded more than once adds up."""
+        self.phases[name] = self.phases.get(name, 0) + seconds
+    
+    def finish(self) -> BootRecord:
+        """Stops tracing imports, saves this boot's timings and returns them. Only the first call saves."""
+        if self.finished is not None:
+            return self.finished
+        
+        self.stop_tracing_imports()
+        for name in list(self._running):
+            self.stop(name)
+        
+        record: BootRecord = {
+            "time": self.started_at,
+            "total": time.perf_counter() - self.started,
+            "interpreter": self._interpreter_startup(),
+            "phases": self.phases,
+            "imports": dict(sorted(self.imports.items(), key=lambda item: item[1], reverse=True)[:20]),
+            "pid": os.getpid()
+        }
+        self.finished = record
+        
+        if self.path:
+            try:
+                folder = os.path.dirname(self.path)
+                if folder:
+                    os.makedirs(folder, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            except OSError:
+                pass # Timings aren't worth crashing the bot over
+        
+        return record
+    
+    def history(self, limit: int = 10) -> list[BootRecord]:
+        """The last `limit` saved boots, oldest first."""
+        if not self.path:
+            return []
+        
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()[-limit:]
+        except OSError:
+            return []
+        
+        boots = []
+        for line in lines:
+            try:
+                boots.append(json.loads(line))
+            except ValueError:
+                continue
+        return boots
+    
+    def trace_imports(self) -> None:
+        """Starts timing imports by wrapping `builtins.__import__`."""
+        if self._original_import is not None:
+            return
+        
+        original_import = self._original_import = builtins.__import__
+        stacks = self._import_stacks
+        imports = self.imports
+        modules = sys.modules
+        
+        def traced_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in modules:
+                return original_import(name, globals, locals, fromlist, level)
+            
+            # Time spent in nested imports is counted for their own package, not this one
+            stack = stacks.__dict__.setdefault("stack", [])
+            stack.append(0.0)
+            started = time.perf_counter()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = time.perf_counter() - started
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                package = name.partition(".")[0]
+                imports[package] = imports.get(package, 0) + elapsed - nested
+        
+        builtins.__import__ = traced_import
+    
+    def stop_tracing_imports(self) -> None:
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+    
+    def _interpreter_startup(self) -> float | None:
+        """Seconds between the process starting and this profiler being created (interpreter startup), None if unknown."""
+        try:
+            import psutil
+            return max(0, self.started_at - psutil.Process().create_time())
+        except Exception:
+            return None
+
+def format_report(latest: BootRecord, previous: list[BootRecord]) -> str:
+    """
+    Formats a table comparing the phases of a boot with the median of previous boots.
+    
+    Parameters:
+    - latest (BootRecord): The boot to show.
+    - previous (list[BootRecord]): The boots to compare it to.
+    
+    Returns:
+    - str: The table.
+    """
+    def median(values: list[float]) -> float | None:
+        if not values:
+            return None
+        values = sorted(values)
+        middle = len(values) // 2
+        return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+    
+    def milliseconds(seconds: float | None) -> str:
+        return "-" if seconds is None else f"{seconds * 1000:.0f}ms"
+    
+    rows = [("phase", "latest", f"median of {len(previous)}", "change")]
+    
+    phases = dict(latest.get("phases", {}))
+    if latest.get("interpreter") is not None:
+        phases = {"interpreter": latest["interpreter"], **phases}
+    phases["total"] = latest.get("total", 0)
+    
+    for name, seconds in phases.items():
+        if name == "interpreter":
+            values = [boot["interpreter"] for boot in previous if boot.get("interpreter") is not None]
+        elif name == "total":
+            values = [boot["total"] for boot in previous if "total" in boot]
+        else:
+            values = [boot["phases"][name] for boot in previous if name in boot.get("phases", {})]
+        
+        typical = median(values)
+        change = "-" if typical is None else f"{(seconds - typical) * 1000:+.0f}ms"
+        rows.append((name, milliseconds(seconds), milliseconds(typical), change))
+    
+    widths = [max(len(row[column]) for row in rows) for column in range(4)]
+    lines = ["  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip() for row in rows]
+    
+    imports = latest.get("imports")
+    if imports:
+        lines.append("")
+        lines.append("slowest imports: " + ", ".join(f"{package} {milliseconds(seconds)}" for package, seconds in list(imports.items())[:8]))
+    
+    return "\n".join(lines)
+
+profiler = StartupProfiler(trace_imports=PROFILE_IMPORTS or os.getenv("PROFILE_IMPORTS", "").lower() in ("1", "true", "yes"))
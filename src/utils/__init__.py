@@ -9,6 +9,9 @@ import socket
 import asyncio
 import pkgutil
 import platform
+import functools
+import importlib
+import importlib.metadata
 from typing    import (
     Any, TypeVar,
     Iterable, Sequence,
@@ -35,7 +38,10 @@ __all__ = (
     "clamp",
     "detect_platform",
     "slice",
-    "prevent_ratelimit"
+    "prevent_ratelimit",
+    "LazyImport",
+    "lazy_import",
+    "get_package_version"
 )
 
 T = TypeVar("T")
@@ -380,4 +386,71 @@ async def prevent_ratelimit(
             if isinstance(result, BaseException):
                 raise result
     
-    return results
\ No newline at end of file
+    return results
+
+class LazyImport:
+    """
+    Stands in for a module (or something in a module) that is only imported the first time it is used,
+    so heavy dependencies don't slow down startup for code that never uses them.
+    Use `lazy_import()` to create one.
+    """
+    
+    __slots__ = ("_name", "_attribute", "_target")
+    
+    def __init__(self, name: str, attribute: str | None = None) -> None:
+        self._name = name
+        self._attribute = attribute
+        self._target: Any = None
+    
+    def _load(self) -> Any:
+        target = self._target
+        if target is None:
+            target = importlib.import_module(self._name)
+            if self._attribute is not None:
+                target = getattr(target, self._attribute)
+            self._target = target
+        return target
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+    
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._load()(*args, **kwargs)
+    
+    def __repr__(self) -> str:
+        target = self._name if self._attribute is None else f"{self._name}.{self._attribute}"
+        return f"<lazy import of {target}{' (loaded)' if self._target is not None else ''}>"
+
+def lazy_import(name: str, attribute: str | None = None) -> Any:
+    """
+    Imports a module (or an attribute of it) the first time it is used instead of right away.
+    
+    Parameters:
+    - name (str): The module to import, e.g. "numpy" or "PIL.Image".
+    - attribute (str | None): Something in the module to stand in for instead of the module itself, e.g. "KMeans".
+    
+    Returns:
+    - Any: The module if it is already imported, a `LazyImport` standing in for it otherwise.
+    
+    Example:
+    >>> np = lazy_import("numpy")  # numpy isn't imported yet
+    >>> np.array([1, 2, 3])        # now it is
+    
+    Annotations using a lazily imported module have to be strings (`image: "Image.Image"`)
+    so that they don't import it when the function is defined.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module if attribute is None else getattr(module, attribute)
+    return LazyImport(name, attribute)
+
+@functools.cache
+def get_package_version(distribution: str) -> str:
+    """
+    Returns the installed version of a distribution (e.g. "discord.py-self"), or "unknown" if it isn't installed.
+    Uses `importlib.metadata`, which is much faster to import than `pkg_resources`.
+    """
+    try:
+        return importlib.metadata.version(distribution)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
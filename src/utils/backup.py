@@ -0,0 +1,137 @@
+"""
+Online backups of SQLite databases, taken with SQLite's backup API while the bot keeps using
+the database. The functions here block, run them in a worker thread (e.g. `asyncio.to_thread`).
+
+A backup is copied a few pages at a time, pausing between steps so that it never hogs the disk.
+In WAL mode the source is read from one snapshot (a read transaction held for the whole backup),
+so writes made meanwhile don't restart the copy and never wait for it.
+"""
+
+import os
+import gzip
+import time
+import shutil
+import sqlite3
+from datetime import datetime
+from typing   import Callable, NamedTuple
+
+__all__ = (
+    "BackupResult",
+    "backup_sqlite",
+    "list_backups",
+    "prune_backups"
+)
+
+class BackupResult(NamedTuple):
+    path: str
+    size: int          # Bytes of the backup file (compressed if it was compressed)
+    database_size: int # Bytes of the copied database
+    pages: int
+    duration: float    # Seconds
+
+def backup_sqlite(
+    source: str,
+    folder: str,
+    *,
+    pages_per_step: int = 1024,
+    step_sleep: float = 0.01,
+    compress: bool = True,
+    progress: Callable[[int, int], None] | None = None
+) -> BackupResult:
+    """
+    Copies a SQLite database into `folder` as `<name>-<YYYYmmdd-HHMMSS>.db` (`.db.gz` if compressed).
+    The file only appears once it's complete, an interrupted backup leaves no partial file behind.
+    
+    Parameters:
+    - source (str): The database to back up.
+    - folder (str): Where to save the backup.
+    - pages_per_step (int): Pages copied per step, -1 to copy everything in one step (default: 1024).
+    - step_sleep (float): Seconds to pause between steps (default: 0.01).
+    - compress (bool): Whether to gzip the backup (default: True).
+    - progress (Callable[[int, int], None] | None): Called after every step with the remaining and total pages (default: None).
+    
+    Returns:
+    - BackupResult: Where the backup was saved and how long it took.
+    """
+    started = time.perf_counter()
+    os.makedirs(folder, exist_ok=True)
+    
+    name = os.path.splitext(os.path.basename(source))[0]
+    path = os.path.join(folder, f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.db")
+    temporary = path + ".tmp"
+    total_pages = 0
+    
+    def step(status: int, remaining: int, total: int) -> None:
+        nonlocal total_pages
+        total_pages = total
+        if progress is not None:
+            progress(remaining, total)
+        if remaining and step_sleep > 0:
+            time.sleep(step_sleep)
+    
+    # Read-only, a backup must never change the database it copies
+    source_connection = sqlite3.connect(f"file:{os.path.abspath(source)}?mode=ro", uri=True, isolation_level=None)
+    destination = sqlite3.connect(temporary, isolation_level=None)
+    try:
+        journal_mode = source_connection.execute("PRAGMA journal_mode;").fetchone()[0]
+        if str(journal_mode).lower() == "wal":
+            # Pin one snapshot: without it every write by another connection restarts the copy
+            source_connection.execute("BEGIN")
+            source_connection.execute("SELECT 1 FROM sqlite_master LIMIT 1;").fetchall()
+        
+        source_connection.backup(destination, pages=pages_per_step, progress=step)
+        
+        if source_connection.in_transaction:
+            source_connection.execute("COMMIT")
+        # A backup of a WAL database is in WAL mode too, a single file is easier to restore
+        destination.execute("PRAGMA journal_mode = DELETE;")
+    except BaseException:
+        destination.close()
+        source_connection.close()
+        _remove(temporary)
+        raise
+    destination.close()
+    source_connection.close()
+    
+    database_size = os.path.getsize(temporary)
+    try:
+        if compress:
+            path += ".gz"
+            with open(temporary, "rb") as file, gzip.open(path + ".tmp", "wb", compresslevel=6) as compressed:
+                shutil.copyfileobj(file, compressed, 1024 * 1024)
+            _remove(temporary)
+            temporary = path + ".tmp"
+        os.replace(temporary, path)
+    except BaseException:
+        _remove(temporary)
+        _remove(path + ".tmp")
+        raise
+    
+    return BackupResult(path, os.path.getsize(path), database_size, total_pages, time.perf_counter() - started)
+
+def list_backups(folder: str, name: str | None = None) -> list[str]:
+    """The finished backups in `folder` (of the database called `name` if given), oldest first."""
+    try:
+        files = os.listdir(folder)
+    except FileNotFoundError:
+        return []
+    
+    backups = [
+        os.path.join(folder, file) for file in files
+        if file.endswith((".db", ".db.gz")) and (name is None or file.rsplit("-", 2)[0] == name)
+    ]
+    return sorted(backups, key=os.path.getmtime)
+
+def prune_backups(folder: str, keep: int, name: str | None = None) -> list[str]:
+    """Deletes all but the `keep` newest backups in `folder` (of the database called `name` if given), returns the deleted files."""
+    backups = list_backups(folder, name)
+    deleted = backups[:-keep] if keep > 0 else []
+    for path in deleted:
+        _remove(path)
+    return deleted
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,209 @@
+"""
+An index of the commands in every cog, built by reading the cogs' source code instead of
+importing them. Lazy cog loading (`LAZY_COGS` in the config) uses it to register lightweight
+stand-ins for the commands of cogs that are not loaded yet.
+
+The index is saved as JSON and every cog's entry is rebuilt when the sha256 hash of its file changes.
+"""
+
+import os
+import ast
+import json
+import hashlib
+import importlib.util
+from typing import Any, TypedDict
+
+__all__ = (
+    "CogIndex",
+    "IndexedCog",
+    "IndexedCommand"
+)
+
+INDEX_VERSION = 1
+
+# Decorators that register something with the bot when the cog is added, these cogs can't wait
+# until one of their commands is used
+_EAGER_DECORATORS = {"listener", "loop"}
+_EAGER_MODULES = {"app_commands", "tasks"}
+
+class IndexedCommand(TypedDict):
+    name: str
+    aliases: list[str]
+    brief: str | None
+    help: str | None
+    usage: str | None
+    hidden: bool
+
+class IndexedCog(TypedDict):
+    hash: str
+    eager: bool # Has to be loaded on startup (has listeners, tasks, slash commands or couldn't be indexed)
+    depends_on: list[str]
+    commands: list[IndexedCommand]
+
+class CogIndex:
+    """
+    Maps every cog module to its commands, aliases and help texts.
+    
+    Parameters:
+    - path (str): Where the index is saved.
+    """
+    
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.cogs: dict[str, IndexedCog] = {}
+        self.changed = False
+    
+    def load(self) -> None:
+        """Loads the saved index, an unreadable or outdated index is treated as empty."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        if isinstance(data, dict) and data.get("version") == INDEX_VERSION:
+            self.cogs = data.get("cogs", {})
+    
+    def save(self) -> None:
+        """Saves the index if anything in it changed."""
+        if not self.changed:
+            return
+        
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "cogs": self.cogs}, f, indent=2)
+        os.replace(temporary, self.path)
+        self.changed = False
+    
+    def update(self, modules: list[str]) -> None:
+        """Re-indexes the cogs whose files changed since they were indexed and forgets cogs that aren't in `modules`."""
+        for module in list(self.cogs):
+            if module not in modules:
+                del self.cogs[module]
+                self.changed = True
+        
+        for module in modules:
+            source = self._read_source(module)
+            digest = hashlib.sha256(source).hexdigest() if source is not None else ""
+            
+            entry = self.cogs.get(module)
+            if entry is not None and entry["hash"] == digest and digest:
+                continue
+            
+            self.cogs[module] = self._index_source(source, digest)
+            self.changed = True
+    
+    def _read_source(self, module: str) -> bytes | None:
+        try:
+            spec = importlib.util.find_spec(module)
+            if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+                return None
+            with open(spec.origin, "rb") as f:
+                return f.read()
+        except Exception:
+            return None
+    
+    def _index_source(self, source: bytes | None, digest: str) -> IndexedCog:
+        entry: IndexedCog = {"hash": digest, "eager": True, "depends_on": [], "commands": []}
+        if source is None:
+            return entry
+        
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            return entry # Loaded on startup so the error gets reported
+        
+        eager = False
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and any(isinstance(target, ast.Name) and target.id == "DEPENDS_ON" for target in node.targets):
+                try:
+                    entry["depends_on"] = [str(name) for name in ast.literal_eval(node.value)]
+                except ValueError:
+                    return entry
+            
+            elif isinstance(node, ast.ClassDef):
+                # Cog wide checks aren't known until the cog is loaded, hide its commands from help until then
+                has_cog_check = any(isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name == "cog_check" for item in node.body)
+                
+                for item in node.body:
+                    if not isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        continue
+                    
+                    for decorator in item.decorator_list:
+                        call = decorator if isinstance(decorator, ast.Call) else None
+                        parts = _dotted_name(call.func if call else decorator)
+                        if not parts:
+                            continue
+                        
+                        if parts[-1] in _EAGER_DECORATORS or _EAGER_MODULES.intersection(parts) or parts[-1].startswith("hybrid_"):
+                            eager = True
+                        
+                        # `@commands.command()` or `@command()`, not `@group.command()` (a subcommand)
+                        elif parts[-1] in ("command", "group") and (len(parts) == 1 or parts[:-1] == ["commands"]):
+                            command = _index_command(item, call)
+                            if command is None:
+                                return entry
+                            if has_cog_check:
+                                command["hidden"] = True
+                            entry["commands"].append(command)
+        
+        # Cogs without commands have nothing to load them later
+        entry["eager"] = eager or not entry["commands"]
+        return entry
+
+def _dotted_name(node: ast.expr) -> list[str]:
+    """`commands.Cog.listener` -> ["commands", "Cog", "listener"]"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return parts[::-1]
+    return []
+
+def _index_command(function: ast.FunctionDef | ast.AsyncFunctionDef, call: ast.Call | None) -> IndexedCommand | None:
+    """Reads a command's name, aliases and help texts from its decorator and docstring, None if they aren't literals."""
+    options: dict[str, Any] = {}
+    for keyword in call.keywords if call else []:
+        if keyword.arg in ("name", "aliases", "brief", "help", "usage", "hidden"):
+            try:
+                options[keyword.arg] = ast.literal_eval(keyword.value)
+            except ValueError:
+                return None
+    
+    if call and call.args:
+        try:
+            options.setdefault("name", ast.literal_eval(call.args[0]))
+        except ValueError:
+            return None
+    
+    docstring = ast.get_docstring(function)
+    return {
+        "name": options.get("name") or function.name,
+        "aliases": list(options.get("aliases", [])),
+        "brief": options.get("brief"),
+        "help": options.get("help") or docstring,
+        "usage": options.get("usage") or _usage(function),
+        "hidden": bool(options.get("hidden", False))
+    }
+
+def _usage(function: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
+    """The command's signature like discord.py shows it in help, from its parameters after `self` and `ctx`."""
+    arguments = function.args
+    positional = arguments.posonlyargs + arguments.args
+    defaults = [None] * (len(positional) - len(arguments.defaults)) + list(arguments.defaults)
+    
+    parts = []
+    for argument, default in list(zip(positional, defaults))[2:]:
+        parts.append(f"<{argument.arg}>" if default is None else f"[{argument.arg}]")
+    if arguments.vararg:
+        parts.append(f"[{arguments.vararg.arg}...]")
+    for argument, default in zip(arguments.kwonlyargs, arguments.kw_defaults):
+        parts.append(f"<{argument.arg}>" if default is None else f"[{argument.arg}]")
+    
+    return " ".join(parts)
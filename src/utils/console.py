@@ -4,8 +4,8 @@ Console-related utilities.
 
 import os
 import sys
-import pkg_resources
 
+from .        import get_package_version
 from ..logger import logging
 
 __all__ = (
@@ -15,7 +15,7 @@ __all__ = (
 
 def print_versions():
     logging.info(f"python {sys.version}")
-    logging.info(f"discord.py-self {pkg_resources.get_distribution('discord.py-self').version}")
+    logging.info(f"discord.py-self {get_package_version('discord.py-self')}")
 
 def print_terminal_size():
     try:
@@ -0,0 +1,49 @@
+"""
+HTTP-related utilities.
+
+The bot keeps one pooled `aiohttp.ClientSession` for all of its outbound HTTP (see `Bot.setup_hook`)
+and registers it with `set_default_session`, so utilities like `get_raw_content_data` reuse its
+open connections and cached DNS lookups instead of setting up DNS, TCP and TLS for every request.
+"""
+
+from .. import config
+
+import aiohttp
+
+__all__ = (
+    "create_session",
+    "get_default_session",
+    "set_default_session"
+)
+
+_default_session: aiohttp.ClientSession | None = None
+
+def create_session(**kwargs) -> aiohttp.ClientSession:
+    """
+    Creates a session with a pooled connector, call it from a coroutine and close the session when done.
+    
+    Parameters:
+    - **kwargs: Passed to `aiohttp.ClientSession`, e.g. `headers`.
+    
+    Returns:
+    - aiohttp.ClientSession: The session.
+    """
+    connector = aiohttp.TCPConnector(
+        limit = config.HTTP_CONNECTION_LIMIT,
+        limit_per_host = config.HTTP_CONNECTION_LIMIT_PER_HOST,
+        ttl_dns_cache = config.HTTP_DNS_CACHE_TTL,
+        keepalive_timeout = config.HTTP_KEEPALIVE_TIMEOUT
+    )
+    kwargs.setdefault("timeout", aiohttp.ClientTimeout(total=config.HTTP_TIMEOUT))
+    return aiohttp.ClientSession(connector=connector, **kwargs)
+
+def get_default_session() -> aiohttp.ClientSession | None:
+    """The session utilities use when they aren't given one, None if there's none or it's closed."""
+    if _default_session is None or _default_session.closed:
+        return None
+    return _default_session
+
+def set_default_session(session: aiohttp.ClientSession | None) -> None:
+    """Sets the session utilities use when they aren't given one, None to unset it."""
+    global _default_session
+    _default_session = session
@@ -7,27 +7,35 @@ from typing import (
     TYPE_CHECKING, Optional
 )
 
+from .    import lazy_import
 from .bot import get_raw_content_data
 
 import aiohttp
-import numpy as np
-from PIL             import Image
-from PIL.Image       import Image as PILImage
-from sklearn.cluster import KMeans
+
+# numpy, PIL and scikit-learn take a while to import, so they're only imported when first used
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL             import Image
+    from PIL.Image       import Image as PILImage
+    from sklearn.cluster import KMeans
+else:
+    np     = lazy_import("numpy")
+    Image  = lazy_import("PIL.Image")
+    KMeans = lazy_import("sklearn.cluster", "KMeans")
 
 __all__ = (
     "fetch_image",
     "get_dominant_color"
 )
 
-async def fetch_image(image_url: str, *args, session: Optional[aiohttp.ClientSession] = None, **kwargs) -> PILImage:
+async def fetch_image(image_url: str, *args, session: Optional[aiohttp.ClientSession] = None, **kwargs) -> "PILImage":
     """
     Fetches an image from a URL asynchronously and returns a PIL Image object.
 
     Args:
         image_url (str): The URL of the image to fetch.
         session (Optional[aiohttp.ClientSession]): An optional aiohttp ClientSession to use for the request.
-            If not provided, a new session will be created.
+            If not provided, the bot's shared session is used (or a new session if there's none).
         
     Returns:
         PILImage: The image object.
@@ -36,7 +44,7 @@ async def fetch_image(image_url: str, *args, session: Optional[aiohttp.ClientSes
     image_data = await get_raw_content_data(image_url, *args, session=session, **kwargs)
     return Image.open(BytesIO(image_data)).convert("RGBA")
 
-def get_dominant_color(image: Image.Image) -> tuple[int, int, int]:
+def get_dominant_color(image: "Image.Image") -> tuple[int, int, int]:
     """
     Processes a PIL Image object and extracts the most bright and dominant color
     from the entire image, excluding transparent pixels.